@@ -8,3 +8,5 @@ class AccountsConfig(AppConfig):
     name = "apps.accounts"
     label = "accounts"
 
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -0,0 +1,172 @@
+"""
+Async variants of the hot auth endpoints, for deployment behind an ASGI server.
+
+Database access goes through Django's async ORM, and password hashing runs on the
+bounded pool in `apps.accounts.hashers`. A worker can then keep many logins and sign-ups
+in flight while PBKDF2 runs, instead of blocking one thread per request. Responses
+mirror the synchronous DRF views.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import math
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.http import HttpResponseNotAllowed, JsonResponse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.throttling import BaseThrottle
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.accounts.hashers import acheck_otp_hash, acheck_password, amake_password
+from apps.accounts.jwt import IndexedRefreshToken, IndexedTokenRefreshSerializer
+from apps.accounts.models import EmailOTP
+from apps.accounts.serializers import RegisterSerializer, VerifyEmailSerializer, create_registration
+from apps.accounts.sharding import ashard_for_email
+from apps.accounts.throttling import check_rate_limits, normalize_email
+
+
+User = get_user_model()
+
+NO_ACTIVE_ACCOUNT = "No active account found with the given credentials"
+
+
+class _LoginInputSerializer(serializers.Serializer):
+    email = serializers.CharField()
+    password = serializers.CharField()
+
+
+class _VerifyEmailInputSerializer(VerifyEmailSerializer):
+    def validate(self, attrs):
+        return attrs
+
+
+def async_post_endpoint(view):
+    """
+    Restrict an async view to POST and exempt it from CSRF (token auth, like the DRF views).
+
+    Django 4.2's `csrf_exempt`/`require_POST` wrap views in sync functions, which would
+    hide the coroutine from the handler, so this does both without changing the view type.
+    """
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"])
+        return await view(request, *args, **kwargs)
+
+    wrapper.csrf_exempt = True
+    return wrapper
+
+
+async def _parse(request, serializer_class, scope):
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError as e:
+        return None, JsonResponse({"detail": f"JSON parse error - {e}"}, status=400)
+    email = data.get("email") if isinstance(data, dict) else None
+
+    # Rate limits apply before validation or hashing, as AuthRateThrottle does for the DRF views.
+    # The cache may be remote, so the check runs off the event loop.
+    decision = await sync_to_async(check_rate_limits, thread_sensitive=False)(
+        scope, ident=BaseThrottle().get_ident(request), email=normalize_email(email)
+    )
+    if not decision.allowed:
+        wait = math.ceil(decision.wait or 0)
+        response = JsonResponse({"detail": f"Request was throttled. Expected available in {wait} seconds."}, status=429)
+        response["Retry-After"] = str(wait)
+        return None, response
+
+    serializer = serializer_class(data=data)
+    if not serializer.is_valid():
+        return None, JsonResponse(serializer.errors, status=400)
+    return serializer.validated_data, None
+
+
+@async_post_endpoint
+async def login(request):
+    data, error = await _parse(request, _LoginInputSerializer, "login")
+    if error:
+        return error
+    email = User.objects.normalize_email(data["email"]).strip().lower()
+
+    user = await User.objects.using(await ashard_for_email(email)).filter(email=email).afirst()
+    if user is None:
+        # Hash anyway so response time does not reveal which emails exist.
+        await amake_password(data["password"])
+        return JsonResponse({"detail": NO_ACTIVE_ACCOUNT, "code": "no_active_account"}, status=401)
+    if not await acheck_password(data["password"], user.password) or not user.is_active:
+        return JsonResponse({"detail": NO_ACTIVE_ACCOUNT, "code": "no_active_account"}, status=401)
+    if not user.email_verified:
+        return JsonResponse({"non_field_errors": ["Email is not verified."]}, status=400)
+
+    refresh = await sync_to_async(IndexedRefreshToken.for_user)(user)
+    if api_settings.UPDATE_LAST_LOGIN:
+        await sync_to_async(update_last_login)(None, user)
+    return JsonResponse({"refresh": str(refresh), "access": str(refresh.access_token)})
+
+
+@async_post_endpoint
+async def register(request):
+    data, error = await _parse(request, RegisterSerializer, "register")
+    if error:
+        return error
+    password_hash = await amake_password(data["password"])
+    try:
+        user = await sync_to_async(create_registration)(
+            email=data["email"], password_hash=password_hash, name=(data.get("name") or "").strip()
+        )
+    except serializers.ValidationError as e:
+        return JsonResponse(e.detail, status=400)
+    return JsonResponse({"detail": "Registered. OTP sent to email.", "email": user.email}, status=201)
+
+
+@async_post_endpoint
+async def verify_email(request):
+    data, error = await _parse(request, _VerifyEmailInputSerializer, "verify_email")
+    if error:
+        return error
+    email = data["email"].strip().lower()
+
+    user = await User.objects.using(await ashard_for_email(email)).filter(email=email).afirst()
+    if user is None:
+        return JsonResponse({"email": ["No user found for this email."]}, status=400)
+    otp_obj = await (
+        user.email_otps.filter(purpose=EmailOTP.Purpose.VERIFY_EMAIL, used_at__isnull=True)
+        .order_by("-created_at")
+        .afirst()
+    )
+    if otp_obj is None:
+        return JsonResponse({"otp": ["No active OTP found. Please register again."]}, status=400)
+    if otp_obj.is_expired:
+        return JsonResponse({"otp": ["OTP expired. Please register again."]}, status=400)
+    if not await acheck_otp_hash(data["otp"].strip(), otp_obj.code_hash):
+        return JsonResponse({"otp": ["Invalid OTP."]}, status=400)
+
+    otp_obj.used_at = timezone.now()
+    await otp_obj.asave(update_fields=["used_at"])
+    user.email_verified = True
+    user.is_active = True
+    await user.asave(update_fields=["email_verified", "is_active"])
+    return JsonResponse({"detail": "Email verified.", "email": user.email})
+
+
+@async_post_endpoint
+async def token_refresh(request):
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError as e:
+        return JsonResponse({"detail": f"JSON parse error - {e}"}, status=400)
+    serializer = IndexedTokenRefreshSerializer(data=data)
+    try:
+        # Blacklist checks may hit the database, so validation runs in a thread.
+        valid = await sync_to_async(serializer.is_valid)()
+    except TokenError as e:
+        return JsonResponse({"detail": e.args[0], "code": "token_not_valid"}, status=401)
+    if not valid:
+        return JsonResponse(serializer.errors, status=400)
+    return JsonResponse(serializer.validated_data)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.accounts.sharding import shard_for_user
+from apps.core.caches import shared_cache
+from apps.core.routers import note_user
+from apps.core.timing import phase
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_user(user_id) -> None:
+    """Evict now, and again after commit so a concurrent request cannot re-cache stale rows."""
+    cache = caches[settings.AUTH_USER_CACHE_ALIAS]
+    key = user_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user (with `profile` preloaded) from the cache.
+
+    Entries live for AUTH_USER_CACHE_TTL_SECONDS and are evicted by the signals in
+    `apps.accounts.signals` whenever the user or profile is saved or deleted, so
+    deactivation and deletion still take effect on the next request. That needs a cache
+    shared by every worker; on a process-local one users are loaded on every request.
+    """
+
+    def authenticate(self, request):
+        with phase("auth"):
+            return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        # Before any lookup, so a user who just wrote is read from the primary.
+        note_user(user_id)
+
+        cache = shared_cache(settings.AUTH_USER_CACHE_ALIAS)
+        key = user_cache_key(user_id)
+        user = cache.get(key) if cache is not None else None
+        if user is None:
+            try:
+                # From the primary: a lagging replica could cache a just-deactivated user for the full TTL.
+                user = (
+                    self.user_model.objects.using(shard_for_user(user_id) or DEFAULT_DB_ALIAS)
+                    .select_related("profile")
+                    .get(**{api_settings.USER_ID_FIELD: user_id})
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            if cache is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TTL_SECONDS)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+User = get_user_model()
+
+
+class ShardedModelBackend(ModelBackend):
+    """
+    `ModelBackend` for sharded users (apps.accounts.sharding). Password logins already go
+    through the shard-aware `get_by_natural_key`; this also loads session users and their
+    group permissions from the user's shard rather than `default`.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = User.objects.for_id(user_id).get()
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    def _get_group_permissions(self, user_obj):
+        return super()._get_group_permissions(user_obj).using(user_obj._state.db)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from apps.accounts.sharding import shard_targets
+
+
+class BlacklistIndex:
+    """
+    Process-local index of blacklisted refresh-token JTIs.
+
+    The index is loaded lazily on first use (no queries at import/app-ready time) and then
+    catches up incrementally by polling for BlacklistedToken rows with a newer id every
+    TOKEN_BLACKLIST_INDEX_SYNC_SECONDS; blacklists made in this process are added at once
+    by the post_save signal (ids are per database, so each user shard has its own
+    watermark). A miss is answered from memory. A hit is confirmed against
+    the database, so rows removed by hand or by retention stop matching. Entries are
+    evicted once their token has expired, since simplejwt rejects those anyway.
+    """
+
+    def __init__(self, *, sync_seconds: float, evict_seconds: float):
+        self.sync_seconds = sync_seconds
+        self.evict_seconds = evict_seconds
+        self._expiries: dict[str, float] = {}
+        self._last_id: dict[str | None, int] | None = None
+        self._synced_at = 0.0
+        self._evicted_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+    def add(self, jti: str, expires_at: datetime | float) -> None:
+        if isinstance(expires_at, datetime):
+            expires_at = expires_at.timestamp()
+        self._expiries[jti] = expires_at
+
+    def load(self, rows) -> None:
+        """Bulk-add `(jti, expires_at)` pairs."""
+        for jti, expires_at in rows:
+            self.add(jti, expires_at)
+
+    def discard(self, jti: str) -> None:
+        self._expiries.pop(jti, None)
+
+    def might_contain(self, jti: str) -> bool:
+        """Memory-only check; may be a stale positive but never a stale negative once synced."""
+        self._maybe_refresh()
+        return jti in self._expiries
+
+    def is_blacklisted(self, jti: str) -> bool:
+        if not self.might_contain(jti):
+            return False
+        if any(BlacklistedToken.objects.using(alias).filter(token__jti=jti).exists() for alias in shard_targets()):
+            return True
+        self.discard(jti)
+        return False
+
+    def sync(self) -> None:
+        aliases = shard_targets()
+        max_ids = {
+            alias: BlacklistedToken.objects.using(alias).aggregate(max_id=Max("id"))["max_id"] or 0 for alias in aliases
+        }
+        if self._last_id is None or any(max_ids[alias] < self._last_id.get(alias, 0) for alias in aliases):
+            # First load, or rows were purged and SQLite may reuse ids: reload what is live.
+            self._expiries = {}
+            self._last_id = {}
+        for alias in aliases:
+            qs = BlacklistedToken.objects.using(alias)
+            last_id = self._last_id.get(alias)
+            if last_id is None:
+                last_id = 0
+                qs = qs.filter(token__expires_at__gt=timezone.now())
+            else:
+                qs = qs.filter(id__gt=last_id)
+            for row_id, jti, expires_at in qs.values_list("id", "token__jti", "token__expires_at").iterator(
+                chunk_size=10_000
+            ):
+                self.add(jti, expires_at)
+                last_id = max(last_id, row_id)
+            self._last_id[alias] = last_id
+
+    def evict_expired(self, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        self._expiries = {jti: exp for jti, exp in self._expiries.items() if exp > now}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._expiries = {}
+            self._last_id = None
+            self._synced_at = self._evicted_at = 0.0
+
+    def _maybe_refresh(self) -> None:
+        now = time.monotonic()
+        if self._last_id is not None and now - self._synced_at < self.sync_seconds:
+            return
+        with self._lock:
+            if self._last_id is None or now - self._synced_at >= self.sync_seconds:
+                self.sync()
+                self._synced_at = now
+            if now - self._evicted_at >= self.evict_seconds:
+                self.evict_expired()
+                self._evicted_at = now
+
+
+blacklist_index = BlacklistIndex(
+    sync_seconds=settings.TOKEN_BLACKLIST_INDEX_SYNC_SECONDS,
+    evict_seconds=settings.TOKEN_BLACKLIST_INDEX_EVICT_SECONDS,
+)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import csv
+import json
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from apps.accounts.hashing_worker import hash_password, init_worker
+from apps.accounts.models import UserShard
+from apps.accounts.sharding import DIRECTORY_DB_ALIAS, shard_for_new_user, sharding_enabled
+from apps.profiles.models import UserProfile
+from apps.profiles.search import index_profiles
+
+
+User = get_user_model()
+
+_TRUE = {"1", "true", "yes", "y", "t"}
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    created: int = 0
+    existing: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: list[str] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class _Row:
+    email: str
+    name: str
+    password: str | None
+    password_hash: str | None
+    is_active: bool
+    email_verified: bool
+
+
+def read_rows(stream: IO[str], fmt: str) -> Iterator[dict]:
+    """Stream dicts from CSV (with a header row) or NDJSON without loading the file."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "ndjson":
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _flag(value, default: bool) -> bool:
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in _TRUE
+
+
+def import_users(
+    records: Iterable[dict],
+    *,
+    batch_size: int = 1000,
+    workers: int = 0,
+    mp_context=None,
+    verified: bool = True,
+    stats: ImportStats | None = None,
+    progress=None,
+) -> ImportStats:
+    """
+    Bulk-create users and their profiles from `records`.
+
+    Passwords are hashed in a process pool (`workers` > 0, started with `mp_context` as
+    for `ProcessPoolExecutor`) one batch ahead of the writer, and each batch is written
+    with `bulk_create` in its own transaction.
+    `bulk_create` sends no `post_save`, so neither `ensure_profile` nor search indexing
+    runs: profiles are created and indexed here with the mirrored email. Emails are
+    normalized the way `User.save` does; addresses already present (in the input or the
+    table) are skipped. Rows without an `email_verified` value take `verified`. Unverified
+    users that never log in are purged by retention (`stale_unverified_users`).
+    """
+    stats = stats or ImportStats()
+    seen: set[str] = set()
+    executor = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=init_worker)
+        if workers > 0
+        else None
+    )
+    hash_map = executor.map if executor else map
+    try:
+        pending = None
+        for batch in _batches(_clean(records, stats, seen, verified), batch_size):
+            to_hash = [row.password for row in batch if row.password_hash is None]
+            hashes = hash_map(hash_password, to_hash, **({"chunksize": 64} if executor else {}))
+            if pending is not None:
+                _write_batch(*pending, stats)
+                if progress:
+                    progress(stats)
+            pending = (batch, hashes)
+        if pending is not None:
+            _write_batch(*pending, stats)
+            if progress:
+                progress(stats)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return stats
+
+
+def _clean(records: Iterable[dict], stats: ImportStats, seen: set[str], verified: bool) -> Iterator[_Row]:
+    for record in records:
+        stats.read += 1
+        email = User.objects.normalize_email((record.get("email") or "").strip()).lower()
+        try:
+            validate_email(email)
+        except ValidationError:
+            stats.invalid += 1
+            stats.errors.append(f"row {stats.read}: invalid email {email!r}")
+            continue
+        password_hash = record.get("password_hash") or None
+        if password_hash is not None:
+            try:
+                identify_hasher(password_hash)
+            except ValueError:
+                stats.invalid += 1
+                stats.errors.append(f"row {stats.read}: unrecognized password_hash for {email}")
+                continue
+        if email in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(email)
+        email_verified = _flag(record.get("email_verified"), verified)
+        yield _Row(
+            email=email,
+            name=(record.get("name") or "").strip(),
+            password=record.get("password") or None,
+            password_hash=password_hash,
+            is_active=_flag(record.get("is_active"), email_verified),
+            email_verified=email_verified,
+        )
+
+
+def _batches(rows: Iterator[_Row], size: int) -> Iterator[list[_Row]]:
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _write_batch(batch: list[_Row], hashes, stats: ImportStats) -> None:
+    hashes = iter(list(hashes))
+    for row in batch:
+        if row.password_hash is None:
+            row.password_hash = next(hashes)
+
+    for attempt in range(2):
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(transaction.atomic())
+                emails = [row.email for row in batch]
+                if sharding_enabled():
+                    # The directory knows every email, whichever shard holds the user.
+                    existing = UserShard.objects.using(DIRECTORY_DB_ALIAS).filter(email__in=emails)
+                else:
+                    existing = User.objects.filter(email__in=emails)
+                existing = set(existing.values_list("email", flat=True))
+                new_rows = [row for row in batch if row.email not in existing]
+                by_shard = defaultdict(list)
+                for row in new_rows:
+                    user = User(
+                        email=row.email,
+                        password=row.password_hash,
+                        is_active=row.is_active,
+                        email_verified=row.email_verified,
+                    )
+                    by_shard[shard_for_new_user(user.pk)].append((user, row))
+                if sharding_enabled():
+                    UserShard.objects.using(DIRECTORY_DB_ALIAS).bulk_create(
+                        [UserShard(user_id=user.pk, email=user.email, shard=shard)
+                         for shard, pairs in by_shard.items() for user, _ in pairs]
+                    )
+                for shard, pairs in by_shard.items():
+                    if shard and shard != DIRECTORY_DB_ALIAS:
+                        stack.enter_context(transaction.atomic(using=shard))
+                    users = User.objects.using(shard).bulk_create([user for user, _ in pairs])
+                    profiles = UserProfile.objects.using(shard).bulk_create(
+                        [UserProfile(user=user, email=user.email, name=row.name) for user, (_, row) in zip(users, pairs)]
+                    )
+                    index_profiles(profiles, using=shard)
+        except IntegrityError:
+            # A concurrent sign-up claimed one of the emails after our existence check.
+            if attempt:
+                raise
+            continue
+        stats.existing += len(existing)
+        stats.created += len(new_rows)
+        return
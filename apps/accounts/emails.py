@@ -3,7 +3,9 @@ from __future__ import annotations
 import logging
 
 from django.conf import settings
-from django.core.mail import send_mail
+
+from apps.accounts.models import OutgoingEmail
+from apps.core.timing import phase
 
 logger = logging.getLogger(__name__)
 
@@ -28,19 +30,10 @@ def send_password_reset_link(*, email: str, reset_link: str) -> None:
     _send_email(subject, message, email)
 
 
+@phase("email")
 def _send_email(subject: str, message: str, recipient: str, *, otp_for_log: str | None = None) -> None:
-    """Send email with fallback to console logging if SMTP fails."""
-    try:
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [recipient], fail_silently=False)
-        logger.info(f"Email sent to {recipient}: {subject}")
-        if otp_for_log and settings.DEBUG:
-            logger.info(f"[DEBUG] OTP for {recipient}: {otp_for_log}")
-    except Exception as e:
-        # Log the error and print to console as fallback
-        logger.warning(f"SMTP failed ({e}), printing email to console instead.")
-        print("\n" + "=" * 60)
-        print(f"EMAIL TO: {recipient}")
-        print(f"SUBJECT: {subject}")
-        print("-" * 60)
-        print(message)
-        print("=" * 60 + "\n")
+    """Queue email in the outbox; the `send_outbox` worker delivers it over SMTP."""
+    OutgoingEmail.objects.create(recipient=recipient, subject=subject, body=message)
+    logger.info(f"Email queued for {recipient}: {subject}")
+    if otp_for_log and settings.DEBUG:
+        logger.info(f"[DEBUG] OTP for {recipient}: {otp_for_log}")
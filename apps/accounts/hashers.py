@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    BasePasswordHasher,
+    PBKDF2PasswordHasher,
+    check_password,
+    make_password,
+    mask_hash,
+)
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.translation import gettext_noop as _
+
+from apps.core.timing import phase
+
+
+class TimedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """Django's PBKDF2 hasher (same algorithm and hashes), timed as the `hash` phase."""
+
+    def encode(self, password, salt, iterations=None):
+        with phase("hash"):
+            return super().encode(password, salt, iterations)
+
+
+class OTPHMACHasher(BasePasswordHasher):
+    """
+    Keyed HMAC-SHA256 for short-lived OTP codes.
+
+    OTPs expire within minutes, so a slow KDF buys nothing: a 6-digit code is guessable
+    offline whatever the work factor. Keying the HMAC with a server secret means a leaked
+    `code_hash` cannot be brute-forced at all without that secret. Deliberately not listed
+    in PASSWORD_HASHERS, so it can never verify account passwords.
+    """
+
+    algorithm = "otp_hmac_sha256"
+
+    def encode(self, password, salt):
+        self._check_encode_args(password, salt)
+        digest = salted_hmac(
+            self.algorithm,
+            f"{salt}${password}",
+            secret=settings.EMAIL_OTP_HASH_KEY or settings.SECRET_KEY,
+            algorithm="sha256",
+        ).hexdigest()
+        return f"{self.algorithm}${salt}${digest}"
+
+    def decode(self, encoded):
+        algorithm, salt, hash = encoded.split("$", 2)
+        assert algorithm == self.algorithm
+        return {"algorithm": algorithm, "hash": hash, "salt": salt}
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        return constant_time_compare(encoded, self.encode(password, decoded["salt"]))
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _("algorithm"): decoded["algorithm"],
+            _("salt"): mask_hash(decoded["salt"], show=2),
+            _("hash"): mask_hash(decoded["hash"]),
+        }
+
+    def harden_runtime(self, password, encoded):
+        pass
+
+
+_otp_hasher = OTPHMACHasher()
+
+
+@phase("hash")
+def make_otp_hash(otp: str) -> str:
+    return _otp_hasher.encode(otp, _otp_hasher.salt())
+
+
+@phase("hash")
+def check_otp_hash(otp: str, encoded: str) -> bool:
+    """Verify an OTP against `EmailOTP.code_hash`, including rows hashed with PBKDF2 before."""
+    if encoded.startswith(f"{OTPHMACHasher.algorithm}$"):
+        return _otp_hasher.verify(otp, encoded)
+    return check_password(otp, encoded)
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _hashing_executor() -> ThreadPoolExecutor:
+    # hashlib's PBKDF2 releases the GIL, so threads hash in parallel without pickling overhead.
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.AUTH_HASHING_POOL_WORKERS, thread_name_prefix="password-hasher"
+            )
+        return _executor
+
+
+async def run_in_hashing_pool(fn, *args, **kwargs):
+    """Run a CPU-bound hashing call on the bounded pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    # In the caller's context, so the `hash` phase is timed for the request.
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await loop.run_in_executor(_hashing_executor(), call)
+
+
+async def amake_password(password: str | None) -> str:
+    return await run_in_hashing_pool(make_password, password)
+
+
+async def acheck_password(password: str, encoded: str) -> bool:
+    return await run_in_hashing_pool(check_password, password, encoded)
+
+
+async def acheck_otp_hash(otp: str, encoded: str) -> bool:
+    if encoded.startswith(f"{OTPHMACHasher.algorithm}$"):
+        return _otp_hasher.verify(otp, encoded)
+    return await run_in_hashing_pool(check_password, otp, encoded)
@@ -0,0 +1,20 @@
+"""
+Password hashing for the `bulk_import` process pool.
+
+Workers started with `spawn` (the default on macOS and Windows) import this module before
+the initializer runs, i.e. before `django.setup()`. It must therefore not import models
+or anything else that needs the app registry.
+"""
+from __future__ import annotations
+
+import django
+from django.contrib.auth.hashers import make_password
+
+
+def init_worker() -> None:
+    django.setup()
+
+
+def hash_password(password: str | None) -> str:
+    # make_password(None) yields an unusable password, like create_user(password=None).
+    return make_password(password or None)
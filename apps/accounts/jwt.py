@@ -1,19 +1,49 @@
 from __future__ import annotations
 
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.blacklist import blacklist_index
+from apps.accounts.sharding import shard_for_user, shard_of, use_shard
+from apps.core.timing import TimedSerializerMixin
 
 
 User = get_user_model()
 
 
-class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
+class IndexedRefreshToken(RefreshToken):
+    """
+    RefreshToken whose blacklist check consults the in-memory `blacklist_index` first, and
+    whose outstanding/blacklisted rows are written to the user's shard.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        with use_shard(shard_of(user)):
+            return super().for_user(user)
+
+    def check_blacklist(self) -> None:
+        if blacklist_index.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        with use_shard(shard_for_user(self.payload.get(api_settings.USER_ID_CLAIM))):
+            return super().blacklist()
+
+
+class EmailTokenObtainPairSerializer(TimedSerializerMixin, TokenObtainPairSerializer):
     """
     SimpleJWT already keys off get_user_model().USERNAME_FIELD, which is `email` in our custom User.
     We override validation to explicitly reject unverified/inactive users.
     """
 
+    token_class = IndexedRefreshToken
+
     def validate(self, attrs):
         data = super().validate(attrs)
         user = self.user
@@ -23,3 +53,6 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
             raise serializers.ValidationError("Account is inactive.")
         return data
 
+
+class IndexedTokenRefreshSerializer(TimedSerializerMixin, TokenRefreshSerializer):
+    token_class = IndexedRefreshToken
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PooledConnection:
+    backend: object
+    sent: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+def _connection_is_broken(error: Exception) -> bool:
+    # SMTPException subclasses OSError, so rule out per-message rejections first:
+    # after those smtplib issues RSET and the session stays usable.
+    if isinstance(error, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+        return False
+    return isinstance(error, OSError)
+
+
+class SMTPConnectionPool:
+    """
+    A bounded pool of long-lived email backend connections.
+
+    Each connection is a `django.core.mail.get_connection()` backend kept open between
+    batches. A connection is retired after `max_messages` sends or `max_idle_seconds`
+    of inactivity, and is dropped and reopened whenever the transport fails.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        max_messages: int,
+        max_idle_seconds: float,
+        backend: str | None = None,
+        **backend_kwargs,
+    ):
+        self.max_messages = max_messages
+        self.max_idle_seconds = max_idle_seconds
+        self._backend = backend
+        self._backend_kwargs = backend_kwargs
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: deque[_PooledConnection] = deque()
+        self._lock = threading.Lock()
+
+    def send_messages(self, messages) -> list[Exception | None]:
+        """Send messages over one pooled connection; return the error (or None) per message."""
+        errors: list[Exception | None] = []
+        with self._slots:
+            conn = self._checkout()
+            try:
+                for message in messages:
+                    errors.append(self._send_one(conn, message))
+            except BaseException:
+                self._discard(conn)
+                raise
+            self._checkin(conn)
+        return errors
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            self._discard(conn)
+
+    def _send_one(self, conn: _PooledConnection, message) -> Exception | None:
+        if conn.sent >= self.max_messages:
+            self._reconnect(conn)
+        reused = getattr(conn.backend, "connection", None) is not None
+        try:
+            self._open(conn)
+            conn.backend.send_messages([message])
+        except Exception as e:
+            if not _connection_is_broken(e):
+                return e
+            self._reconnect(conn)
+            if not reused:
+                return e
+            # Idle connections are often dropped by the server; retry once on a fresh one.
+            try:
+                self._open(conn)
+                conn.backend.send_messages([message])
+            except Exception as retry_error:
+                if _connection_is_broken(retry_error):
+                    self._reconnect(conn)
+                return retry_error
+        conn.sent += 1
+        conn.last_used = time.monotonic()
+        return None
+
+    def _checkout(self) -> _PooledConnection:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return _PooledConnection(get_connection(self._backend, fail_silently=False, **self._backend_kwargs))
+            if now - conn.last_used <= self.max_idle_seconds:
+                return conn
+            self._discard(conn)
+
+    def _checkin(self, conn: _PooledConnection) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+    def _open(self, conn: _PooledConnection) -> None:
+        if getattr(conn.backend, "connection", None) is None:
+            conn.backend.open()
+
+    def _reconnect(self, conn: _PooledConnection) -> None:
+        try:
+            conn.backend.close()
+        except Exception as e:
+            logger.debug(f"Ignoring error while closing SMTP connection: {e}")
+        conn.sent = 0
+
+    def _discard(self, conn: _PooledConnection) -> None:
+        self._reconnect(conn)
+
+
+_pool: SMTPConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> SMTPConnectionPool:
+    """Process-wide pool configured from the `EMAIL_SMTP_POOL_*` settings."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SMTPConnectionPool(
+                max_size=settings.EMAIL_SMTP_POOL_SIZE,
+                max_messages=settings.EMAIL_SMTP_POOL_MAX_MESSAGES,
+                max_idle_seconds=settings.EMAIL_SMTP_POOL_MAX_IDLE_SECONDS,
+            )
+        return _pool
+
+
+def reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+@receiver(setting_changed)
+def _reset_pool_on_email_settings_change(sender, setting, **kwargs):
+    if setting.startswith("EMAIL_"):
+        reset_pool()
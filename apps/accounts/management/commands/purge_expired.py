@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.retention import RETENTION_TARGETS, run_retention
+
+
+class Command(BaseCommand):
+    help = "Delete expired OTPs, expired outstanding tokens, stale unverified users and old outbox rows in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", default="", help=f"Comma-separated subset of: {', '.join(RETENTION_TARGETS)}.")
+        parser.add_argument("--chunk-size", type=int, default=settings.RETENTION_CHUNK_SIZE)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between chunks.")
+        parser.add_argument("--dry-run", action="store_true", help="Count matching rows without deleting.")
+
+    def handle(self, *args, **options):
+        targets = [t.strip() for t in options["only"].split(",") if t.strip()] or None
+        unknown = set(targets or []) - set(RETENTION_TARGETS)
+        if unknown:
+            raise CommandError(f"Unknown retention target(s): {', '.join(sorted(unknown))}")
+
+        verb = "would delete" if options["dry_run"] else "deleted"
+
+        def progress(name, count):
+            self.stdout.write(f"{name}: {verb} {count} so far")
+
+        results = run_retention(
+            targets=targets,
+            chunk_size=options["chunk_size"],
+            dry_run=options["dry_run"],
+            pause=options["pause"],
+            progress=progress if options["verbosity"] > 1 else None,
+        )
+        for name, count in results.items():
+            self.stdout.write(f"{name}: {verb} {count}")
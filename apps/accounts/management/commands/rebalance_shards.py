@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import UserShard
+from apps.accounts.sharding import (
+    DIRECTORY_DB_ALIAS,
+    ShardMoveError,
+    move_user,
+    record_user_shard,
+    home_shard,
+    sharding_enabled,
+    shards,
+)
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill the user shard directory and move users onto the shard that rendezvous hashing "
+        "assigns them, and staff onto default (run after changing USER_SHARDS or promoting users)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing.")
+        parser.add_argument(
+            "--drain",
+            action="append",
+            default=[],
+            metavar="ALIAS",
+            help="Move every user off this database (repeatable), e.g. before removing it from USER_SHARDS.",
+        )
+        parser.add_argument("--limit", type=int, default=None, help="Stop after moving this many users.")
+        parser.add_argument("--user", metavar="EMAIL", help="Move a single user (with --to).")
+        parser.add_argument("--to", metavar="ALIAS", help="Target shard for --user.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        drains = options["drain"]
+        unknown = [alias for alias in drains if alias not in settings.DATABASES]
+        if unknown:
+            raise CommandError(f"Unknown database(s): {', '.join(unknown)}")
+        targets = [alias for alias in shards() if alias not in drains]
+        if not sharding_enabled() or not targets:
+            raise CommandError("Sharding needs at least two USER_SHARDS (see DJANGO_SQLITE_SHARD_PATHS).")
+
+        if options["user"]:
+            self._move_one(options["user"], options["to"], options["dry_run"])
+            return
+
+        backfilled = moved = failed = 0
+        limit = options["limit"]
+        for source in dict.fromkeys([*shards(), *drains]):
+            users = User.objects.using(source).order_by("pk").values_list("pk", "email", "is_staff", "is_superuser")
+            rows = users.iterator(chunk_size=options["chunk_size"])
+            while chunk := list(islice(rows, options["chunk_size"])):
+                directory = UserShard.objects.using(DIRECTORY_DB_ALIAS).in_bulk([pk for pk, *_ in chunk])
+                for pk, email, is_staff, is_superuser in chunk:
+                    entry = directory.get(pk)
+                    if entry is None or (entry.shard, entry.email) != (source, email):
+                        backfilled += 1
+                        if not options["dry_run"]:
+                            record_user_shard(User(pk=pk, email=email), source)
+                    target = home_shard(pk, staff=is_staff or is_superuser, candidates=targets)
+                    if target == source or (limit is not None and moved >= limit):
+                        continue
+                    if options["verbosity"] > 1:
+                        self.stdout.write(f"{email}: {source} -> {target}")
+                    if not options["dry_run"]:
+                        try:
+                            move_user(pk, target)
+                        except ShardMoveError as e:
+                            failed += 1
+                            self.stderr.write(str(e))
+                            continue
+                    moved += 1
+
+        verb = "would move" if options["dry_run"] else "moved"
+        self.stdout.write(f"directory entries fixed: {backfilled}; users {verb}: {moved}; refused: {failed}")
+
+    def _move_one(self, email: str, target: str | None, dry_run: bool) -> None:
+        if target not in shards():
+            raise CommandError(f"--to must be one of: {', '.join(shards())}")
+        try:
+            user = User.objects.for_email(email).get()
+        except User.DoesNotExist:
+            raise CommandError(f"No user found for {email}")
+        if dry_run:
+            self.stdout.write(f"{user.email}: {user._state.db} -> {target} (dry run)")
+            return
+        try:
+            result = move_user(user.pk, target)
+        except ShardMoveError as e:
+            raise CommandError(str(e))
+        if result is None:
+            self.stdout.write(f"{user.email} is already on {target}")
+        else:
+            self.stdout.write(
+                f"{user.email}: {result.source} -> {result.target} ({result.otps} OTPs, {result.tokens} tokens)"
+            )
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.accounts.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outgoing emails in batches, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE)
+        parser.add_argument("--interval", type=float, default=settings.EMAIL_OUTBOX_POLL_SECONDS,
+                            help="Seconds to sleep when the outbox is empty.")
+        parser.add_argument("--once", action="store_true", help="Drain due emails once and exit.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        while True:
+            result = deliver_pending(batch_size=batch_size)
+            if result.claimed:
+                self.stdout.write(
+                    f"claimed={result.claimed} sent={result.sent} retried={result.retried} failed={result.failed}"
+                )
+            if result.claimed < batch_size:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
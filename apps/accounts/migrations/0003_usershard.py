@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-18 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserShard',
+            fields=[
+                ('user_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('shard', models.CharField(max_length=64)),
+            ],
+        ),
+    ]
@@ -39,6 +39,22 @@ class UserManager(BaseUserManager):
             raise ValueError("Superuser must have is_superuser=True.")
         return self._create_user(email, password, **extra_fields)
 
+    def get_by_natural_key(self, username):
+        from apps.accounts.sharding import shard_for_email
+
+        return self.using(shard_for_email(username)).get(**{self.model.USERNAME_FIELD: username})
+
+    def for_email(self, email: str):
+        """Users matching `email` case-insensitively, on the shard the directory names."""
+        from apps.accounts.sharding import shard_for_email
+
+        return self.using(shard_for_email(email)).filter(email__iexact=email)
+
+    def for_id(self, user_id):
+        from apps.accounts.sharding import shard_for_user
+
+        return self.using(shard_for_user(user_id)).filter(pk=user_id)
+
 
 class User(AbstractBaseUser, PermissionsMixin):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -55,10 +71,19 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS: list[str] = []
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored email, so profile mirroring can skip saves that leave it alone.
+        if "email" in field_names:
+            instance._loaded_email = values[field_names.index("email")]
+        return instance
+
     def save(self, *args, **kwargs):
         if self.email:
             self.email = self.email.strip().lower()
         super().save(*args, **kwargs)
+        self._loaded_email = self.email
 
     def __str__(self) -> str:
         return self.email
@@ -89,3 +114,45 @@ class EmailOTP(models.Model):
     def is_expired(self) -> bool:
         return timezone.now() >= self.expires_at
 
+
+class UserShard(models.Model):
+    """
+    Directory entry naming the database that holds a user's rows (apps.accounts.sharding).
+
+    Lives on `default` only. The unique `email` also keeps emails unique across shards.
+    """
+
+    user_id = models.UUIDField(primary_key=True)
+    email = models.EmailField(unique=True)
+    shard = models.CharField(max_length=64)
+
+    def __str__(self) -> str:
+        return f"{self.email} -> {self.shard}"
+
+
+class OutgoingEmail(models.Model):
+    """A queued email, delivered out of band by the `send_outbox` worker."""
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        SENT = "SENT", "Sent"
+        FAILED = "FAILED", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.recipient}: {self.subject}"
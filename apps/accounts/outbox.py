@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db.models import F
+from django.utils import timezone
+
+from apps.accounts.mail_pool import get_pool
+from apps.accounts.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeliveryResult:
+    claimed: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after `attempts` failed deliveries, capped by settings."""
+    base = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS
+    delay = base * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS))
+
+
+def claim_batch(batch_size: int) -> list[OutgoingEmail]:
+    """
+    Lease up to `batch_size` due emails to this worker.
+
+    Claiming pushes `next_attempt_at` forward by the lease, so concurrent workers skip
+    the same rows and a crashed worker's batch becomes due again once the lease lapses.
+    """
+    now = timezone.now()
+    due_ids = list(
+        OutgoingEmail.objects.filter(status=OutgoingEmail.Status.PENDING, next_attempt_at__lte=now)
+        .order_by("next_attempt_at")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    if not due_ids:
+        return []
+
+    lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    OutgoingEmail.objects.filter(
+        id__in=due_ids,
+        status=OutgoingEmail.Status.PENDING,
+        next_attempt_at__lte=now,
+    ).update(next_attempt_at=lease_until)
+    return list(OutgoingEmail.objects.filter(id__in=due_ids, next_attempt_at=lease_until))
+
+
+def deliver_pending(*, batch_size: int | None = None) -> DeliveryResult:
+    """Send one batch of due emails over a pooled SMTP connection."""
+    batch = claim_batch(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    result = DeliveryResult(claimed=len(batch))
+    if not batch:
+        return result
+
+    messages = [
+        EmailMessage(item.subject, item.body, settings.DEFAULT_FROM_EMAIL, [item.recipient]) for item in batch
+    ]
+    sent_ids = []
+    for item, error in zip(batch, get_pool().send_messages(messages)):
+        if error is None:
+            sent_ids.append(item.id)
+            logger.info(f"Email sent to {item.recipient}: {item.subject}")
+        else:
+            _record_failure(item, error, result)
+
+    if sent_ids:
+        OutgoingEmail.objects.filter(id__in=sent_ids).update(
+            status=OutgoingEmail.Status.SENT,
+            sent_at=timezone.now(),
+            attempts=F("attempts") + 1,
+            last_error="",
+        )
+        result.sent = len(sent_ids)
+    return result
+
+
+def _record_failure(item: OutgoingEmail, error: Exception, result: DeliveryResult) -> None:
+    attempts = item.attempts + 1
+    fields = {"attempts": attempts, "last_error": str(error)[:1000]}
+    if attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        fields["status"] = OutgoingEmail.Status.FAILED
+        result.failed += 1
+        logger.error(f"Giving up on email to {item.recipient} after {attempts} attempts: {error}")
+    else:
+        fields["next_attempt_at"] = timezone.now() + retry_delay(attempts)
+        result.retried += 1
+        logger.warning(f"Email to {item.recipient} failed (attempt {attempts}), will retry: {error}")
+    OutgoingEmail.objects.filter(id=item.id).update(**fields)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from apps.accounts.models import EmailOTP, OutgoingEmail
+from apps.accounts.sharding import is_sharded, shard_targets, use_shard
+
+
+User = get_user_model()
+
+
+def _cutoff(days: float):
+    return timezone.now() - timedelta(days=days)
+
+
+def expired_otps() -> QuerySet:
+    cutoff = _cutoff(settings.RETENTION_OTP_DAYS)
+    return EmailOTP.objects.filter(Q(expires_at__lt=cutoff) | Q(used_at__lt=cutoff))
+
+
+def expired_outstanding_tokens() -> QuerySet:
+    # Blacklist rows cascade; an expired token is rejected on its `exp` claim alone.
+    return OutstandingToken.objects.filter(expires_at__lt=_cutoff(settings.RETENTION_OUTSTANDING_TOKEN_DAYS))
+
+
+def stale_unverified_users() -> QuerySet:
+    return User.objects.filter(
+        email_verified=False,
+        is_staff=False,
+        is_superuser=False,
+        last_login__isnull=True,
+        date_joined__lt=_cutoff(settings.RETENTION_UNVERIFIED_USER_DAYS),
+    )
+
+
+def delivered_emails() -> QuerySet:
+    return OutgoingEmail.objects.filter(
+        status__in=[OutgoingEmail.Status.SENT, OutgoingEmail.Status.FAILED],
+        created_at__lt=_cutoff(settings.RETENTION_OUTBOX_DAYS),
+    )
+
+
+RETENTION_TARGETS: dict[str, Callable[[], QuerySet]] = {
+    "otps": expired_otps,
+    "tokens": expired_outstanding_tokens,
+    "users": stale_unverified_users,
+    "emails": delivered_emails,
+}
+
+
+def purge_in_chunks(
+    queryset: QuerySet,
+    *,
+    chunk_size: int,
+    dry_run: bool = False,
+    pause: float = 0.0,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """
+    Delete `queryset` in primary-key order, `chunk_size` rows per transaction.
+
+    Each chunk is a short write transaction, so SQLite never holds its write lock for
+    long; `pause` sleeps between chunks to let request traffic through. Returns the
+    number of matching rows (deleted, or that would be deleted on a dry run).
+    """
+    total = 0
+    last_pk = None
+    while True:
+        chunk_qs = queryset.order_by("pk")
+        if last_pk is not None:
+            chunk_qs = chunk_qs.filter(pk__gt=last_pk)
+        pks = list(chunk_qs.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return total
+        last_pk = pks[-1]
+        if not dry_run:
+            with transaction.atomic(using=router.db_for_write(queryset.model)):
+                queryset.model._default_manager.filter(pk__in=pks).delete()
+        total += len(pks)
+        if progress is not None:
+            progress(total)
+        if pause:
+            time.sleep(pause)
+
+
+def run_retention(
+    *,
+    targets: list[str] | None = None,
+    chunk_size: int | None = None,
+    dry_run: bool = False,
+    pause: float = 0.0,
+    progress: Callable[[str, int], None] | None = None,
+) -> dict[str, int]:
+    """
+    Purge every retention target (or just `targets`); safe to call from a scheduler.
+    Targets holding per-user rows are purged on each user shard in turn.
+    """
+    results = {}
+    for name in targets or RETENTION_TARGETS:
+        results[name] = 0
+        model = RETENTION_TARGETS[name]().model
+        for using in shard_targets() if is_sharded(model) else [None]:
+            with use_shard(using):
+                done = results[name]
+                results[name] += purge_in_chunks(
+                    RETENTION_TARGETS[name](),
+                    chunk_size=chunk_size or settings.RETENTION_CHUNK_SIZE,
+                    dry_run=dry_run,
+                    pause=pause,
+                    progress=(lambda count, name=name, done=done: progress(name, done + count)) if progress else None,
+                )
+    return results
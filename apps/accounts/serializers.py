@@ -6,7 +6,7 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
@@ -15,7 +15,10 @@ from django.utils import timezone
 from rest_framework import serializers
 
 from apps.accounts.emails import send_password_reset_link, send_verification_otp
+from apps.accounts.hashers import check_otp_hash, make_otp_hash
 from apps.accounts.models import EmailOTP
+from apps.accounts.sharding import atomic_with, shard_for_new_user
+from apps.core.timing import TimedSerializerMixin
 
 
 User = get_user_model()
@@ -26,49 +29,53 @@ def generate_numeric_otp(length: int) -> str:
     return "".join(secrets.choice(alphabet) for _ in range(length))
 
 
-class RegisterSerializer(serializers.Serializer):
+class RegisterSerializer(TimedSerializerMixin, serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True, min_length=8)
     name = serializers.CharField(required=False, allow_blank=True, max_length=255)
 
     def validate_email(self, value: str) -> str:
-        value = value.strip().lower()
-        if User.objects.filter(email__iexact=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
+        # Uniqueness is enforced by the INSERT in create_registration, not a pre-check query.
+        return value.strip().lower()
 
     def create(self, validated_data):
         email = validated_data["email"].strip().lower()
         password = validated_data["password"]
         name = (validated_data.get("name") or "").strip()
-
-        try:
-            user = User.objects.create_user(email=email, password=password)
-        except IntegrityError:
-            # Race-condition safe duplicate rejection
-            raise serializers.ValidationError({"email": "A user with this email already exists."})
-
-        # Ensure profile exists and store the provided name (profile is created by signals).
-        try:
-            profile = user.profile
-        except Exception:
-            profile = None
-        if profile is not None and name:
-            profile.name = name
-            profile.save(update_fields=["name"])
-
-        otp = generate_numeric_otp(settings.EMAIL_OTP_LENGTH)
-        EmailOTP.objects.create(
-            user=user,
-            purpose=EmailOTP.Purpose.VERIFY_EMAIL,
-            code_hash=make_password(otp),
-            expires_at=timezone.now() + timedelta(seconds=settings.EMAIL_OTP_TTL_SECONDS),
-        )
-        send_verification_otp(email=user.email, otp=otp)
-        return user
-
-
-class VerifyEmailSerializer(serializers.Serializer):
+        return create_registration(email=email, password_hash=make_password(password), name=name)
+
+
+def create_registration(*, email: str, password_hash: str, name: str):
+    """
+    Create an unverified, inactive user from an already-hashed password and queue the OTP.
+
+    Everything happens in one transaction with one INSERT each for the user, the profile
+    (created by `ensure_profile` with the name already set), the OTP and the outbox email.
+    Duplicates are caught by the unique constraint. Hashing is left to the caller, so it
+    runs outside the transaction and the async endpoints can run it off the event loop.
+    With sharding, the user's rows go to its shard and the directory entry (whose unique
+    email catches duplicates on other shards) to `default`.
+    """
+    otp = generate_numeric_otp(settings.EMAIL_OTP_LENGTH)
+    user = User(email=email, password=password_hash)
+    shard = shard_for_new_user(user.pk)
+    try:
+        with atomic_with(shard):
+            user._profile_name = name
+            user.save(using=shard)
+            user.email_otps.create(
+                purpose=EmailOTP.Purpose.VERIFY_EMAIL,
+                code_hash=make_otp_hash(otp),
+                expires_at=timezone.now() + timedelta(seconds=settings.EMAIL_OTP_TTL_SECONDS),
+            )
+            send_verification_otp(email=user.email, otp=otp)
+    except IntegrityError:
+        # Race-condition safe duplicate rejection
+        raise serializers.ValidationError({"email": "A user with this email already exists."})
+    return user
+
+
+class VerifyEmailSerializer(TimedSerializerMixin, serializers.Serializer):
     email = serializers.EmailField()
     otp = serializers.CharField(write_only=True)
 
@@ -76,12 +83,12 @@ class VerifyEmailSerializer(serializers.Serializer):
         email = attrs["email"].strip().lower()
         otp = attrs["otp"].strip()
         try:
-            user = User.objects.get(email__iexact=email)
+            user = User.objects.for_email(email).get()
         except User.DoesNotExist:
             raise serializers.ValidationError({"email": "No user found for this email."})
 
         otp_qs = (
-            EmailOTP.objects.filter(user=user, purpose=EmailOTP.Purpose.VERIFY_EMAIL, used_at__isnull=True)
+            user.email_otps.filter(purpose=EmailOTP.Purpose.VERIFY_EMAIL, used_at__isnull=True)
             .order_by("-created_at")
         )
         otp_obj = otp_qs.first()
@@ -89,7 +96,7 @@ class VerifyEmailSerializer(serializers.Serializer):
             raise serializers.ValidationError({"otp": "No active OTP found. Please register again."})
         if otp_obj.is_expired:
             raise serializers.ValidationError({"otp": "OTP expired. Please register again."})
-        if not check_password(otp, otp_obj.code_hash):
+        if not check_otp_hash(otp, otp_obj.code_hash):
             raise serializers.ValidationError({"otp": "Invalid OTP."})
 
         attrs["user"] = user
@@ -108,7 +115,7 @@ class VerifyEmailSerializer(serializers.Serializer):
         return user
 
 
-class ForgotPasswordSerializer(serializers.Serializer):
+class ForgotPasswordSerializer(TimedSerializerMixin, serializers.Serializer):
     email = serializers.EmailField()
 
     def create(self, validated_data):
@@ -116,7 +123,7 @@ class ForgotPasswordSerializer(serializers.Serializer):
         request = self.context.get("request")
 
         try:
-            user = User.objects.get(email__iexact=email)
+            user = User.objects.for_email(email).get()
         except User.DoesNotExist:
             return {"sent": False}
 
@@ -133,7 +140,7 @@ class ForgotPasswordSerializer(serializers.Serializer):
         return {"sent": True}
 
 
-class ResetPasswordSerializer(serializers.Serializer):
+class ResetPasswordSerializer(TimedSerializerMixin, serializers.Serializer):
     uidb64 = serializers.CharField()
     token = serializers.CharField()
     new_password = serializers.CharField(write_only=True, min_length=8)
@@ -141,7 +148,7 @@ class ResetPasswordSerializer(serializers.Serializer):
     def validate(self, attrs):
         try:
             uid = force_str(urlsafe_base64_decode(attrs["uidb64"]))
-            user = User.objects.get(pk=uid)
+            user = User.objects.for_id(uid).get()
         except Exception:
             raise serializers.ValidationError({"uidb64": "Invalid uid."})
 
@@ -158,13 +165,13 @@ class ResetPasswordSerializer(serializers.Serializer):
         return user
 
 
-class ResendOTPSerializer(serializers.Serializer):
+class ResendOTPSerializer(TimedSerializerMixin, serializers.Serializer):
     email = serializers.EmailField()
 
     def validate_email(self, value: str) -> str:
         value = value.strip().lower()
         try:
-            user = User.objects.get(email__iexact=value)
+            user = User.objects.for_email(value).get()
         except User.DoesNotExist:
             raise serializers.ValidationError("No user found for this email.")
         if user.email_verified:
@@ -173,21 +180,19 @@ class ResendOTPSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         email = validated_data["email"]
-        user = User.objects.get(email__iexact=email)
+        user = User.objects.for_email(email).get()
 
         # Invalidate all existing unused OTPs for this user
-        EmailOTP.objects.filter(
-            user=user,
+        user.email_otps.filter(
             purpose=EmailOTP.Purpose.VERIFY_EMAIL,
             used_at__isnull=True
         ).update(used_at=timezone.now())
 
         # Generate and send new OTP
         otp = generate_numeric_otp(settings.EMAIL_OTP_LENGTH)
-        EmailOTP.objects.create(
-            user=user,
+        user.email_otps.create(
             purpose=EmailOTP.Purpose.VERIFY_EMAIL,
-            code_hash=make_password(otp),
+            code_hash=make_otp_hash(otp),
             expires_at=timezone.now() + timedelta(seconds=settings.EMAIL_OTP_TTL_SECONDS),
         )
         send_verification_otp(email=user.email, otp=otp)
@@ -0,0 +1,321 @@
+"""
+Horizontal sharding of users and the rows that hang off them.
+
+Each user's `User`, `UserProfile`, `EmailOTP` and JWT outstanding/blacklisted token rows
+live together on one alias of `USER_SHARDS`. A new user is placed by rendezvous
+(highest random weight) hashing of the user id. Adding a shard then moves only the users
+that now hash to it, about 1/N of them. The `UserShard` directory on `default` records
+where each user actually lives:
+
+- `email__iexact` lookups (login, verify-email, resend, forgot-password) cost one indexed
+  directory read, then go straight to the right shard (`User.objects.for_email`);
+- lookups by user id (JWT auth, password reset) use it the same way (`for_id`);
+- its unique `email` keeps emails unique across shards;
+- it stays authoritative while `rebalance_shards` moves users after the shard list changes.
+
+Staff and superusers are kept on `default`, next to the tables the Django admin and
+sessions write (`django_admin_log` has a foreign key to the acting user).
+
+`UserShardRouter` sends queries for an instance to the instance's database, or to the
+owning user's shard for new rows. Queries with no instance go to the shard chosen by
+`use_shard` (workers, simplejwt's token tables), else to `default`. Code that scans every
+user (the admin list, exports, workers) loops over `shard_targets()` or merges per-shard results
+with `merge_shards`.
+
+With fewer than two shards (the default), nothing here runs a query and every router
+method defers to the next router.
+"""
+from __future__ import annotations
+
+import hashlib
+import heapq
+import uuid
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.accounts.models import EmailOTP, User, UserShard
+from apps.profiles.models import UserProfile
+
+
+DIRECTORY_DB_ALIAS = DEFAULT_DB_ALIAS
+
+# Models whose rows follow their user onto its shard (`label_lower`, so the auto-created
+# group/permission through tables are included).
+SHARDED_MODELS = frozenset(
+    {
+        "accounts.user",
+        "accounts.user_groups",
+        "accounts.user_user_permissions",
+        "accounts.emailotp",
+        "profiles.userprofile",
+        "token_blacklist.outstandingtoken",
+        "token_blacklist.blacklistedtoken",
+    }
+)
+
+_active_shard: ContextVar[str | None] = ContextVar("active_user_shard", default=None)
+
+
+class ShardMoveError(Exception):
+    pass
+
+
+def shards() -> list[str]:
+    return list(settings.USER_SHARDS) or [DEFAULT_DB_ALIAS]
+
+
+def sharding_enabled() -> bool:
+    return len(settings.USER_SHARDS) > 1
+
+
+def is_sharded(model) -> bool:
+    return model._meta.label_lower in SHARDED_MODELS
+
+
+def _as_uuid(user_id) -> uuid.UUID | None:
+    if isinstance(user_id, uuid.UUID):
+        return user_id
+    try:
+        return uuid.UUID(str(user_id))
+    except ValueError:
+        return None
+
+
+def rendezvous_shard(user_id, candidates: list[str] | None = None) -> str:
+    """The alias with the highest hash of (alias, user id); stable as long as `candidates` is."""
+    key = str(_as_uuid(user_id) or user_id)
+
+    def weight(alias: str) -> bytes:
+        return hashlib.blake2b(f"{alias}:{key}".encode(), digest_size=8).digest()
+
+    return max(candidates or shards(), key=weight)
+
+
+def home_shard(user_id, *, staff: bool = False, candidates: list[str] | None = None) -> str:
+    """Where a user belongs: `default` for staff (see module docstring), else by rendezvous hashing."""
+    if staff:
+        return DIRECTORY_DB_ALIAS
+    return rendezvous_shard(user_id, candidates)
+
+
+def shard_for_email(email: str) -> str | None:
+    """The shard holding `email`, or None (the caller's default routing) when unsharded or unknown."""
+    if not sharding_enabled() or not email:
+        return None
+    return (
+        UserShard.objects.using(DIRECTORY_DB_ALIAS)
+        .filter(email=email.strip().lower())
+        .values_list("shard", flat=True)
+        .first()
+    )
+
+
+async def ashard_for_email(email: str) -> str | None:
+    if not sharding_enabled():
+        return None
+    return await sync_to_async(shard_for_email)(email)
+
+
+def shard_for_user(user_id) -> str | None:
+    """
+    The shard holding `user_id`'s rows: its directory entry, else where a new user with
+    that id would be placed. None when unsharded.
+    """
+    if not sharding_enabled():
+        return None
+    user_id = _as_uuid(user_id)
+    if user_id is None:
+        return None
+    shard = UserShard.objects.using(DIRECTORY_DB_ALIAS).filter(user_id=user_id).values_list("shard", flat=True).first()
+    return shard or rendezvous_shard(user_id)
+
+
+def shard_of(instance) -> str | None:
+    """The database `instance` was loaded from when sharded, else None (the usual routing)."""
+    return instance._state.db if sharding_enabled() else None
+
+
+def shard_for_new_user(user_id) -> str | None:
+    return rendezvous_shard(user_id) if sharding_enabled() else None
+
+
+def record_user_shard(user, shard: str, *, created: bool = False) -> None:
+    """Create or refresh `user`'s directory entry (called from the User post_save signal)."""
+    directory = UserShard.objects.using(DIRECTORY_DB_ALIAS)
+    if created or not directory.filter(user_id=user.pk).update(email=user.email, shard=shard):
+        directory.create(user_id=user.pk, email=user.email, shard=shard)
+
+
+def forget_user_shard(user_id) -> None:
+    UserShard.objects.using(DIRECTORY_DB_ALIAS).filter(user_id=user_id).delete()
+
+
+@contextmanager
+def use_shard(alias: str | None):
+    """Route sharded queries that carry no instance to `alias` (no-op for None)."""
+    if alias is None:
+        yield
+        return
+    token = _active_shard.set(alias)
+    try:
+        yield
+    finally:
+        _active_shard.reset(token)
+
+
+def shard_targets() -> list[str | None]:
+    """
+    The aliases a scan over every user must visit: each shard, or just `None` (the usual
+    routing, which may pick a replica) when unsharded. For `.using()` and `use_shard`.
+    """
+    return shards() if sharding_enabled() else [None]
+
+
+@contextmanager
+def atomic_with(shard: str | None):
+    """
+    `transaction.atomic()` on `default` plus, when different, on `shard`. An error inside
+    the block rolls back both. The commits run one after the other, the shard's first, so
+    a crash between them leaves a user with no directory entry, which `rebalance_shards`
+    backfills.
+    """
+    with ExitStack() as stack:
+        stack.enter_context(transaction.atomic())
+        if shard and shard != DEFAULT_DB_ALIAS:
+            stack.enter_context(transaction.atomic(using=shard))
+        yield
+
+
+def merge_shards(queryset, *, limit: int, key, reverse: bool = False) -> list:
+    """
+    The first `limit` rows of an ordered `queryset` across every shard. Each shard returns
+    its own first `limit` rows in the same order, and the lists are merged on `key`
+    (`reverse` for descending orderings).
+    """
+    if not sharding_enabled() or not is_sharded(queryset.model):
+        return list(queryset[:limit])
+    per_shard = [list(queryset.using(alias)[:limit]) for alias in shards()]
+    return list(islice(heapq.merge(*per_shard, key=key, reverse=reverse), limit))
+
+
+def find_shard(model, **lookup) -> str | None:
+    """The first shard with a `model` row matching `lookup` (for lookups the directory cannot answer)."""
+    if not sharding_enabled():
+        return None
+    for alias in shards():
+        try:
+            if model._default_manager.using(alias).filter(**lookup).exists():
+                return alias
+        except (DjangoValidationError, ValueError):
+            return None
+    return None
+
+
+def _owner_id(instance):
+    if isinstance(instance, User):
+        return instance.pk
+    return getattr(instance, "user_id", None)
+
+
+class UserShardRouter:
+    """Routes sharded models (see module docstring); defers everything else."""
+
+    def _route(self, model, hints):
+        if not sharding_enabled() or not is_sharded(model):
+            return None
+        instance = hints.get("instance")
+        if instance is not None:
+            if instance._state.db:
+                return instance._state.db
+            if isinstance(instance, User) and (instance.is_staff or instance.is_superuser):
+                return DIRECTORY_DB_ALIAS
+            owner_id = _owner_id(instance)
+            if owner_id is not None:
+                return shard_for_user(owner_id)
+        return _active_shard.get()
+
+    def db_for_read(self, model, **hints):
+        return self._route(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._route(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not sharding_enabled():
+            return None
+        if obj1._state.db in settings.USER_SHARDS and obj2._state.db in settings.USER_SHARDS:
+            return obj1._state.db == obj2._state.db
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Shards get the full schema (so foreign keys resolve), except the directory.
+        if app_label == "accounts" and model_name == "usershard":
+            return db == DIRECTORY_DB_ALIAS
+        return None
+
+
+@dataclass
+class MoveResult:
+    user_id: uuid.UUID
+    source: str
+    target: str
+    otps: int = 0
+    tokens: int = 0
+
+
+def move_user(user_id, target: str) -> MoveResult | None:
+    """
+    Copy a user's rows to `target`, delete them from their current shard and repoint the
+    directory. Returns None when the user is already on `target`.
+
+    Rows are copied with `bulk_create`, so no signals fire for the copies. The source
+    deletes send the usual post_delete signals, which evict cached users and responses and
+    drop the old search index row. The move holds write transactions on the source,
+    the target and the directory, so it blocks writers on them for its duration.
+    Users with group or permission assignments are refused, because those ids are
+    local to each database.
+    """
+    from apps.profiles.search import index_profiles
+
+    if target not in shards():
+        raise ShardMoveError(f"Unknown shard {target!r}")
+    source = shard_for_user(user_id) or DEFAULT_DB_ALIAS
+    if source == target:
+        return None
+
+    with atomic_with(target), transaction.atomic(using=source):
+        user = User.objects.using(source).get(pk=user_id)
+        if user.groups.exists() or user.user_permissions.exists():
+            raise ShardMoveError(f"{user.email} has group or permission assignments; move them by hand")
+        profiles = list(UserProfile.objects.using(source).filter(user_id=user.pk))
+        otps = list(EmailOTP.objects.using(source).filter(user_id=user.pk))
+        tokens = list(OutstandingToken.objects.using(source).filter(user_id=user.pk).order_by("id"))
+        blacklisted = set(
+            BlacklistedToken.objects.using(source).filter(token__in=tokens).values_list("token_id", flat=True)
+        )
+
+        User.objects.using(target).bulk_create([user])
+        UserProfile.objects.using(target).bulk_create(profiles)
+        EmailOTP.objects.using(target).bulk_create(otps)
+        # Token ids are per-database sequences, so the copies get fresh ids.
+        old_ids = [token.pk for token in tokens]
+        for token in tokens:
+            token.pk = None
+        copies = OutstandingToken.objects.using(target).bulk_create(tokens)
+        BlacklistedToken.objects.using(target).bulk_create(
+            [BlacklistedToken(token=copy) for old_id, copy in zip(old_ids, copies) if old_id in blacklisted]
+        )
+
+        OutstandingToken.objects.using(source).filter(pk__in=old_ids).delete()
+        User.objects.using(source).get(pk=user.pk).delete()
+        record_user_shard(user, target)
+        index_profiles(profiles, using=target)
+    return MoveResult(user_id=user.pk, source=source, target=target, otps=len(otps), tokens=len(tokens))
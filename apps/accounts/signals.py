@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.authentication import invalidate_cached_user
+from apps.accounts.blacklist import blacklist_index
+from apps.accounts.sharding import forget_user_shard, record_user_shard, sharding_enabled
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def evict_cached_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def update_shard_directory(sender, instance, created, using, update_fields=None, **kwargs):
+    if not sharding_enabled():
+        return
+    if created or update_fields is None or "email" in update_fields:
+        record_user_shard(instance, using, created=created)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def remove_from_shard_directory(sender, instance, **kwargs):
+    if sharding_enabled():
+        forget_user_shard(instance.pk)
+
+
+@receiver(post_save, sender="profiles.UserProfile")
+@receiver(post_delete, sender="profiles.UserProfile")
+def evict_cached_user_for_profile(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
+
+
+@receiver(post_save, sender="token_blacklist.BlacklistedToken")
+def index_blacklisted_token(sender, instance, created, **kwargs):
+    if created:
+        blacklist_index.add(instance.token.jti, instance.token.expires_at)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+
+KEY_KINDS = ("ip", "email", "global")
+
+
+@dataclass
+class RateDecision:
+    allowed: bool
+    wait: float | None = None
+    rejected_by: str | None = None
+
+
+def parse_rate(rate: str | None) -> tuple[int, int] | None:
+    """Parse "<count>/<period>" where period starts with s, m, h or d (as DRF does)."""
+    if not rate:
+        return None
+    num, period = rate.split("/")
+    return int(num), {"s": 1, "m": 60, "h": 3600, "d": 86400}[period.strip()[0]]
+
+
+def normalize_email(value) -> str | None:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    return value.strip().lower()
+
+
+def _cache():
+    return caches[settings.AUTH_RATE_LIMIT_CACHE_ALIAS]
+
+
+def _window_keys(key: str, period: int, now: float) -> tuple[str, str, float]:
+    window = int(now // period)
+    return f"{key}:{window - 1}", f"{key}:{window}", now - window * period
+
+
+def _estimate(counts: dict, prev_key: str, curr_key: str, elapsed: float, period: int) -> tuple[float, int, int]:
+    prev, curr = counts.get(prev_key, 0), counts.get(curr_key, 0)
+    return prev * (period - elapsed) / period + curr, prev, curr
+
+
+def _wait_for(limit: int, period: int, elapsed: float, prev: int, curr: int) -> float:
+    remaining = period - elapsed
+    if curr >= limit or not prev:
+        return remaining
+    # Seconds until the previous window's weighted share falls enough to admit one more request.
+    return max(0.0, remaining - (limit - curr) * period / prev)
+
+
+def check_rate_limits(scope: str | None, *, ident: str | None, email: str | None) -> RateDecision:
+    """
+    Count one request against the `AUTH_RATE_LIMITS[scope]` limits, or reject it.
+
+    Each key (client IP, normalized email, and all clients together) uses a sliding-window
+    counter: the current fixed window's count plus the previous one's, weighted by how much
+    of it still overlaps the window. That costs two cache keys per limit and one `get_many`
+    per request. A rejected request does not use up quota. It only bumps the rejection
+    counter reported by `rejection_counts()`.
+    """
+    if not settings.AUTH_RATE_LIMITS_ENABLED or scope not in settings.AUTH_RATE_LIMITS:
+        return RateDecision(allowed=True)
+
+    values = {"ip": ident, "email": email, "global": "all"}
+    now = time.time()
+    limits = []
+    for kind, rate in settings.AUTH_RATE_LIMITS[scope].items():
+        parsed = parse_rate(rate)
+        if parsed is None or values.get(kind) is None:
+            continue
+        limit, period = parsed
+        prev_key, curr_key, elapsed = _window_keys(f"auth:ratelimit:{scope}:{kind}:{values[kind]}", period, now)
+        limits.append((kind, limit, period, prev_key, curr_key, elapsed))
+    if not limits:
+        return RateDecision(allowed=True)
+
+    cache = _cache()
+    counts = cache.get_many([key for entry in limits for key in entry[3:5]])
+    for kind, limit, period, prev_key, curr_key, elapsed in limits:
+        estimated, prev, curr = _estimate(counts, prev_key, curr_key, elapsed, period)
+        if estimated >= limit:
+            _count_rejection(scope, kind)
+            return RateDecision(allowed=False, wait=_wait_for(limit, period, elapsed, prev, curr), rejected_by=kind)
+
+    for kind, limit, period, prev_key, curr_key, elapsed in limits:
+        cache.add(curr_key, 0, timeout=2 * period)
+        try:
+            cache.incr(curr_key)
+        except ValueError:
+            # Evicted between add() and incr().
+            cache.set(curr_key, 1, timeout=2 * period)
+    return RateDecision(allowed=True)
+
+
+def _rejection_key(scope: str, kind: str) -> str:
+    return f"auth:ratelimit:rejected:{scope}:{kind}"
+
+
+def _count_rejection(scope: str, kind: str) -> None:
+    cache = _cache()
+    key = _rejection_key(scope, kind)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def rejection_counts() -> dict[str, dict[str, int]]:
+    """Rejected requests per configured scope and key kind since the cache was last cleared."""
+    keys = {(scope, kind): _rejection_key(scope, kind) for scope in settings.AUTH_RATE_LIMITS for kind in KEY_KINDS}
+    found = _cache().get_many(list(keys.values()))
+    counts: dict[str, dict[str, int]] = {}
+    for (scope, kind), key in keys.items():
+        counts.setdefault(scope, {})[kind] = found.get(key, 0)
+    return counts
+
+
+class AuthRateThrottle(BaseThrottle):
+    """
+    DRF throttle for the public auth views, keyed by client IP, the normalized `email` in
+    the body, and globally, with limits from `AUTH_RATE_LIMITS[view.throttle_scope]`.
+
+    Throttles run in `APIView.initial()`, so over-limit requests are turned away with a 429
+    before the serializer, password hashing or any email work.
+    """
+
+    def allow_request(self, request, view):
+        data = request.data if hasattr(request.data, "get") else {}
+        decision = check_rate_limits(
+            getattr(view, "throttle_scope", None),
+            ident=self.get_ident(request),
+            email=normalize_email(data.get("email")),
+        )
+        self._wait = decision.wait
+        return decision.allowed
+
+    def wait(self):
+        return self._wait
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from django.urls import path
 
-from apps.accounts import views
+from apps.accounts import async_views, views
 
 
 urlpatterns = [
@@ -14,5 +14,11 @@ urlpatterns = [
     path("logout/", views.LogoutView.as_view(), name="logout"),
     path("forgot-password/", views.ForgotPasswordView.as_view(), name="forgot_password"),
     path("reset-password/", views.ResetPasswordView.as_view(), name="reset_password"),
+    path("rate-limits/", views.RateLimitStatsView.as_view(), name="rate_limit_stats"),
+    # Async variants for ASGI deployments.
+    path("async/register/", async_views.register, name="async_register"),
+    path("async/verify-email/", async_views.verify_email, name="async_verify_email"),
+    path("async/login/", async_views.login, name="async_login"),
+    path("async/token/refresh/", async_views.token_refresh, name="async_token_refresh"),
 ]
 
@@ -3,15 +3,17 @@ from __future__ import annotations
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from apps.accounts.jwt import EmailTokenObtainPairSerializer
+from apps.accounts.jwt import EmailTokenObtainPairSerializer, IndexedRefreshToken, IndexedTokenRefreshSerializer
 from apps.accounts.serializers import ForgotPasswordSerializer, RegisterSerializer, ResendOTPSerializer, ResetPasswordSerializer, VerifyEmailSerializer
+from apps.accounts.throttling import AuthRateThrottle, rejection_counts
 
 
 class RegisterView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "register"
 
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
@@ -25,6 +27,8 @@ class RegisterView(APIView):
 
 class VerifyEmailView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "verify_email"
 
     def post(self, request):
         serializer = VerifyEmailSerializer(data=request.data)
@@ -35,11 +39,14 @@ class VerifyEmailView(APIView):
 
 class LoginView(TokenObtainPairView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "login"
     serializer_class = EmailTokenObtainPairSerializer
 
 
 class RefreshView(TokenRefreshView):
     permission_classes = [permissions.AllowAny]
+    serializer_class = IndexedTokenRefreshSerializer
 
 
 class LogoutView(APIView):
@@ -50,7 +57,7 @@ class LogoutView(APIView):
         if not refresh:
             return Response({"refresh": "This field is required."}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            token = RefreshToken(refresh)
+            token = IndexedRefreshToken(refresh)
             token.blacklist()
         except Exception:
             return Response({"detail": "Invalid refresh token."}, status=status.HTTP_400_BAD_REQUEST)
@@ -59,6 +66,8 @@ class LogoutView(APIView):
 
 class ForgotPasswordView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "forgot_password"
 
     def post(self, request):
         serializer = ForgotPasswordSerializer(data=request.data, context={"request": request})
@@ -80,6 +89,8 @@ class ResetPasswordView(APIView):
 
 class ResendOTPView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "resend_otp"
 
     def post(self, request):
         serializer = ResendOTPSerializer(data=request.data)
@@ -90,3 +101,9 @@ class ResendOTPView(APIView):
             status=status.HTTP_200_OK,
         )
 
+
+class RateLimitStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({"rejections": rejection_counts()}, status=status.HTTP_200_OK)
@@ -0,0 +1,29 @@
+"""
+Caches that every worker process must see.
+
+The auth user cache, cached profile responses, rate-limit counters and sticky replica
+marks only work when all workers share one cache (Redis, Memcached, ...). Django's
+`LocMemCache` lives inside a single process, so an eviction or a counter update made by
+one worker is invisible to the others. It is accepted only with
+`CACHE_ALLOW_PROCESS_LOCAL` (on by default with `DEBUG`, i.e. for development and tests).
+Optional caches are skipped otherwise (`shared_cache` returns None). Rate limits then count
+per worker, and `apps.core.checks` warns about both. Read replicas cannot work without a
+shared cache and fail the checks.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_process_local(alias: str) -> bool:
+    return isinstance(caches[alias], LocMemCache)
+
+
+def shared_cache(alias: str):
+    """`caches[alias]`, or None when it is process-local and that is not allowed."""
+    cache = caches[alias]
+    if isinstance(cache, LocMemCache) and not settings.CACHE_ALLOW_PROCESS_LOCAL:
+        return None
+    return cache
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+from apps.core.caches import is_process_local
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """Report features pointed at a process-local cache (see `apps.core.caches`)."""
+    if settings.CACHE_ALLOW_PROCESS_LOCAL:
+        return []
+    messages = []
+    if settings.AUTH_USER_CACHE_TTL_SECONDS and is_process_local(settings.AUTH_USER_CACHE_ALIAS):
+        messages.append(
+            Warning(
+                "AUTH_USER_CACHE_ALIAS is a process-local cache, so authenticated users are not cached.",
+                hint="Point DJANGO_CACHE_BACKEND at a shared cache (Redis, Memcached).",
+                id="core.W001",
+            )
+        )
+    if settings.PROFILE_RESPONSE_CACHE_TTL_SECONDS and is_process_local(settings.PROFILE_RESPONSE_CACHE_ALIAS):
+        messages.append(
+            Warning(
+                "PROFILE_RESPONSE_CACHE_ALIAS is a process-local cache, so profile responses are not cached.",
+                hint="Point DJANGO_CACHE_BACKEND at a shared cache (Redis, Memcached).",
+                id="core.W002",
+            )
+        )
+    if settings.AUTH_RATE_LIMITS_ENABLED and is_process_local(settings.AUTH_RATE_LIMIT_CACHE_ALIAS):
+        messages.append(
+            Warning(
+                "AUTH_RATE_LIMIT_CACHE_ALIAS is a process-local cache, so each worker counts "
+                "requests separately and the effective limits scale with the worker count.",
+                hint="Point DJANGO_CACHE_BACKEND at a shared cache, or set AUTH_RATE_LIMITS_ENABLED=0.",
+                id="core.W003",
+            )
+        )
+    if settings.DATABASE_REPLICAS and is_process_local(settings.DATABASE_REPLICA_STICKY_CACHE_ALIAS):
+        messages.append(
+            Error(
+                "DATABASE_REPLICA_STICKY_CACHE_ALIAS is a process-local cache, so a request served by "
+                "another worker would not see a client's recent write and would read a stale replica.",
+                hint="Point DJANGO_CACHE_BACKEND at a shared cache (Redis, Memcached).",
+                id="core.E002",
+            )
+        )
+    return messages
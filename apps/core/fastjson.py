@@ -0,0 +1,100 @@
+"""
+DRF renderer and parser backed by orjson, selected with `API_JSON_BACKEND`.
+
+Output matches DRF's JSONRenderer: compact, UTF-8, U+2028/U+2029 escaped, and the same
+representation for every type it handles, because values orjson does not encode
+natively go through the same encoder as the stdlib path (`APIJSONEncoder`). The one
+difference: DRF raises on NaN and Infinity floats, while orjson writes them as `null`.
+Serializers here never produce them.
+When orjson is not installed, or `API_JSON_BACKEND` is "stdlib", both classes behave
+exactly like their DRF parents.
+"""
+from __future__ import annotations
+
+import json
+
+from django.conf import settings
+from django.db.models.fields.files import FieldFile
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Optional: `pip install orjson` to enable the fast path.
+    orjson = None
+
+
+JSON_BACKENDS = ("orjson", "stdlib")
+
+
+def fast_backend_enabled() -> bool:
+    return orjson is not None and settings.API_JSON_BACKEND == "orjson"
+
+
+class APIJSONEncoder(JSONEncoder):
+    """DRF's encoder, plus file fields as their URL (or null when empty)."""
+
+    def default(self, obj):
+        if isinstance(obj, FieldFile):
+            return obj.url if obj else None
+        return super().default(obj)
+
+
+_encoder = APIJSONEncoder()
+
+if orjson is not None:
+    # Datetimes are passed through so they get DRF's format (microsecond precision, "Z").
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    encoder_class = APIJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # Indented output (browsable API, `; indent=` in Accept) stays on the stdlib path.
+        if not fast_backend_enabled() or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+        # Like DRF: these are valid JSON but end a line in JavaScript (pre-ES2019) source.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not fast_backend_enabled():
+            return super().parse(stream, media_type, parser_context)
+        # orjson only reads UTF-8, which is what JSON bodies are (RFC 8259).
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class PreRenderedJSONResponse(Response):
+    """
+    A `Response` whose body was rendered earlier by `FastJSONRenderer` (e.g. cached bytes).
+    The bytes are sent unchanged; `.data` decodes them only when read.
+    """
+
+    def __init__(self, content: bytes, **kwargs):
+        self.prerendered_content = content
+        super().__init__(**kwargs)
+
+    @property
+    def data(self):
+        return json.loads(self.prerendered_content)
+
+    @data.setter
+    def data(self, value):
+        # Response.__init__ assigns None; the body is `prerendered_content`.
+        pass
+
+    @property
+    def rendered_content(self):
+        self["Content-Type"] = FastJSONRenderer.media_type
+        return self.prerendered_content
@@ -0,0 +1,73 @@
+"""
+Process-wide request latency histograms, rendered in the Prometheus text format.
+
+Series are labelled by route (the URL name, so cardinality stays bounded) and method:
+`http_request_duration_seconds` for whole requests and `http_request_phase_seconds` for
+each phase recorded by `apps.core.timing`. With several worker processes each one
+reports its own counts, as with any in-process Prometheus client.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot: above the largest bucket
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+_lock = threading.Lock()
+_requests: dict[tuple[str, str], Histogram] = {}
+_phases: dict[tuple[str, str, str], Histogram] = {}
+
+
+def observe_request(route: str, method: str, total: float, phases: dict[str, list]) -> None:
+    with _lock:
+        _requests.setdefault((route, method), Histogram()).observe(total)
+        for name, (seconds, _calls) in phases.items():
+            _phases.setdefault((route, method, name), Histogram()).observe(seconds)
+
+
+def reset() -> None:
+    with _lock:
+        _requests.clear()
+        _phases.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render(name: str, help_text: str, label_names: tuple[str, ...], series: dict) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for key, histogram in sorted(series.items()):
+        labels = ",".join(f'{label}="{_escape(value)}"' for label, value in zip(label_names, key))
+        cumulative = 0
+        for bound, count in zip((*BUCKETS, "+Inf"), histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+def render_prometheus() -> str:
+    with _lock:
+        lines = _render(
+            "http_request_duration_seconds", "Request latency by route.", ("route", "method"), _requests
+        ) + _render(
+            "http_request_phase_seconds", "Time spent in each named phase per request.", ("route", "method", "phase"), _phases
+        )
+    return "\n".join(lines) + "\n"
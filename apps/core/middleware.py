@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from apps.core.metrics import observe_request
+from apps.core.timing import end_request, phase, start_request
+
+
+def _timed_execute(execute, sql, params, many, context):
+    with phase("db"):
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def _timed_queries():
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(_timed_execute))
+        yield
+
+
+class ServerTimingMiddleware:
+    """
+    Times each request and its named phases, adds them to the `Server-Timing` response
+    header (when SERVER_TIMING_HEADER is on) and records them in the `/metrics`
+    histograms. SQL is timed through `execute_wrapper` on the connections of the thread
+    that runs the request's queries (the worker thread of the async ORM under ASGI), so
+    queries run from other threads (e.g. `sync_to_async(thread_sensitive=False)`) are not
+    included. Keep it first in MIDDLEWARE so `total` covers the whole stack. Runs natively
+    under both WSGI and ASGI, so async views are not pushed through a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings, token = start_request()
+        try:
+            with _timed_queries():
+                response = self.get_response(request)
+        finally:
+            end_request(token)
+        return self._report(request, response, timings)
+
+    async def __acall__(self, request):
+        timings, token = start_request()
+        # The async ORM runs queries on the request's thread-sensitive worker thread, so
+        # the wrappers go on that thread's connections.
+        queries = ExitStack()
+        await sync_to_async(queries.enter_context)(_timed_queries())
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(queries.close)()
+            end_request(token)
+        return self._report(request, response, timings)
+
+    def _report(self, request, response, timings):
+        total = timings.elapsed()
+        match = request.resolver_match
+        route = (match.view_name if match else None) or "unmatched"
+        observe_request(route, request.method, total, timings.phases)
+
+        if settings.SERVER_TIMING_HEADER:
+            entries = [
+                f'{name};dur={seconds * 1000:.2f};desc="{calls}x"' if calls > 1 else f"{name};dur={seconds * 1000:.2f}"
+                for name, (seconds, calls) in timings.phases.items()
+            ]
+            entries.append(f"total;dur={total * 1000:.2f}")
+            response["Server-Timing"] = ", ".join(entries)
+        return response
@@ -0,0 +1,156 @@
+"""
+Primary/replica database routing with read-your-writes stickiness.
+
+Writes always go to `default` (the primary). Reads go to a random alias from
+`DATABASE_REPLICAS`, but only while a request is being handled (see
+`ReplicaStickinessMiddleware`). Management commands, workers and shells read from the
+primary. Reads also stay on the primary:
+
+- inside a transaction on the primary, so read-modify-write code sees its own rows;
+- for the rest of a request once it has written;
+- for `DATABASE_REPLICA_STICKY_SECONDS` after a write, for later requests from the same
+  client (identified like DRF's throttles, so `NUM_PROXIES` applies) or the same
+  authenticated user, so `verify-email` right after `register` (or a profile read right
+  after an update) does not hit a replica that has not caught up.
+
+Sticky marks live in the cache (`DATABASE_REPLICA_STICKY_CACHE_ALIAS`), which must be
+shared by every worker process: a later request may land on any of them. `manage.py
+check` fails while replicas are configured and that cache is process-local (see
+`apps.core.caches`).
+"""
+from __future__ import annotations
+
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.throttling import BaseThrottle
+
+
+@dataclass
+class RoutingState:
+    ip: str | None = None
+    user_id: str | None = None
+    pinned: bool = False
+    wrote: bool = False
+
+
+_state: ContextVar[RoutingState | None] = ContextVar("db_routing_state", default=None)
+
+
+def _cache():
+    return caches[settings.DATABASE_REPLICA_STICKY_CACHE_ALIAS]
+
+
+def sticky_key(kind: str, value) -> str:
+    return f"db:sticky:{kind}:{value}"
+
+
+def client_ident(request) -> str | None:
+    """The client address as DRF's throttles see it (the proxy-supplied one behind `NUM_PROXIES`)."""
+    return BaseThrottle().get_ident(request) or None
+
+
+def note_user(user_id) -> None:
+    """
+    Record the authenticated user for the current request, called before the user is
+    loaded. Pins the request to the primary if that user wrote recently.
+    """
+    state = _state.get()
+    if state is None or not settings.DATABASE_REPLICAS:
+        return
+    state.user_id = str(user_id)
+    if not state.pinned and _cache().get(sticky_key("user", state.user_id)):
+        state.pinned = True
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        state = _state.get()
+        if not replicas or state is None or state.pinned or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema and data from the primary.
+        return db not in settings.DATABASE_REPLICAS
+
+
+def _sticky_marks(state: RoutingState) -> dict:
+    if not state.wrote:
+        return {}
+    keys = {sticky_key("ip", state.ip): 1} if state.ip else {}
+    if state.user_id:
+        keys[sticky_key("user", state.user_id)] = 1
+    return keys
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Opens the routing state for each request and records sticky marks after writes.
+    Sync- and async-capable; the async path uses the cache's async methods.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        state = RoutingState(ip=client_ident(request))
+        if state.ip and _cache().get(sticky_key("ip", state.ip)):
+            state.pinned = True
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        keys = _sticky_marks(state)
+        if keys:
+            _cache().set_many(keys, settings.DATABASE_REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        state = RoutingState(ip=client_ident(request))
+        if state.ip and await _cache().aget(sticky_key("ip", state.ip)):
+            state.pinned = True
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        keys = _sticky_marks(state)
+        if keys:
+            await _cache().aset_many(keys, settings.DATABASE_REPLICA_STICKY_SECONDS)
+        return response
@@ -0,0 +1,76 @@
+"""
+Named phase timings for the current request.
+
+`phase("hash")` times a block (or, as a decorator, a function) and adds it to the
+request that is running, if any. Outside a request it only costs a context-variable
+lookup. Phases nest and overlap: `db` time spent inside `create` counts towards both.
+`ServerTimingMiddleware` (apps.core.middleware) opens the per-request record, reports
+it in the `Server-Timing` header and feeds the `/metrics` histograms.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        # phase -> [seconds, calls], in first-seen order
+        self.phases: dict[str, list] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        entry = self.phases.get(name)
+        if entry is None:
+            self.phases[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> RequestTimings | None:
+    return _current.get()
+
+
+def start_request() -> tuple[RequestTimings, object]:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def phase(name: str):
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+class TimedSerializerMixin:
+    """
+    Times `is_valid()` as the `validate` phase and `save()` as `create` or `update`
+    (wrapping `save()` rather than `create()` covers subclasses that override `create()`).
+    """
+
+    def is_valid(self, *args, **kwargs):
+        with phase("validate"):
+            return super().is_valid(*args, **kwargs)
+
+    def save(self, **kwargs):
+        with phase("update" if self.instance is not None else "create"):
+            return super().save(**kwargs)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from apps.core.metrics import render_prometheus
+
+
+class MetricsView(APIView):
+    """Prometheus scrape endpoint for the request histograms; staff only."""
+
+    # Bearer tokens for scrapers; sessions for staff browsing from the Django admin.
+    authentication_classes = [*api_settings.DEFAULT_AUTHENTICATION_CLASSES, SessionAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
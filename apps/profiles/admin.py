@@ -2,11 +2,18 @@ from __future__ import annotations
 
 from django.contrib import admin
 
+from apps.accounts.admin import ShardedModelAdmin
 from apps.profiles.models import UserProfile
+from apps.profiles.search import filter_by_search
 
 
 @admin.register(UserProfile)
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(ShardedModelAdmin):
     list_display = ("email", "name", "user")
     search_fields = ("email", "name", "user__email")
 
+    def get_search_results(self, request, queryset, search_term):
+        # Prefix search through the FTS index instead of icontains scans across the user join.
+        if not search_term.strip():
+            return queryset, False
+        return filter_by_search(queryset, search_term), False
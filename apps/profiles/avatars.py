@@ -0,0 +1,157 @@
+"""
+Avatar derivatives: square thumbnails in WebP with a PNG fallback, rendered by the
+`process_avatars` worker instead of on the upload request.
+
+Derivatives are stored under the SHA-256 of the source image, so a source that has been
+rendered once (for any profile) is never rendered again, and re-uploading the same image
+only costs a hash.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from apps.accounts.authentication import invalidate_cached_user
+from apps.accounts.sharding import shard_of, shard_targets
+from apps.profiles.models import UserProfile
+from apps.profiles.response_cache import invalidate_cached_response
+
+logger = logging.getLogger(__name__)
+
+# Names written by apps.profiles.uploads.ContentAddressedStorage.
+_STORED_NAME_RE = re.compile(r"avatars/[0-9a-f]{2}/([0-9a-f]{64})(?:\.\w+)?")
+
+# format -> (file extension, Pillow save options)
+VARIANT_FORMATS = {
+    "webp": ("webp", {"format": "WEBP", "method": 4}),
+    "png": ("png", {"format": "PNG", "optimize": True}),
+}
+
+
+@dataclass
+class AvatarResult:
+    claimed: int = 0
+    rendered: int = 0
+    reused: int = 0
+    failed: int = 0
+
+
+def hash_file(field_file, chunk_size: int = 64 * 1024) -> str:
+    digest = hashlib.sha256()
+    with field_file.open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stored_hash(name: str) -> str | None:
+    """The content hash embedded in a content-addressed avatar name, if it is one."""
+    match = _STORED_NAME_RE.fullmatch(name or "")
+    return match.group(1) if match else None
+
+
+def variant_name(source_hash: str, size: int, fmt: str) -> str:
+    return f"avatar_variants/{source_hash[:2]}/{source_hash}/{size}.{VARIANT_FORMATS[fmt][0]}"
+
+
+def variant_names(source_hash: str) -> dict[str, dict[str, str]]:
+    return {
+        str(size): {fmt: variant_name(source_hash, size, fmt) for fmt in VARIANT_FORMATS}
+        for size in settings.AVATAR_VARIANT_SIZES
+    }
+
+
+def render_variants(field_file, source_hash: str) -> tuple[dict[str, dict[str, str]], bool]:
+    """
+    Write every size/format derivative of `field_file` that is not stored yet. Returns
+    the variant names and whether anything had to be rendered.
+    """
+    names = variant_names(source_hash)
+    missing = [(int(size), fmt, name) for size, by_fmt in names.items() for fmt, name in by_fmt.items()
+               if not default_storage.exists(name)]
+    if not missing:
+        return names, False
+
+    with field_file.open("rb") as f:
+        image = Image.open(f)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+    # Largest first, each downscaled from the square crop of the source.
+    square = ImageOps.fit(image, (max(s for s, _, _ in missing),) * 2, method=Image.Resampling.LANCZOS)
+    for size, fmt, name in sorted(missing, reverse=True):
+        thumb = square if square.width == size else square.resize((size, size), Image.Resampling.LANCZOS)
+        options = dict(VARIANT_FORMATS[fmt][1])
+        if fmt == "webp":
+            options["quality"] = settings.AVATAR_WEBP_QUALITY
+        buffer = BytesIO()
+        thumb.save(buffer, **options)
+        default_storage.save(name, ContentFile(buffer.getvalue()))
+    return names, True
+
+
+def process_avatar(profile: UserProfile) -> str:
+    """
+    Bring `profile`'s derivatives up to date with its avatar; returns "rendered", "reused"
+    or "failed". The row is written only if the avatar was not replaced meanwhile.
+    """
+    avatar_name = profile.avatar.name
+    source_hash = stored_hash(avatar_name) or hash_file(profile.avatar)
+    try:
+        variants, rendered = render_variants(profile.avatar, source_hash)
+        outcome = "rendered" if rendered else "reused"
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        logger.warning("Could not render avatar variants for profile %s", profile.pk, exc_info=True)
+        # Recorded as processed so the worker does not retry a broken image forever.
+        variants, outcome = {}, "failed"
+
+    profiles = UserProfile.objects.using(shard_of(profile))
+    updated = profiles.filter(pk=profile.pk, avatar=avatar_name, avatar_hash="").update(
+        avatar_hash=source_hash,
+        avatar_variants=variants,
+        updated_at=timezone.now(),
+    )
+    if updated:
+        # QuerySet.update sends no post_save, so evict the cached user + profile here.
+        invalidate_cached_user(profile.user_id)
+        invalidate_cached_response(profile.user_id)
+    return outcome
+
+
+def pending_avatars(using: str | None = None):
+    # Matches the profile_avatar_pending_idx partial index condition.
+    return UserProfile.objects.using(using).filter(avatar_hash="", avatar__gt="").order_by("updated_at")
+
+
+def process_pending(*, batch_size: int | None = None) -> AvatarResult:
+    """Render derivatives for one batch of profiles with unprocessed avatars (per user shard)."""
+    result = AvatarResult()
+    for using in shard_targets():
+        for profile in pending_avatars(using)[: batch_size or settings.AVATAR_WORKER_BATCH_SIZE]:
+            result.claimed += 1
+            try:
+                outcome = process_avatar(profile)
+            except FileNotFoundError:
+                logger.warning("Avatar file missing for profile %s", profile.pk)
+                UserProfile.objects.using(using).filter(pk=profile.pk, avatar=profile.avatar.name).update(avatar=None)
+                outcome = "failed"
+            setattr(result, outcome, getattr(result, outcome) + 1)
+    return result
+
+
+def variant_urls(profile: UserProfile, request=None) -> dict[str, dict[str, str]]:
+    urls = {}
+    for size, by_fmt in (profile.avatar_variants or {}).items():
+        urls[size] = {}
+        for fmt, name in by_fmt.items():
+            url = default_storage.url(name)
+            urls[size][fmt] = request.build_absolute_uri(url) if request is not None else url
+    return urls
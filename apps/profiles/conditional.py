@@ -0,0 +1,56 @@
+"""
+Conditional requests for profile endpoints.
+
+A profile's version is its `updated_at` (every save bumps it, see `UserProfile.save`),
+so the validators are a strong ETag built from the id and `updated_at` in microseconds,
+plus `Last-Modified`. GETs answer `304 Not Modified` to a matching `If-None-Match` /
+`If-Modified-Since`; PUT/PATCH answer `412 Precondition Failed` to a stale `If-Match` /
+`If-Unmodified-Since`, which gives clients optimistic concurrency.
+
+The check only needs `(id, updated_at)`, so callers pass those without loading the
+full row when they can.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+PRECONDITION_HEADERS = ("HTTP_IF_MATCH", "HTTP_IF_UNMODIFIED_SINCE")
+
+
+def profile_version(updated_at: datetime) -> int:
+    return int(updated_at.timestamp() * 1_000_000)
+
+
+def profile_etag(profile_id, updated_at: datetime) -> str:
+    return quote_etag(f"{profile_id.hex}-{profile_version(updated_at):x}")
+
+
+def set_validators(response, profile_id, updated_at: datetime):
+    response["ETag"] = profile_etag(profile_id, updated_at)
+    response["Last-Modified"] = http_date(updated_at.timestamp())
+    return response
+
+
+def has_preconditions(request) -> bool:
+    """Whether an unsafe request carries `If-Match` / `If-Unmodified-Since`."""
+    return any(header in request.META for header in PRECONDITION_HEADERS)
+
+
+def conditional_response(request, profile_id, updated_at: datetime):
+    """
+    The 304 or 412 response the request's conditional headers call for, or None when
+    the request should be processed normally.
+    """
+    validators = set_validators(HttpResponse(), profile_id, updated_at)
+    response = get_conditional_response(
+        request,
+        etag=validators["ETag"],
+        last_modified=int(updated_at.timestamp()),
+        response=validators,
+    )
+    return None if response is validators else response
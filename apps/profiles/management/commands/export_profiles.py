@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.profiles.export import EXPORT_FORMATS, parse_bound, render_export
+
+
+class Command(BaseCommand):
+    help = "Stream all profiles (with user status fields) to CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--output", default="-", help="Output file, or - for stdout.")
+        parser.add_argument("--updated-after", help="ISO datetime or date (inclusive).")
+        parser.add_argument("--updated-before", help="ISO datetime or date (inclusive).")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched per database round trip.")
+
+    def handle(self, *args, **options):
+        try:
+            updated_after = parse_bound(options["updated_after"])
+            updated_before = parse_bound(options["updated_before"], end=True)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        chunks = render_export(
+            options["format"],
+            updated_after=updated_after,
+            updated_before=updated_before,
+            chunk_size=options["chunk_size"],
+        )
+        if options["output"] == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", newline="", encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(chunk)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.profiles.avatars import process_pending
+
+
+class Command(BaseCommand):
+    help = "Render avatar thumbnails (WebP + PNG) for newly uploaded avatars."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.AVATAR_WORKER_BATCH_SIZE)
+        parser.add_argument("--interval", type=float, default=settings.AVATAR_WORKER_POLL_SECONDS,
+                            help="Seconds to sleep when no avatars are pending.")
+        parser.add_argument("--once", action="store_true", help="Process pending avatars once and exit.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        while True:
+            result = process_pending(batch_size=batch_size)
+            if result.claimed:
+                self.stdout.write(
+                    f"claimed={result.claimed} rendered={result.rendered} reused={result.reused} failed={result.failed}"
+                )
+            if result.claimed < batch_size:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from apps.profiles.search import rebuild_index, search_available
+
+
+class Command(BaseCommand):
+    help = "Rebuild the profile full-text search index from the UserProfile table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if not search_available():
+            self.stdout.write("Full-text search index is SQLite-only; nothing to rebuild.")
+            return
+        count = rebuild_index(chunk_size=options["chunk_size"])
+        self.stdout.write(f"Indexed {count} profiles.")
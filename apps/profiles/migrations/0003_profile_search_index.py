@@ -0,0 +1,45 @@
+import uuid
+
+from django.db import migrations
+
+
+FTS_TABLE = "profiles_userprofile_fts"
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 is SQLite-only; other databases fall back to icontains (apps.profiles.search).
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    UserProfile = apps.get_model("profiles", "UserProfile")
+    profiles = UserProfile.objects.using(schema_editor.connection.alias)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            "USING fts5(profile_id UNINDEXED, user_id UNINDEXED, name, email)"
+        )
+        rows = (
+            (pk.int >> 65, pk.hex, uuid.UUID(str(user_id)).hex, name, email)
+            for pk, user_id, name, email in profiles.values_list("id", "user_id", "name", "email").iterator()
+        )
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, profile_id, user_id, name, email) VALUES (%s, %s, %s, %s, %s)",
+            list(rows),
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_profile_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_profile_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['updated_at', 'id'], name='profile_updated_id_idx'),
+        ),
+    ]
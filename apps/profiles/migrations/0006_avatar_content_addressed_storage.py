@@ -0,0 +1,20 @@
+# Generated by Django 4.2.20 on 2026-10-18 03:48
+
+import apps.profiles.models
+import apps.profiles.uploads
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0005_avatar_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, storage=apps.profiles.uploads.get_avatar_storage, upload_to=apps.profiles.models.avatar_upload_to),
+        ),
+    ]
@@ -0,0 +1,74 @@
+"""
+Mirroring of `User.email` onto `UserProfile.email`.
+
+`ensure_profile` only mirrors saves that can have changed the email. A save whose
+`update_fields` leaves out `email` is skipped (e.g. verify-email, password reset, last-login
+updates). So is a save of a user whose email still equals the one loaded from the
+database (`User._loaded_email`). A real change is written with one UPDATE and no read of
+the profile. Because `QuerySet.update` sends no signals, the cached user, the cached
+profile response and the search index are refreshed here explicitly.
+
+Bulk paths that change emails without `User.save()` (`bulk_update`, `QuerySet.update`)
+call `sync_profile_emails` with the changed users.
+"""
+from __future__ import annotations
+
+from itertools import islice
+from typing import Iterable
+
+from django.db.models import Case, EmailField, Value, When
+from django.utils import timezone
+
+from apps.accounts.authentication import invalidate_cached_user
+from apps.profiles.models import UserProfile
+from apps.profiles.response_cache import invalidate_cached_response
+from apps.profiles.search import index_profiles, reindex_emails
+
+
+_UNKNOWN = object()
+
+
+def email_may_have_changed(user, update_fields=None) -> bool:
+    if update_fields is not None and "email" not in update_fields:
+        return False
+    return getattr(user, "_loaded_email", _UNKNOWN) != user.email
+
+
+def sync_profile_emails(users: Iterable, *, using: str | None = None, chunk_size: int = 500) -> int:
+    """
+    Copy each user's email onto its profile; returns the number of profiles changed.
+
+    One UPDATE per `chunk_size` users, matching only profiles whose email differs (so
+    unchanged profiles keep their `updated_at` and ETag). A profile already loaded on a
+    user (`user.profile`) is updated in memory as well.
+    """
+    users = iter(users)
+    changed = 0
+    while chunk := list(islice(users, chunk_size)):
+        emails = {user.pk: user.email for user in chunk}
+        new_email = Case(
+            *(When(user_id=pk, then=Value(email)) for pk, email in emails.items()),
+            output_field=EmailField(),
+        )
+        now = timezone.now()
+        changed += (
+            UserProfile.objects.using(using)
+            .filter(user_id__in=emails)
+            .exclude(email=new_email)
+            .update(email=new_email, updated_at=now)
+        )
+
+        loaded, unloaded = [], {}
+        for user in chunk:
+            invalidate_cached_user(user.pk)
+            invalidate_cached_response(user.pk)
+            profile = user._state.fields_cache.get("profile")
+            if profile is None:
+                unloaded[user.pk] = user.email
+            elif profile.email != user.email:
+                profile.email, profile.updated_at = user.email, now
+                loaded.append(profile)
+        # Loaded profiles have every indexed column at hand; the rest are matched on user_id.
+        index_profiles(loaded, using=using)
+        reindex_emails(unloaded, using=using)
+    return changed
@@ -5,8 +5,11 @@ import uuid
 from django.conf import settings
 from django.db import models
 
+from apps.profiles.uploads import get_avatar_storage
+
 
 def avatar_upload_to(instance: "UserProfile", filename: str) -> str:
+    # The content-addressed avatar storage keeps only the extension of this name.
     return f"avatars/{instance.user_id}/{filename}"
 
 
@@ -16,15 +19,60 @@ class UserProfile(models.Model):
 
     name = models.CharField(max_length=255, blank=True)
     email = models.EmailField()
-    avatar = models.ImageField(upload_to=avatar_upload_to, blank=True, null=True)
+    avatar = models.ImageField(upload_to=avatar_upload_to, storage=get_avatar_storage, blank=True, null=True)
+    # Derivatives are rendered off the request path by `process_avatars`: an empty
+    # `avatar_hash` next to a set avatar marks it as pending.
+    avatar_hash = models.CharField(max_length=64, blank=True, default="")
+    avatar_variants = models.JSONField(blank=True, default=dict)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the admin list (apps.profiles.pagination).
+            models.Index(fields=["created_at", "id"], name="profile_created_id_idx"),
+            # updated_at range scans for exports (apps.profiles.export).
+            models.Index(fields=["updated_at", "id"], name="profile_updated_id_idx"),
+            # Avatars waiting for derivatives (apps.profiles.avatars).
+            models.Index(
+                fields=["updated_at"],
+                name="profile_avatar_pending_idx",
+                condition=models.Q(avatar_hash="", avatar__gt=""),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored avatar name to detect replacements in save().
+        instance._loaded_avatar = dict(zip(field_names, values)).get("avatar")
+        return instance
+
+    def _avatar_replaced(self) -> bool:
+        if not self.avatar:
+            return False
+        if not self.avatar._committed:
+            # A fresh upload, unless it is the image we already have (same content hash).
+            return not self.avatar_hash or getattr(self.avatar.file, "sha256", None) != self.avatar_hash
+        # Saved through FieldFile.save(), which stores the file before calling save().
+        return self.avatar.name != getattr(self, "_loaded_avatar", None)
+
     def save(self, *args, **kwargs):
         # Mirror user email (credential source of truth).
         self.email = (getattr(self.user, "email", "") or "").strip().lower()
+        cleared = not self.avatar and (self.avatar_hash or self.avatar_variants)
+        if self._avatar_replaced() or cleared:
+            # Variants of the previous image no longer apply; the worker renders new ones.
+            self.avatar_hash = ""
+            self.avatar_variants = {}
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "avatar_hash", "avatar_variants"}
+        if kwargs.get("update_fields"):
+            # updated_at is the version behind the profile ETags; partial saves bump it too.
+            kwargs["update_fields"] = {*kwargs["update_fields"], "updated_at"}
         super().save(*args, **kwargs)
+        self._loaded_avatar = self.avatar.name or None
 
     def __str__(self) -> str:
         return f"{self.email}"
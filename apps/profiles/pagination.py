@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from apps.accounts.sharding import merge_shards
+
+
+def _position(obj):
+    return obj.created_at, obj.pk
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on the composite key (`created_at`, `id`), newest first.
+
+    Each page is read with `WHERE (created_at, id) < cursor ORDER BY created_at DESC, id DESC
+    LIMIT n+1` (reversed for `previous` links), so the database walks the matching
+    composite index from the cursor. Fetch time stays the same at any depth, unlike OFFSET,
+    which scans and discards every row before the page. The row comparison is spelled as a
+    `created_at` range plus a tie exclusion rather than an OR, which SQLite would answer by
+    scanning the index instead of seeking into it. The `id` tiebreaker keeps the ordering
+    total when rows share a `created_at`, as bulk inserts can. With user sharding, each
+    shard answers the same page query and the pages are merged on the key.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        if cursor is None:
+            reverse, qs = False, queryset.order_by("-created_at", "-id")
+        else:
+            created_at, pk, reverse = cursor
+            if reverse:
+                qs = queryset.filter(Q(created_at__gte=created_at) & ~Q(created_at=created_at, id__lte=pk))
+                qs = qs.order_by("created_at", "id")
+            else:
+                qs = queryset.filter(Q(created_at__lte=created_at) & ~Q(created_at=created_at, id__gte=pk))
+                qs = qs.order_by("-created_at", "-id")
+
+        results = merge_shards(qs, limit=self.page_size + 1, key=_position, reverse=not reverse)
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        # Walking forwards there is a previous page iff we came from a cursor; walking
+        # backwards there is always a next page (the one we came from).
+        self.next_position = results[-1] if results and (has_more or reverse) else None
+        self.previous_position = results[0] if results and (cursor is not None and (has_more or not reverse)) else None
+        return results
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            created_at = parse_datetime(payload["t"])
+            pk = uuid.UUID(payload["i"])
+            reverse = bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk, reverse
+
+    def encode_cursor(self, obj, reverse: bool) -> str:
+        payload = {"t": obj.created_at.isoformat(), "i": obj.pk.hex}
+        if reverse:
+            payload["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("ascii"))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode("ascii"))
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,78 @@
+"""
+Rendered JSON of `GET /api/profile/me/`, cached per user.
+
+Each user has one entry holding `(version, bytes)`, where the version is the profile's
+`updated_at` (see `apps.profiles.conditional.profile_version`). An entry is only served
+when its version matches the profile on the request, so a stale entry can never be
+sent, even if an eviction is missed. The signals in `apps.profiles.signals` still evict
+entries on every profile save or delete, so dead entries do not linger.
+
+Like the auth user cache, this needs a cache shared by every worker process; on a
+process-local one (see `apps.core.caches`) nothing is cached.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from apps.core.caches import shared_cache
+from apps.profiles.conditional import profile_version
+
+
+COUNTER_KEYS = {"hits": "profile:json:hits", "misses": "profile:json:misses"}
+
+
+def _cache():
+    return caches[settings.PROFILE_RESPONSE_CACHE_ALIAS]
+
+
+def response_cache_key(user_id) -> str:
+    return f"profile:json:{user_id}"
+
+
+def _count(kind: str) -> None:
+    cache = _cache()
+    key = COUNTER_KEYS[kind]
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_cached_response(profile) -> bytes | None:
+    cache = shared_cache(settings.PROFILE_RESPONSE_CACHE_ALIAS)
+    if cache is None:
+        return None
+    entry = cache.get(response_cache_key(profile.user_id))
+    if entry is not None and entry[0] == profile_version(profile.updated_at):
+        _count("hits")
+        return entry[1]
+    _count("misses")
+    return None
+
+
+def cache_response(profile, content: bytes) -> None:
+    cache = shared_cache(settings.PROFILE_RESPONSE_CACHE_ALIAS)
+    if cache is None:
+        return
+    cache.set(
+        response_cache_key(profile.user_id),
+        (profile_version(profile.updated_at), content),
+        settings.PROFILE_RESPONSE_CACHE_TTL_SECONDS,
+    )
+
+
+def invalidate_cached_response(user_id) -> None:
+    """Evict now, and again after commit so a concurrent request cannot re-cache a stale body."""
+    cache = _cache()
+    key = response_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def response_cache_stats() -> dict[str, int]:
+    """Hits and misses since the cache was last cleared."""
+    found = _cache().get_many(list(COUNTER_KEYS.values()))
+    return {kind: found.get(key, 0) for kind, key in COUNTER_KEYS.items()}
@@ -0,0 +1,160 @@
+"""
+Full-text search over profile names and emails, backed by an SQLite FTS5 shadow table.
+
+`profiles_userprofile_fts` holds one row per profile: (profile_id, user_id) as unindexed
+payload plus the searchable `name` and `email`. Its rowid is derived from the profile
+UUID rather than the base table's implicit rowid, which VACUUM may renumber. Rows are
+written by the signals in `apps.profiles.signals`. Code that bypasses signals
+(`bulk_create`, `QuerySet.update`) calls `index_profiles` itself. Each user shard
+indexes its own profiles (`using`). On other databases search falls back to `icontains`.
+"""
+from __future__ import annotations
+
+import re
+import uuid
+from typing import Iterable
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from apps.accounts.sharding import shard_targets
+
+
+FTS_TABLE = "profiles_userprofile_fts"
+SEARCHABLE_FIELDS = frozenset({"name", "email"})
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _connection(using: str | None):
+    return connections[using or DEFAULT_DB_ALIAS]
+
+
+def search_available(using: str | None = None) -> bool:
+    return _connection(using).vendor == "sqlite"
+
+
+def fts_rowid(profile_id) -> int:
+    """A stable positive 63-bit rowid from the profile UUID (uuid4 has 122 random bits)."""
+    if not isinstance(profile_id, uuid.UUID):
+        profile_id = uuid.UUID(str(profile_id))
+    return profile_id.int >> 65
+
+
+def build_match_query(term: str) -> str | None:
+    """Turn user input into an FTS5 query: every word must match as a prefix."""
+    tokens = _TOKEN_RE.findall(term.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _row(profile) -> tuple:
+    return (fts_rowid(profile.pk), profile.pk.hex, uuid.UUID(str(profile.user_id)).hex, profile.name, profile.email)
+
+
+def index_profiles(profiles: Iterable, using: str | None = None) -> None:
+    """Insert or refresh the index rows for `profiles` (objects with pk, user_id, name, email)."""
+    if not search_available(using):
+        return
+    rows = [_row(profile) for profile in profiles]
+    if not rows:
+        return
+    with _connection(using).cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, profile_id, user_id, name, email) VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def unindex_profiles(profile_ids: Iterable, using: str | None = None) -> None:
+    if not search_available(using):
+        return
+    rowids = [(fts_rowid(pk),) for pk in profile_ids]
+    if not rowids:
+        return
+    with _connection(using).cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", rowids)
+
+
+def reindex_emails(emails: dict, using: str | None = None, chunk_size: int = 400) -> None:
+    """
+    Set the indexed email of each user in `emails` (user id -> email) without loading
+    their profiles. Rows are matched on the unindexed `user_id`, which scans the index table,
+    so this is for occasional email changes; `index_profiles` is cheaper when the profiles
+    are at hand.
+    """
+    if not emails or not search_available(using):
+        return
+    items = [(uuid.UUID(str(user_id)).hex, email) for user_id, email in emails.items()]
+    with _connection(using).cursor() as cursor:
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start : start + chunk_size]
+            cases = " ".join("WHEN %s THEN %s" for _ in chunk)
+            placeholders = ", ".join("%s" for _ in chunk)
+            cursor.execute(
+                f"UPDATE {FTS_TABLE} SET email = CASE user_id {cases} END WHERE user_id IN ({placeholders})",
+                [value for pair in chunk for value in pair] + [user_id for user_id, _ in chunk],
+            )
+
+
+def rebuild_index(chunk_size: int = 2000) -> int:
+    """Re-create every index row from `UserProfile` on every shard; returns the number of profiles indexed."""
+    from apps.profiles.models import UserProfile
+
+    count = 0
+    for using in shard_targets():
+        if not search_available(using):
+            continue
+        with _connection(using).cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        batch = []
+        profiles = UserProfile.objects.using(using).only("id", "user_id", "name", "email")
+        for profile in profiles.iterator(chunk_size=chunk_size):
+            batch.append(profile)
+            if len(batch) >= chunk_size:
+                index_profiles(batch, using=using)
+                count += len(batch)
+                batch = []
+        index_profiles(batch, using=using)
+        count += len(batch)
+    return count
+
+
+def ranked_profile_ids(term: str, limit: int | None = None, using: str | None = None) -> list[tuple[float, uuid.UUID]]:
+    """`(rank, profile id)` pairs matching `term`, best (lowest bm25 rank) first."""
+    match = build_match_query(term)
+    if match is None:
+        return []
+    sql = f"SELECT rank, profile_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank"
+    params: list = [match]
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    with _connection(using).cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(rank, uuid.UUID(profile_id)) for rank, profile_id in cursor.fetchall()]
+
+
+def search_profile_ids(term: str, limit: int | None = None, using: str | None = None) -> list[uuid.UUID]:
+    """Profile ids matching `term`, best match first (FTS5 bm25 rank)."""
+    return [profile_id for _, profile_id in ranked_profile_ids(term, limit, using)]
+
+
+def filter_by_search(queryset, term: str):
+    """
+    Restrict a `UserProfile` or user queryset to matches for `term`. The filter is a
+    subquery, so the caller's ordering and pagination still apply.
+    """
+    from apps.profiles.models import UserProfile
+
+    match = build_match_query(term)
+    if match is None:
+        return queryset.none()
+    is_profile = queryset.model is UserProfile
+    if not search_available(queryset.db):
+        prefix = "" if is_profile else "profile__"
+        return queryset.filter(Q(**{f"{prefix}name__icontains": term}) | Q(**{f"{prefix}email__icontains": term}))
+    column = "profile_id" if is_profile else "user_id"
+    return queryset.filter(id__in=RawSQL(f"SELECT {column} FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,)))
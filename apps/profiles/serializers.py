@@ -1,39 +1,58 @@
 from __future__ import annotations
 
+from django.conf import settings
 from rest_framework import serializers
 
+from apps.accounts.sharding import shard_for_user
+from apps.core.timing import TimedSerializerMixin
+from apps.profiles.avatars import variant_urls
 from apps.profiles.models import UserProfile
+from apps.profiles.uploads import avatar_too_large_message
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class AvatarVariantsField(serializers.Field):
+    """Read-only `{"<size>": {"webp": url, "png": url}}`; empty until the worker has run."""
+
+    def __init__(self, **kwargs):
+        kwargs.update(source="*", read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, profile):
+        return variant_urls(profile, self.context.get("request"))
+
+
+class UserProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     email = serializers.EmailField(read_only=True)
+    avatar_variants = AvatarVariantsField()
 
     class Meta:
         model = UserProfile
-        fields = ("id", "name", "email", "avatar", "created_at", "updated_at")
+        fields = ("id", "name", "email", "avatar", "avatar_variants", "created_at", "updated_at")
         read_only_fields = ("id", "email", "created_at", "updated_at")
 
     def validate_avatar(self, value):
+        # AvatarUploadHandler already stops oversized uploads mid-stream; this covers
+        # files that reached the serializer some other way.
         if not value:
             return value
-        max_bytes = 2 * 1024 * 1024  # 2MB
-        if getattr(value, "size", 0) > max_bytes:
-            raise serializers.ValidationError("Avatar must be <= 2MB.")
+        if getattr(value, "size", 0) > settings.AVATAR_MAX_UPLOAD_BYTES:
+            raise serializers.ValidationError(avatar_too_large_message())
         return value
 
 
-class AdminUserProfileSerializer(serializers.ModelSerializer):
+class AdminUserProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user_id = serializers.UUIDField(write_only=True, required=False)
     email = serializers.EmailField(read_only=True)
+    avatar_variants = AvatarVariantsField()
 
     class Meta:
         model = UserProfile
-        fields = ("id", "user_id", "name", "email", "avatar", "created_at", "updated_at")
+        fields = ("id", "user_id", "name", "email", "avatar", "avatar_variants", "created_at", "updated_at")
         read_only_fields = ("id", "email", "created_at", "updated_at")
 
     def create(self, validated_data):
         user_id = validated_data.pop("user_id", None)
         if not user_id:
             raise serializers.ValidationError({"user_id": "This field is required."})
-        return UserProfile.objects.create(user_id=user_id, **validated_data)
+        return UserProfile.objects.using(shard_for_user(user_id)).create(user_id=user_id, **validated_data)
 
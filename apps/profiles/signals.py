@@ -1,25 +1,45 @@
 from __future__ import annotations
 
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from apps.profiles.mirror import email_may_have_changed, sync_profile_emails
 from apps.profiles.models import UserProfile
+from apps.profiles.response_cache import invalidate_cached_response
+from apps.profiles.search import SEARCHABLE_FIELDS, index_profiles, unindex_profiles
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
-def ensure_profile(sender, instance, created, **kwargs):
-    # Create profile automatically; safe for future profile extension.
+def ensure_profile(sender, instance, created, using, **kwargs):
+    # Create profile automatically (on the user's database); safe for future profile extension.
+    profiles = UserProfile.objects.using(using)
     if created:
-        UserProfile.objects.get_or_create(user=instance)
-    else:
-        # Keep mirrored email in sync if user email changes.
-        try:
-            profile = instance.profile
-        except Exception:
-            UserProfile.objects.get_or_create(user=instance)
+        if kwargs.get("raw"):
+            # Fixtures may carry their own profile rows.
+            profiles.get_or_create(user=instance)
             return
-        if profile.email != instance.email:
-            profile.email = instance.email
-            profile.save(update_fields=["email"])
+        # A new user cannot have a profile yet, so a plain INSERT suffices. Callers can
+        # set `_profile_name` on the instance to avoid a follow-up UPDATE for the name.
+        profiles.create(user=instance, name=getattr(instance, "_profile_name", ""))
+    elif email_may_have_changed(instance, kwargs.get("update_fields")):
+        # Keep mirrored email in sync; saves that cannot change it skip this entirely.
+        sync_profile_emails([instance], using=using)
 
+
+@receiver(post_save, sender=UserProfile)
+def index_profile(sender, instance, using, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCHABLE_FIELDS & set(update_fields):
+        return
+    index_profiles([instance], using=using)
+
+
+@receiver(post_delete, sender=UserProfile)
+def unindex_profile(sender, instance, using, **kwargs):
+    unindex_profiles([instance.pk], using=using)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def evict_cached_response(sender, instance, **kwargs):
+    invalidate_cached_response(instance.user_id)
@@ -0,0 +1,139 @@
+"""
+Streaming avatar uploads and content-addressed avatar storage.
+
+`AvatarUploadHandler` consumes the `avatar` part of a multipart body chunk by chunk.
+It stops reading as soon as the byte count passes `AVATAR_MAX_UPLOAD_BYTES`, and it
+hashes the content on the way, so the storage never has to read the file again to
+name it. `ContentAddressedStorage` stores each avatar at `avatars/<sha[:2]>/<sha><ext>`:
+identical images share one file, and saving one that is already stored writes nothing.
+Because files are shared, replacing an avatar never deletes the previous file.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+from rest_framework import serializers
+
+
+AVATAR_FIELD = "avatar"
+
+
+def avatar_too_large_message() -> str:
+    limit = settings.AVATAR_MAX_UPLOAD_BYTES
+    readable = f"{limit // (1024 * 1024)}MB" if limit % (1024 * 1024) == 0 else f"{limit} bytes"
+    return f"Avatar must be <= {readable}."
+
+
+class HashedUploadedFile(UploadedFile):
+    """An uploaded file that carries the SHA-256 of its content, computed while streaming."""
+
+    def __init__(self, file, name, content_type, size, charset, content_type_extra=None, *, sha256: str):
+        super().__init__(file, name, content_type, size, charset, content_type_extra)
+        self.sha256 = sha256
+
+
+class AvatarUploadHandler(FileUploadHandler):
+    """
+    Takes over the `avatar` file field: spools it (in memory up to
+    FILE_UPLOAD_MAX_MEMORY_SIZE, then on disk), hashes it and counts bytes, and raises a
+    ValidationError the moment the limit is passed, so the rest is never read. Other
+    file fields pass through to the default handlers.
+    """
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.active = field_name == AVATAR_FIELD
+        if not self.active:
+            return
+        if content_length is not None and content_length > settings.AVATAR_MAX_UPLOAD_BYTES:
+            raise serializers.ValidationError({AVATAR_FIELD: [avatar_too_large_message()]})
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.spool = tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        self.size += len(raw_data)
+        if self.size > settings.AVATAR_MAX_UPLOAD_BYTES:
+            self.spool.close()
+            raise serializers.ValidationError({AVATAR_FIELD: [avatar_too_large_message()]})
+        self.digest.update(raw_data)
+        self.spool.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        self.spool.seek(0)
+        return HashedUploadedFile(
+            self.spool,
+            self.file_name,
+            self.content_type,
+            self.size,
+            self.charset,
+            self.content_type_extra,
+            sha256=self.digest.hexdigest(),
+        )
+
+    def upload_interrupted(self):
+        if getattr(self, "active", False):
+            self.spool.close()
+
+
+class AvatarUploadMixin:
+    """For DRF views that accept avatars: install AvatarUploadHandler before the body is parsed."""
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers.insert(0, AvatarUploadHandler(request))
+        return super().initialize_request(request, *args, **kwargs)
+
+
+def content_hash(content) -> str:
+    digest = getattr(content, "sha256", None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return hasher.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Names files by their SHA-256; only the extension of the proposed name is kept. A file
+    already stored under its hash is not written again.
+    """
+
+    prefix = "avatars"
+
+    def save(self, name, content, max_length=None):
+        if content is None:
+            return super().save(name, content, max_length)
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        digest = content_hash(content)
+        ext = os.path.splitext(name or "")[1].lower()
+        target = f"{self.prefix}/{digest[:2]}/{digest}{ext}"
+        if self.exists(target):
+            return target
+        return super().save(target, content, max_length)
+
+
+avatar_storage = ContentAddressedStorage()
+
+
+def get_avatar_storage():
+    return avatar_storage
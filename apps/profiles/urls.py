@@ -12,6 +12,8 @@ router.register(r"admin/profiles", views.AdminProfileViewSet, basename="admin_pr
 
 urlpatterns = [
     path("me/", views.MeProfileView.as_view(), name="me_profile"),
+    path("admin/cache-stats/", views.ProfileCacheStatsView.as_view(), name="profile_cache_stats"),
+    path("admin/export/", views.AdminProfileExportView.as_view(), name="admin_profile_export"),
     path("", include(router.urls)),
 ]
 
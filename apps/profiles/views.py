@@ -1,33 +1,70 @@
 from __future__ import annotations
 
+from functools import cached_property
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from rest_framework import permissions, status, viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.accounts.sharding import find_shard, merge_shards, shard_of, shard_targets
+from apps.core.fastjson import FastJSONRenderer, PreRenderedJSONResponse
+from apps.profiles.conditional import conditional_response, has_preconditions, set_validators
+from apps.profiles.export import CONTENT_TYPES, EXPORT_FORMATS, parse_bound, render_export
 from apps.profiles.models import UserProfile
+from apps.profiles.pagination import KeysetPagination
+from apps.profiles.response_cache import cache_response, get_cached_response, response_cache_stats
+from apps.profiles.search import filter_by_search, ranked_profile_ids, search_available
 from apps.profiles.serializers import AdminUserProfileSerializer, UserProfileSerializer
+from apps.profiles.uploads import AvatarUploadMixin
 
 
-class MeProfileView(APIView):
+class MeProfileView(AvatarUploadMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
+        # The profile comes with the (cached) user, so a 304 costs no query.
         profile = request.user.profile
-        return Response(UserProfileSerializer(profile).data)
+        not_modified = conditional_response(request, profile.id, profile.updated_at)
+        if not_modified is not None:
+            return not_modified
+        if request.accepted_media_type != FastJSONRenderer.media_type:
+            # Browsable API, ?format=, indented JSON: render as usual.
+            return set_validators(Response(UserProfileSerializer(profile).data), profile.id, profile.updated_at)
+        content = get_cached_response(profile)
+        if content is None:
+            content = FastJSONRenderer().render(UserProfileSerializer(profile).data)
+            cache_response(profile, content)
+        return set_validators(PreRenderedJSONResponse(content), profile.id, profile.updated_at)
 
     def patch(self, request):
-        profile = request.user.profile
-        serializer = UserProfileSerializer(profile, data=request.data, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data)
+        return self._update(request, partial=True)
 
     def put(self, request):
-        profile = request.user.profile
-        serializer = UserProfileSerializer(profile, data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data)
+        return self._update(request, partial=False)
+
+    def _update(self, request, *, partial):
+        shard = shard_of(request.user)
+        with transaction.atomic(using=shard):
+            # Write to the stored row, not the cached one: a full save of a cached copy would
+            # revert columns changed since (e.g. the avatar worker's `avatar_hash`).
+            profiles = UserProfile.objects.using(shard).select_related("user")
+            conditional = has_preconditions(request)
+            if conditional:
+                # Compare against the stored version and hold the row.
+                profiles = profiles.select_for_update()
+            profile = profiles.get(pk=request.user.profile.pk)
+            if conditional:
+                failed = conditional_response(request, profile.id, profile.updated_at)
+                if failed is not None:
+                    return failed
+            serializer = UserProfileSerializer(profile, data=request.data, partial=partial)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        return set_validators(Response(serializer.data), profile.id, profile.updated_at)
 
     def delete(self, request):
         # Deleting your profile deletes your user account (profile cascades).
@@ -35,8 +72,108 @@ class MeProfileView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class AdminProfileViewSet(viewsets.ModelViewSet):
+class AdminProfileViewSet(AvatarUploadMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAdminUser]
-    queryset = UserProfile.objects.select_related("user").all().order_by("-created_at")
+    queryset = UserProfile.objects.select_related("user").all().order_by("-created_at", "-id")
     serializer_class = AdminUserProfileSerializer
+    pagination_class = KeysetPagination
+    search_max_results = 100
+
+    @cached_property
+    def object_shard(self) -> str | None:
+        """For detail routes on sharded users, the shard holding the profile."""
+        return find_shard(UserProfile, pk=self.kwargs[self.lookup_field])
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.lookup_field in self.kwargs:
+            queryset = queryset.using(self.object_shard)
+        if self.request.method in ("PUT", "PATCH") and has_preconditions(self.request):
+            queryset = queryset.select_for_update(of=("self",))
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        # Freshness check on (id, updated_at) alone; the full row is only loaded for a 200.
+        try:
+            version = (
+                UserProfile.objects.using(self.object_shard).filter(pk=kwargs["pk"]).values_list("id", "updated_at").first()
+            )
+        except (DjangoValidationError, ValueError):
+            version = None
+        if version is not None:
+            not_modified = conditional_response(request, *version)
+            if not_modified is not None:
+                return not_modified
+        instance = self.get_object()
+        return set_validators(Response(self.get_serializer(instance).data), instance.id, instance.updated_at)
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop("partial", False)
+        with transaction.atomic(using=self.object_shard):
+            instance = self.get_object()
+            failed = conditional_response(request, instance.id, instance.updated_at)
+            if failed is not None:
+                return failed
+            serializer = self.get_serializer(instance, data=request.data, partial=partial)
+            serializer.is_valid(raise_exception=True)
+            self.perform_update(serializer)
+        return set_validators(Response(serializer.data), instance.id, instance.updated_at)
+
+    def list(self, request, *args, **kwargs):
+        term = request.query_params.get("search", "").strip()
+        if not term:
+            return super().list(request, *args, **kwargs)
+        # Ranked search: the best `search_max_results` matches, most relevant first (each
+        # shard ranks its own profiles; the lists are merged on rank).
+        if search_available():
+            hits = sorted(
+                ((rank, pk, alias) for alias in shard_targets()
+                 for rank, pk in ranked_profile_ids(term, limit=self.search_max_results, using=alias)),
+                key=lambda hit: hit[0],
+            )[: self.search_max_results]
+            found = {}
+            for alias in dict.fromkeys(alias for _, _, alias in hits):
+                found.update(self.get_queryset().using(alias).in_bulk([pk for _, pk, a in hits if a == alias]))
+            profiles = [found[pk] for _, pk, _ in hits if pk in found]
+        else:
+            profiles = merge_shards(
+                filter_by_search(self.get_queryset(), term),
+                limit=self.search_max_results,
+                key=lambda profile: (profile.created_at, profile.pk),
+                reverse=True,
+            )
+        data = self.get_serializer(profiles, many=True).data
+        return Response({"next": None, "previous": None, "results": data})
+
+
+class ProfileCacheStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({"profile_response_cache": response_cache_stats()}, status=status.HTTP_200_OK)
+
+
+class AdminProfileExportView(APIView):
+    """
+    Stream every profile (with user status fields) as CSV or NDJSON.
+
+    Query params: `output` (csv | ndjson; `format` is DRF's renderer override),
+    `updated_after` and `updated_before` (ISO datetime or date, inclusive).
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        fmt = request.query_params.get("output", "csv")
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({"output": f"Must be one of: {', '.join(EXPORT_FORMATS)}."})
+        filters = {}
+        for param, end in (("updated_after", False), ("updated_before", True)):
+            try:
+                filters[param] = parse_bound(request.query_params.get(param), end=end)
+            except ValueError as e:
+                raise ValidationError({param: str(e)})
 
+        response = StreamingHttpResponse(render_export(fmt, **filters), content_type=CONTENT_TYPES[fmt])
+        response["Content-Disposition"] = f'attachment; filename="profiles.{fmt}"'
+        return response
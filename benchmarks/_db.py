@@ -0,0 +1,21 @@
+"""Shared helpers for benchmarks that need a migrated throwaway database."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def test_database(name: str | None = None):
+    """
+    Create a migrated test database (in-memory SQLite unless `name` is a file path),
+    point the default connection at it, and destroy it afterwards.
+    """
+    if name is not None:
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = name
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
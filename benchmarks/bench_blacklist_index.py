@@ -0,0 +1,91 @@
+"""
+Lookup latency and memory of the in-memory refresh-token blacklist index, compared with
+the per-refresh `BlacklistedToken` query it replaces.
+
+    python -m benchmarks.bench_blacklist_index --tokens 1000000 --db-rows 100000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import timedelta
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken  # noqa: E402
+
+from apps.accounts.blacklist import BlacklistIndex  # noqa: E402
+from benchmarks._db import test_database  # noqa: E402
+
+
+def _per_lookup_us(fn, keys) -> float:
+    started = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - started) / len(keys) * 1e6
+
+
+def bench_index(n: int, lookups: int) -> None:
+    expires_at = time.time() + 7 * 86400
+
+    gc.collect()
+    tracemalloc.start()
+    index = BlacklistIndex(sync_seconds=3600, evict_seconds=3600)
+    index.load((uuid.uuid4().hex, expires_at) for _ in range(n))
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Skip the lazy DB sync; the index is already loaded.
+    index._last_id = 0
+    index._synced_at = index._evicted_at = time.monotonic()
+    hits = random.sample(list(index._expiries), lookups)
+    misses = [uuid.uuid4().hex for _ in range(lookups)]
+    print(f"index with {n:,} blacklisted JTIs: {memory / 2**20:.1f} MiB")
+    print(f"  hit  lookup: {_per_lookup_us(index.might_contain, hits):8.3f} us")
+    print(f"  miss lookup: {_per_lookup_us(index.might_contain, misses):8.3f} us")
+
+
+def bench_database(n: int, lookups: int) -> None:
+    with test_database():
+        expires_at = timezone.now() + timedelta(days=7)
+        jtis = [uuid.uuid4().hex for _ in range(n)]
+        OutstandingToken.objects.bulk_create(
+            [OutstandingToken(jti=jti, token="", expires_at=expires_at) for jti in jtis], batch_size=5000
+        )
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=pk) for pk in OutstandingToken.objects.values_list("id", flat=True)],
+            batch_size=5000,
+        )
+
+        def query(jti):
+            return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+        misses = [uuid.uuid4().hex for _ in range(lookups)]
+        print(f"database query with {n:,} blacklisted rows:")
+        print(f"  hit  lookup: {_per_lookup_us(query, random.sample(jtis, lookups)):8.3f} us")
+        print(f"  miss lookup: {_per_lookup_us(query, misses):8.3f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=1_000_000)
+    parser.add_argument("--db-rows", type=int, default=100_000, help="0 skips the database comparison.")
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    bench_index(args.tokens, args.lookups)
+    if args.db_rows:
+        bench_database(args.db_rows, min(args.lookups, args.db_rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Render and parse cost of the admin profile list payload: DRF's stdlib JSON against the
+orjson backend of `apps.core.fastjson`.
+
+The payload is one serialized page of `AdminProfileViewSet.list` (the serializer's
+output, so only the JSON step is timed).
+
+    python -m benchmarks.bench_json_renderer --page-size 500
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import statistics
+import time
+import uuid
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from apps.core import fastjson  # noqa: E402
+from apps.core.fastjson import FastJSONParser, FastJSONRenderer  # noqa: E402
+from apps.profiles.models import UserProfile  # noqa: E402
+from apps.profiles.serializers import AdminUserProfileSerializer  # noqa: E402
+from benchmarks._db import test_database  # noqa: E402
+
+
+User = get_user_model()
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def page_payload(page_size: int) -> dict:
+    users = [User(id=uuid.uuid4(), email=f"user{i}@example.com", password="!") for i in range(page_size)]
+    User.objects.bulk_create(users)
+    UserProfile.objects.bulk_create(
+        [
+            UserProfile(user=user, email=user.email, name=f"Üser Nümber {i}", avatar=f"avatars/{i:02x}/{i}.png")
+            for i, user in enumerate(users)
+        ]
+    )
+    profiles = UserProfile.objects.select_related("user").order_by("-created_at", "-id")
+    return {"next": "http://testserver/api/profile/admin/profiles/?cursor=abc", "previous": None,
+            "results": AdminUserProfileSerializer(profiles, many=True).data}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if fastjson.orjson is None:
+        print("orjson is not installed; both rows use the stdlib backend.")
+
+    with test_database():
+        payload = page_payload(args.page_size)
+
+    print(f"{args.page_size} profiles per page")
+    print(f"  {'backend':<8} {'bytes':>9} {'render':>10} {'parse':>10}")
+    for backend in fastjson.JSON_BACKENDS:
+        with override_settings(API_JSON_BACKEND=backend):
+            body = FastJSONRenderer().render(payload)
+            render_ms = _median_ms(lambda: FastJSONRenderer().render(payload), args.repeat)
+            parse_ms = _median_ms(lambda: FastJSONParser().parse(io.BytesIO(body)), args.repeat)
+        print(f"  {backend:<8} {len(body):>9,} {render_ms:8.3f}ms {parse_ms:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
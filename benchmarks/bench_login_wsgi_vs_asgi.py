@@ -0,0 +1,94 @@
+"""
+Load comparison of the synchronous login endpoint (WSGI handler, one thread per request)
+and the async one (ASGI handler, hashing on the bounded pool).
+
+Both stacks run in-process through Django's test clients against a throwaway SQLite file,
+so the numbers compare request handling rather than a particular server.
+
+    python -m benchmarks.bench_login_wsgi_vs_asgi --requests 200 --concurrency 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.test import AsyncClient, Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from benchmarks._db import test_database  # noqa: E402
+
+
+EMAIL = "bench@example.com"
+PASSWORD = "BenchPass123!"
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"  {label:<6} {len(latencies) / elapsed:8.1f} req/s   p50 {p50:8.1f} ms   p99 {p99:8.1f} ms")
+
+
+def run_wsgi(requests: int, concurrency: int) -> None:
+    def one(_):
+        client = Client()
+        started = time.perf_counter()
+        res = client.post("/api/auth/login/", {"email": EMAIL, "password": PASSWORD}, content_type="application/json")
+        assert res.status_code == 200, res.content
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(one, range(requests)))
+    _report("wsgi", latencies, time.perf_counter() - started)
+
+
+async def run_asgi(requests: int, concurrency: int) -> None:
+    client = AsyncClient()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            started = time.perf_counter()
+            res = await client.post(
+                "/api/auth/async/login/", {"email": EMAIL, "password": PASSWORD}, content_type="application/json"
+            )
+            assert res.status_code == 200, res.content
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(requests)))
+    _report("asgi", latencies, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    # Lets the test clients' "testserver" host through ALLOWED_HOSTS.
+    setup_test_environment()
+    # Every request logs in as the same user from the same client, far past the login limits.
+    settings.AUTH_RATE_LIMITS_ENABLED = False
+    with tempfile.TemporaryDirectory() as tmp, test_database(os.path.join(tmp, "bench.sqlite3")):
+        get_user_model().objects.create_user(email=EMAIL, password=PASSWORD, is_active=True, email_verified=True)
+        print(f"{args.requests} logins, {args.concurrency} concurrent, {os.cpu_count()} CPU(s)")
+        run_wsgi(args.requests, args.concurrency)
+        asyncio.run(run_asgi(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
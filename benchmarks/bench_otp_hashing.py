@@ -0,0 +1,50 @@
+"""
+Compare the OTP hashing cost on the register and verify paths: PBKDF2 vs keyed HMAC.
+
+    python -m benchmarks.bench_otp_hashing --rounds 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.hashers import check_password, make_password  # noqa: E402
+
+from apps.accounts.hashers import check_otp_hash, make_otp_hash  # noqa: E402
+from apps.accounts.serializers import generate_numeric_otp  # noqa: E402
+
+
+def _time(fn, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    otp = generate_numeric_otp(settings.EMAIL_OTP_LENGTH)
+    modes = {
+        "pbkdf2 (before)": (make_password, check_password),
+        "hmac (after)": (make_otp_hash, check_otp_hash),
+    }
+    print(f"{'mode':<18}{'register ms':>14}{'verify ms':>12}")
+    for label, (make, check) in modes.items():
+        encoded = make(otp)
+        register_ms = _time(lambda: make(generate_numeric_otp(settings.EMAIL_OTP_LENGTH)), args.rounds)
+        verify_ms = _time(lambda: check(otp, encoded), args.rounds)
+        print(f"{label:<18}{register_ms:>14.3f}{verify_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Page fetch time of the admin profile list at increasing depth: OFFSET pagination against the
+keyset cursor in `apps.profiles.pagination`.
+
+    python -m benchmarks.bench_profile_pagination --profiles 2000000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from apps.profiles.models import UserProfile  # noqa: E402
+from apps.profiles.pagination import KeysetPagination  # noqa: E402
+from benchmarks._db import test_database  # noqa: E402
+
+
+User = get_user_model()
+PAGE_SIZE = 50
+
+
+def populate(n: int, batch: int = 20000) -> None:
+    # bulk_create skips signals, so profiles are written alongside their users. Each row
+    # gets its own auto_now_add timestamp, so created_at is (nearly) unique, as in production.
+    for start in range(0, n, batch):
+        users = [User(id=uuid.uuid4(), email=f"user{i}@example.com", password="!") for i in range(start, min(n, start + batch))]
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            UserProfile.objects.bulk_create(
+                [UserProfile(user=user, email=user.email, name=f"User {start + i}") for i, user in enumerate(users)]
+            )
+        print(f"\r  populated {min(n, start + batch):,}/{n:,}", end="", flush=True)
+    print()
+
+
+def _median_ms(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", type=int, default=200000)
+    args = parser.parse_args()
+
+    # Lets the request factory's "testserver" host through ALLOWED_HOSTS.
+    setup_test_environment()
+
+    factory = APIRequestFactory()
+    queryset = UserProfile.objects.select_related("user").order_by("-created_at", "-id")
+
+    with tempfile.TemporaryDirectory() as tmp, test_database(os.path.join(tmp, "bench.sqlite3")):
+        populate(args.profiles)
+        print(f"{args.profiles:,} profiles, {PAGE_SIZE} per page")
+        print(f"  {'depth':>12} {'offset':>10} {'keyset':>10}")
+        for fraction in (0, 0.01, 0.1, 0.5, 0.9, 0.999):
+            depth = int((args.profiles - PAGE_SIZE) * fraction)
+
+            def offset_page():
+                return list(queryset[depth : depth + PAGE_SIZE])
+
+            # The cursor a client would hold after walking to `depth` (not timed).
+            paginator = KeysetPagination()
+            url = "/api/profile/admin/profiles/"
+            if depth:
+                anchor = queryset[depth - 1]
+                paginator.base_url = "http://testserver" + url
+                url = paginator.encode_cursor(anchor, reverse=False)
+            request = Request(factory.get(url))
+
+            def keyset_page():
+                return KeysetPagination().paginate_queryset(queryset, request)
+
+            assert [p.pk for p in keyset_page()] == [p.pk for p in offset_page()]
+            print(f"  {depth:>12,} {_median_ms(offset_page):8.2f}ms {_median_ms(keyset_page):8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
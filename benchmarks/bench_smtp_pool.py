@@ -0,0 +1,79 @@
+"""
+Compare one SMTP connection per message (what `send_mail` does) with pooled delivery.
+
+    python -m benchmarks.bench_smtp_pool --messages 500 --setup-ms 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.core.mail import EmailMessage, get_connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from apps.accounts.mail_pool import SMTPConnectionPool  # noqa: E402
+from benchmarks.smtp_standin import SMTPStandIn  # noqa: E402
+
+
+def _messages(n: int) -> list[EmailMessage]:
+    return [
+        EmailMessage("Verify your email", f"Your code is {i:06d}", "no-reply@example.com", [f"user{i}@example.com"])
+        for i in range(n)
+    ]
+
+
+def per_message(messages) -> None:
+    for message in messages:
+        get_connection(fail_silently=False).send_messages([message])
+
+
+def pooled(messages, *, batch_size: int, max_messages: int) -> None:
+    pool = SMTPConnectionPool(max_size=1, max_messages=max_messages, max_idle_seconds=60)
+    try:
+        for start in range(0, len(messages), batch_size):
+            errors = pool.send_messages(messages[start:start + batch_size])
+            assert not any(errors), errors
+    finally:
+        pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--setup-ms", type=float, default=20.0, help="Simulated connect+TLS+AUTH latency.")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--max-messages", type=int, default=100, help="Messages per pooled connection.")
+    args = parser.parse_args()
+
+    with SMTPStandIn(setup_delay=args.setup_ms / 1000) as server, override_settings(
+        EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+        EMAIL_HOST="127.0.0.1",
+        EMAIL_PORT=server.port,
+        EMAIL_HOST_USER="",
+        EMAIL_HOST_PASSWORD="",
+        EMAIL_USE_TLS=False,
+        EMAIL_USE_SSL=False,
+    ):
+        runs = [
+            ("connection per message", lambda msgs: per_message(msgs)),
+            ("pooled", lambda msgs: pooled(msgs, batch_size=args.batch_size, max_messages=args.max_messages)),
+        ]
+        print(f"{args.messages} messages, {args.setup_ms:.0f} ms simulated connection setup")
+        for label, run in runs:
+            messages = _messages(args.messages)
+            before = server.messages
+            started = time.perf_counter()
+            run(messages)
+            elapsed = time.perf_counter() - started
+            assert server.messages - before == args.messages
+            print(f"  {label:<24} {args.messages / elapsed:10.1f} msg/s  ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Concurrent registration writes against one SQLite file: default journaling with a new
+connection per request, against production mode (WAL, synchronous=NORMAL, busy timeout,
+mmap/cache size, persistent connections).
+
+Each writer thread plays a request loop: `create_registration` (user, profile, search
+index, OTP and outbox rows in one transaction), then the end-of-request connection
+cleanup that honours CONN_MAX_AGE.
+
+    python -m benchmarks.bench_sqlite_writers --writers 8 --registrations 2000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import OperationalError, close_old_connections, connection, connections  # noqa: E402
+
+from apps.accounts.serializers import create_registration  # noqa: E402
+from benchmarks._db import test_database  # noqa: E402
+
+
+PRODUCTION_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "memory",
+}
+MODES = {
+    "default": ({}, 0),
+    "production": (PRODUCTION_PRAGMAS, 600),
+}
+
+
+def run(writers: int, registrations: int, password_hash: str) -> tuple[float, list[float], int]:
+    per_writer = registrations // writers
+    latencies: list[float] = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def writer():
+        mine, failed = [], 0
+        try:
+            for _ in range(per_writer):
+                started = time.perf_counter()
+                try:
+                    create_registration(email=f"w-{uuid.uuid4().hex}@example.com", password_hash=password_hash, name="Writer")
+                    mine.append(time.perf_counter() - started)
+                except OperationalError:  # "database is locked"
+                    failed += 1
+                close_old_connections()
+        finally:
+            connections.close_all()
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, latencies, errors[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--registrations", type=int, default=1000)
+    args = parser.parse_args()
+
+    password_hash = make_password("WriterPass123!")
+    print(f"{args.registrations} registrations from {args.writers} writer threads")
+    print(f"  {'mode':<11}{'reg/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'locked':>8}")
+    for mode, (pragmas, conn_max_age) in MODES.items():
+        settings.SQLITE_PRAGMAS = pragmas
+        with tempfile.TemporaryDirectory() as tmp, test_database(os.path.join(tmp, f"{mode}.sqlite3")):
+            # Shared by every thread's connection (the dict is not copied per thread).
+            connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+            connection.close()
+            elapsed, latencies, locked = run(args.writers, args.registrations, password_hash)
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0
+        p50 = statistics.median(latencies) if latencies else 0.0
+        print(f"  {mode:<11}{len(latencies) / elapsed:>9.1f}{p50 * 1000:>9.2f}{p99 * 1000:>9.2f}{locked:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Latency, SQL query and allocation budgets for every API route.
+
+Each route in `apps.accounts.urls` and `apps.profiles.urls` is driven through the test
+client against a seeded test database. The suite records p50/p99 latency over the timed
+iterations, then the query count and peak traced allocations of one more warm call. It
+compares them with `benchmarks/endpoint_baseline.json` and fails when a route issues more
+queries than its baseline, or when its p50 exceeds the baseline by more than the tolerance.
+p99 and allocations are reported, but only p50 and queries gate the run.
+
+    python manage.py test benchmarks.endpoint_suite
+    BENCH_UPDATE_BASELINE=1 python manage.py test benchmarks.endpoint_suite   # rewrite the baseline
+
+Latency baselines are machine-specific; re-record them on the machine that runs the gate.
+Environment knobs: BENCH_ITERATIONS (default 15), BENCH_LATENCY_TOLERANCE (default 0.5, a
+fraction of the baseline p50) and BENCH_LATENCY_SLACK_MS (default 2, absolute).
+"""
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts import urls as account_urls
+from apps.accounts.hashers import make_otp_hash
+from apps.accounts.jwt import IndexedRefreshToken
+from apps.accounts.models import EmailOTP
+from apps.profiles import urls as profile_urls
+from apps.profiles.models import UserProfile
+from apps.profiles.search import rebuild_index, search_available
+
+
+User = get_user_model()
+
+BASELINE_PATH = Path(__file__).with_name("endpoint_baseline.json")
+PASSWORD = "BenchPass123!"
+OTP = "123456"
+SEED_PROFILES = 500
+
+
+@dataclass
+class Call:
+    path: str
+    data: dict | None = None
+    headers: dict = field(default_factory=dict)
+
+
+@dataclass
+class Endpoint:
+    url_name: str
+    method: str
+    prepare: Callable[["EndpointBenchmark"], Call]
+    status: int = 200
+    variant: str = ""
+
+    @property
+    def label(self) -> str:
+        label = f"{self.method} {self.url_name}"
+        return f"{label} ({self.variant})" if self.variant else label
+
+
+def _route_names(patterns) -> set[str]:
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= _route_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def _register(suite):
+    return Call("/api/auth/register/", {"email": suite.new_email(), "password": PASSWORD, "name": "Bench"})
+
+
+def _verify(suite):
+    user = suite.new_user(active=False)
+    EmailOTP.objects.create(
+        user=user,
+        purpose=EmailOTP.Purpose.VERIFY_EMAIL,
+        code_hash=make_otp_hash(OTP),
+        expires_at=timezone.now() + timedelta(minutes=10),
+    )
+    return Call("/api/auth/verify-email/", {"email": user.email, "otp": OTP})
+
+
+def _resend(suite):
+    return Call("/api/auth/resend-otp/", {"email": suite.new_user(active=False).email})
+
+
+def _login(suite):
+    return Call("/api/auth/login/", {"email": suite.member.email, "password": PASSWORD})
+
+
+def _refresh(suite):
+    return Call("/api/auth/token/refresh/", {"refresh": str(IndexedRefreshToken.for_user(suite.member))})
+
+
+def _logout(suite):
+    return Call("/api/auth/logout/", {"refresh": str(IndexedRefreshToken.for_user(suite.member))})
+
+
+def _forgot(suite):
+    return Call("/api/auth/forgot-password/", {"email": suite.member.email})
+
+
+def _reset(suite):
+    user = suite.new_user()
+    return Call(
+        "/api/auth/reset-password/",
+        {
+            "uidb64": urlsafe_base64_encode(force_bytes(user.pk)),
+            "token": default_token_generator.make_token(user),
+            "new_password": PASSWORD,
+        },
+    )
+
+
+def _as_admin(path):
+    return lambda suite: Call(path, headers=suite.bearer(suite.admin))
+
+
+def _async(prepare):
+    def prepare_async(suite):
+        call = prepare(suite)
+        call.path = call.path.replace("/api/auth/", "/api/auth/async/")
+        return call
+
+    return prepare_async
+
+
+def _me(suite):
+    return Call("/api/profile/me/", headers=suite.bearer(suite.member))
+
+
+def _me_not_modified(suite):
+    headers = suite.bearer(suite.member)
+    etag = suite.client.get("/api/profile/me/", **headers)["ETag"]
+    return Call("/api/profile/me/", headers={**headers, "HTTP_IF_NONE_MATCH": etag})
+
+
+def _me_update(suite):
+    return Call("/api/profile/me/", {"name": f"Bench {uuid.uuid4().hex[:8]}"}, suite.bearer(suite.member))
+
+
+def _me_delete(suite):
+    return Call("/api/profile/me/", headers=suite.bearer(suite.new_user()))
+
+
+def _admin_detail(suite, user=None):
+    profile = (user or suite.member).profile
+    return Call(f"/api/profile/admin/profiles/{profile.pk}/", headers=suite.bearer(suite.admin))
+
+
+def _admin_update(suite):
+    call = _admin_detail(suite)
+    call.data = {"name": f"Admin {uuid.uuid4().hex[:8]}"}
+    return call
+
+
+def _admin_create(suite):
+    user = suite.new_user()
+    UserProfile.objects.filter(user=user).delete()
+    return Call("/api/profile/admin/profiles/", {"user_id": str(user.pk), "name": "Created"}, suite.bearer(suite.admin))
+
+
+ENDPOINTS = [
+    Endpoint("register", "POST", _register, status=201),
+    Endpoint("verify_email", "POST", _verify),
+    Endpoint("resend_otp", "POST", _resend),
+    Endpoint("login", "POST", _login),
+    Endpoint("token_refresh", "POST", _refresh),
+    Endpoint("logout", "POST", _logout),
+    Endpoint("forgot_password", "POST", _forgot),
+    Endpoint("reset_password", "POST", _reset),
+    Endpoint("rate_limit_stats", "GET", _as_admin("/api/auth/rate-limits/")),
+    Endpoint("async_register", "POST", _async(_register), status=201),
+    Endpoint("async_verify_email", "POST", _async(_verify)),
+    Endpoint("async_login", "POST", _async(_login)),
+    Endpoint("async_token_refresh", "POST", _async(_refresh)),
+    Endpoint("me_profile", "GET", _me),
+    Endpoint("me_profile", "GET", _me_not_modified, status=304, variant="304"),
+    Endpoint("me_profile", "PATCH", _me_update),
+    Endpoint("me_profile", "DELETE", _me_delete, status=204),
+    Endpoint("profile_cache_stats", "GET", _as_admin("/api/profile/admin/cache-stats/")),
+    Endpoint("admin_profile_export", "GET", _as_admin("/api/profile/admin/export/")),
+    Endpoint("api-root", "GET", _as_admin("/api/profile/")),
+    Endpoint("admin_profiles-list", "GET", _as_admin("/api/profile/admin/profiles/")),
+    Endpoint("admin_profiles-list", "GET", _as_admin("/api/profile/admin/profiles/?search=user 4"), variant="search"),
+    Endpoint("admin_profiles-list", "POST", _admin_create, status=201),
+    Endpoint("admin_profiles-detail", "GET", _admin_detail),
+    Endpoint("admin_profiles-detail", "PATCH", _admin_update),
+    Endpoint("admin_profiles-detail", "DELETE", lambda suite: _admin_detail(suite, suite.new_user()), status=204),
+]
+
+
+@override_settings(
+    AUTH_RATE_LIMITS_ENABLED=False,
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+class EndpointBenchmark(APITestCase):
+    iterations = int(os.environ.get("BENCH_ITERATIONS", "15"))
+    tolerance = float(os.environ.get("BENCH_LATENCY_TOLERANCE", "0.5"))
+    slack_ms = float(os.environ.get("BENCH_LATENCY_SLACK_MS", "2"))
+
+    @classmethod
+    def setUpTestData(cls):
+        # Hash once; every user in the suite shares it, so setup never pays for PBKDF2.
+        cls.password_hash = make_password(PASSWORD)
+        users = [
+            User(email=f"user{i}@example.com", password=cls.password_hash, is_active=True, email_verified=True)
+            for i in range(SEED_PROFILES)
+        ]
+        User.objects.bulk_create(users)
+        UserProfile.objects.bulk_create([UserProfile(user=u, email=u.email, name=f"User {i}") for i, u in enumerate(users)])
+        if search_available():
+            rebuild_index()
+        cls.admin = User.objects.create_superuser(email="bench-admin@example.com", password=PASSWORD)
+
+    def setUp(self):
+        cache.clear()
+        self.member = self.new_user()
+
+    def new_email(self) -> str:
+        return f"bench-{uuid.uuid4().hex}@example.com"
+
+    def new_user(self, *, active: bool = True) -> User:
+        return User.objects.create(
+            email=self.new_email(), password=self.password_hash, is_active=active, email_verified=active
+        )
+
+    def bearer(self, user) -> dict:
+        return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+    def _request(self, endpoint: Endpoint, call: Call):
+        response = getattr(self.client, endpoint.method.lower())(call.path, call.data, format="json", **call.headers)
+        if response.streaming:
+            response.body = b"".join(response.streaming_content)
+        else:
+            response.body = response.content
+        return response
+
+    def measure(self, endpoint: Endpoint) -> dict:
+        latencies = []
+        for i in range(self.iterations + 1):
+            call = endpoint.prepare(self)
+            started = time.perf_counter()
+            response = self._request(endpoint, call)
+            elapsed = time.perf_counter() - started
+            self.assertEqual(response.status_code, endpoint.status, f"{endpoint.label}: {response.body[:200]!r}")
+            if i:  # The first call warms caches and is not timed.
+                latencies.append(elapsed)
+
+        call = endpoint.prepare(self)
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                self._request(endpoint, call)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            "p50_ms": round(statistics.median(latencies) * 1000, 3),
+            "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3),
+            "queries": len(queries),
+            "peak_kib": round(peak / 1024, 1),
+        }
+
+    def test_endpoints_within_budget(self):
+        covered = {endpoint.url_name for endpoint in ENDPOINTS}
+        routes = _route_names(account_urls.urlpatterns) | _route_names(profile_urls.urlpatterns)
+        self.assertEqual(routes - covered, set(), "Routes without a benchmark")
+
+        results = {endpoint.label: self.measure(endpoint) for endpoint in ENDPOINTS}
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+        print(f"\n{'endpoint':<40}{'p50 ms':>10}{'p99 ms':>10}{'queries':>9}{'peak KiB':>10}  budget")
+        for label, result in results.items():
+            budget = baseline.get(label)
+            note = "-" if budget is None else f"p50 <= {self._p50_budget(budget):.1f}, queries <= {budget['queries']}"
+            print(
+                f"{label:<40}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+                f"{result['queries']:>9}{result['peak_kib']:>10.1f}  {note}"
+            )
+
+        if os.environ.get("BENCH_UPDATE_BASELINE"):
+            BASELINE_PATH.write_text(json.dumps(results, indent=2) + "\n")
+            print(f"Baseline written to {BASELINE_PATH}")
+            return
+
+        for label, result in results.items():
+            with self.subTest(endpoint=label):
+                self.assertIn(label, baseline, "No baseline; run with BENCH_UPDATE_BASELINE=1")
+                budget = baseline[label]
+                self.assertLessEqual(result["queries"], budget["queries"], "More SQL queries than budgeted")
+                self.assertLessEqual(result["p50_ms"], self._p50_budget(budget), "p50 latency over budget")
+
+    def _p50_budget(self, budget: dict) -> float:
+        return budget["p50_ms"] * (1 + self.tolerance) + self.slack_ms
@@ -0,0 +1,208 @@
+"""
+Load harness for the full user lifecycle: register -> verify-email -> login -> me ->
+refresh -> logout, with many concurrent virtual users.
+
+The harness serves the project in-process on a threaded WSGI server (Django's runserver
+server class) against a throwaway SQLite file. Outgoing mail goes to the locmem backend.
+An outbox drainer thread plays the `send_outbox` worker and hands each OTP to the virtual
+user waiting for it. Each virtual user talks real HTTP to the server. The report gives
+throughput and latency percentiles per step, plus the OTP delivery wait.
+
+    python -m benchmarks.load_lifecycle --users 200 --concurrency 20
+
+Rate limits are off unless --rate-limits is passed, because every virtual user shares one IP.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core import mail  # noqa: E402
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from apps.accounts.outbox import deliver_pending  # noqa: E402
+from benchmarks._db import test_database  # noqa: E402
+
+
+STEPS = ("register", "otp_wait", "verify_email", "login", "me", "refresh", "logout")
+OTP_RE = re.compile(r"\b(\d{6})\b")
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class StepFailed(Exception):
+    def __init__(self, step: str, detail: str):
+        super().__init__(f"{step}: {detail}")
+        self.step = step
+
+
+class OTPInbox:
+    """Drains the email outbox in a background thread and indexes OTPs by recipient."""
+
+    def __init__(self, poll_seconds: float):
+        self.poll_seconds = poll_seconds
+        self.codes: dict[str, str] = {}
+        self.ready = threading.Condition()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="outbox-drainer", daemon=True)
+        self.seen = 0
+
+    def _run(self) -> None:
+        try:
+            while not self.stopped.is_set():
+                claimed = deliver_pending().claimed
+                new = mail.outbox[self.seen :]
+                self.seen += len(new)
+                if new:
+                    with self.ready:
+                        for message in new:
+                            match = OTP_RE.search(message.body)
+                            if match:
+                                self.codes[message.to[0]] = match.group(1)
+                        self.ready.notify_all()
+                if not claimed:
+                    self.stopped.wait(self.poll_seconds)
+        finally:
+            connections.close_all()
+
+    def wait_for(self, email: str, timeout: float) -> str:
+        with self.ready:
+            if not self.ready.wait_for(lambda: email in self.codes, timeout):
+                raise StepFailed("otp_wait", f"no OTP for {email} after {timeout}s")
+            return self.codes.pop(email)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+
+
+class VirtualUser:
+    def __init__(self, base_url: str, inbox: OTPInbox, otp_timeout: float):
+        self.base_url = base_url
+        self.inbox = inbox
+        self.otp_timeout = otp_timeout
+        self.timings: dict[str, float] = {}
+
+    def _call(self, step: str, method: str, path: str, body: dict | None = None, token: str | None = None) -> dict:
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                payload = response.read()
+        except urllib.error.HTTPError as e:
+            raise StepFailed(step, f"HTTP {e.code} {e.read()[:200]!r}")
+        except OSError as e:
+            raise StepFailed(step, str(e))
+        self.timings[step] = time.perf_counter() - started
+        return json.loads(payload) if payload else {}
+
+    def run(self) -> dict[str, float]:
+        email = f"vu-{uuid.uuid4().hex[:12]}@example.com"
+        password = "LoadTest123!"
+        self._call("register", "POST", "/api/auth/register/", {"email": email, "password": password, "name": "Load"})
+        started = time.perf_counter()
+        otp = self.inbox.wait_for(email, self.otp_timeout)
+        self.timings["otp_wait"] = time.perf_counter() - started
+        self._call("verify_email", "POST", "/api/auth/verify-email/", {"email": email, "otp": otp})
+        tokens = self._call("login", "POST", "/api/auth/login/", {"email": email, "password": password})
+        self._call("me", "GET", "/api/profile/me/", token=tokens["access"])
+        self._call("refresh", "POST", "/api/auth/token/refresh/", {"refresh": tokens["refresh"]})
+        self._call("logout", "POST", "/api/auth/logout/", {"refresh": tokens["refresh"]})
+        return self.timings
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def report(timings: dict[str, list[float]], elapsed: float, failures: dict[str, list[str]], users: int) -> None:
+    completed = len(timings.get("logout", []))
+    print(f"\n{completed}/{users} lifecycles completed in {elapsed:.1f}s ({completed / elapsed:.2f} users/s)")
+    print(f"  {'step':<14}{'count':>7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for step in STEPS:
+        values = sorted(timings.get(step, []))
+        if not values:
+            continue
+        print(
+            f"  {step:<14}{len(values):>7}{len(values) / elapsed:>9.1f}"
+            f"{statistics.median(values) * 1000:>10.1f}{_percentile(values, 0.95) * 1000:>10.1f}"
+            f"{_percentile(values, 0.99) * 1000:>10.1f}{values[-1] * 1000:>10.1f}"
+        )
+    for step, errors in failures.items():
+        print(f"  {step} failed x{len(errors)}, e.g. {errors[0]}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="virtual users, one lifecycle each")
+    parser.add_argument("--concurrency", type=int, default=10, help="virtual users in flight at once")
+    parser.add_argument("--otp-timeout", type=float, default=30.0)
+    parser.add_argument("--drain-interval", type=float, default=0.05, help="outbox poll interval when idle")
+    parser.add_argument("--rate-limits", action="store_true", help="keep AUTH_RATE_LIMITS enabled")
+    args = parser.parse_args()
+
+    # locmem email backend and an empty mail.outbox; DEBUG off so queries are not recorded.
+    setup_test_environment(debug=False)
+    settings.AUTH_RATE_LIMITS_ENABLED = args.rate_limits
+
+    with tempfile.TemporaryDirectory() as tmp, test_database(os.path.join(tmp, "load.sqlite3")):
+        server = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler, allow_reuse_address=False)
+        server.set_app(get_wsgi_application())
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="wsgi-server", daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        print(f"{args.users} virtual users, {args.concurrency} concurrent, {os.cpu_count()} CPU(s), {base_url}")
+
+        timings: dict[str, list[float]] = defaultdict(list)
+        failures: dict[str, list[str]] = defaultdict(list)
+        try:
+            with OTPInbox(args.drain_interval) as inbox, ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                started = time.perf_counter()
+                futures = [pool.submit(VirtualUser(base_url, inbox, args.otp_timeout).run) for _ in range(args.users)]
+                for future in futures:
+                    try:
+                        for step, value in future.result().items():
+                            timings[step].append(value)
+                    except StepFailed as e:
+                        failures[e.step].append(str(e))
+                elapsed = time.perf_counter() - started
+        finally:
+            server.shutdown()
+            server.server_close()
+            connections.close_all()
+        report(timings, elapsed, failures, args.users)
+
+
+if __name__ == "__main__":
+    main()
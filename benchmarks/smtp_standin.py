@@ -0,0 +1,65 @@
+"""A minimal in-process SMTP server for benchmarks; it accepts and discards every message."""
+from __future__ import annotations
+
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # Simulate TCP+TLS+AUTH setup cost once per connection.
+        time.sleep(self.server.setup_delay)
+        self._reply("220 localhost ESMTP stand-in")
+        in_data = False
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if in_data:
+                if line in (b".\r\n", b".\n"):
+                    in_data = False
+                    self.server.count_message()
+                    self._reply("250 OK queued")
+                continue
+            command = line.strip().split(b" ", 1)[0].upper()
+            if command in (b"EHLO", b"HELO"):
+                self._reply("250 localhost")
+            elif command == b"DATA":
+                in_data = True
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == b"QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+
+    def _reply(self, text: str) -> None:
+        self.wfile.write(text.encode() + b"\r\n")
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, *, setup_delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.setup_delay = setup_delay
+        self.messages = 0
+        self._lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def count_message(self) -> None:
+        with self._lock:
+            self.messages += 1
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     "rest_framework",
     "rest_framework_simplejwt.token_blacklist",
     # Local
+    "apps.core.apps.CoreConfig",
     "apps.accounts.apps.AccountsConfig",
     "apps.profiles.apps.ProfilesConfig",
     "apps.web.apps.WebConfig",
@@ -43,6 +44,8 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    "apps.core.middleware.ServerTimingMiddleware",
+    "apps.core.routers.ReplicaStickinessMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -75,16 +78,61 @@ WSGI_APPLICATION = "config.wsgi.application"
 ASGI_APPLICATION = "config.asgi.application"
 
 
+# Production SQLite mode: WAL and tuned pragmas on every new connection (applied by
+# apps.core.signals), plus persistent connections with health checks.
+SQLITE_PRODUCTION_MODE = env("SQLITE_PRODUCTION_MODE", "0") in {"1", "true", "True", "yes", "YES"}
+SQLITE_PRAGMAS = {
+    "journal_mode": env("SQLITE_JOURNAL_MODE", "wal"),
+    "synchronous": env("SQLITE_SYNCHRONOUS", "normal"),
+    "busy_timeout": int(env("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(env("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": -int(env("SQLITE_CACHE_SIZE_KIB", str(64 * 1024))),  # negative: KiB, not pages
+    "temp_store": "memory",
+} if SQLITE_PRODUCTION_MODE else {}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": env("DJANGO_SQLITE_PATH", str(BASE_DIR / "db.sqlite3")),
+        "CONN_MAX_AGE": int(env("DJANGO_CONN_MAX_AGE", "600" if SQLITE_PRODUCTION_MODE else "0")),
+        "CONN_HEALTH_CHECKS": env("DJANGO_CONN_HEALTH_CHECKS", "1" if SQLITE_PRODUCTION_MODE else "0")
+        in {"1", "true", "True", "yes", "YES"},
     }
 }
 
+# Read replicas (apps.core.routers): reads inside requests go to a replica unless the
+# client or user wrote within DATABASE_REPLICA_STICKY_SECONDS. Replication itself is
+# external (e.g. Litestream or a file copy for local testing).
+DATABASE_REPLICAS = []
+if env("DJANGO_SQLITE_REPLICA_PATH", ""):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": env("DJANGO_SQLITE_REPLICA_PATH"),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS = ["replica"]
+DATABASE_REPLICA_STICKY_SECONDS = int(env("DATABASE_REPLICA_STICKY_SECONDS", "5"))
+DATABASE_REPLICA_STICKY_CACHE_ALIAS = env("DATABASE_REPLICA_STICKY_CACHE_ALIAS", "default")
+
+# User sharding (apps.accounts.sharding): each user's rows live on one of USER_SHARDS,
+# placed by rendezvous hashing of the user id and found through the directory on
+# `default`. DJANGO_SQLITE_SHARD_PATHS adds shard1..N next to `default`; fewer than two
+# shards means no sharding. After changing the list, run `manage.py rebalance_shards`.
+USER_SHARDS = []
+_shard_paths = [path.strip() for path in env("DJANGO_SQLITE_SHARD_PATHS", "").split(",") if path.strip()]
+if _shard_paths:
+    for number, path in enumerate(_shard_paths, start=1):
+        DATABASES[f"shard{number}"] = {**DATABASES["default"], "NAME": path}
+    USER_SHARDS = ["default", *(f"shard{number}" for number in range(1, len(_shard_paths) + 1))]
+
+DATABASE_ROUTERS = ["apps.accounts.sharding.UserShardRouter", "apps.core.routers.PrimaryReplicaRouter"]
+
 
 AUTH_USER_MODEL = "accounts.User"
 
+# ModelBackend that loads session users (admin, /metrics) from their shard.
+AUTHENTICATION_BACKENDS = ["apps.accounts.backends.ShardedModelBackend"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -104,6 +152,15 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Avatar uploads are cut off mid-stream past this size (apps.profiles.uploads).
+AVATAR_MAX_UPLOAD_BYTES = int(env("AVATAR_MAX_UPLOAD_BYTES", str(2 * 1024 * 1024)))
+
+# Avatar derivatives rendered by `manage.py process_avatars` (apps.profiles.avatars).
+AVATAR_VARIANT_SIZES = [int(s) for s in env("AVATAR_VARIANT_SIZES", "32,64,256").split(",") if s.strip()]
+AVATAR_WEBP_QUALITY = int(env("AVATAR_WEBP_QUALITY", "80"))
+AVATAR_WORKER_BATCH_SIZE = int(env("AVATAR_WORKER_BATCH_SIZE", "50"))
+AVATAR_WORKER_POLL_SECONDS = float(env("AVATAR_WORKER_POLL_SECONDS", "2"))
+
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -130,13 +187,86 @@ else:
 # DRF / JWT
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "apps.core.fastjson.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "apps.core.fastjson.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    # Reverse proxies in front of the app. Client IPs (rate limits, replica stickiness) come
+    # from X-Forwarded-For only behind that many proxies; with 0 it is ignored.
+    "NUM_PROXIES": int(env("DJANGO_NUM_PROXIES", "0")),
+}
+
+# JSON library behind the API renderer/parser (apps.core.fastjson): "orjson" or "stdlib".
+# "orjson" falls back to the stdlib when orjson is not installed.
+API_JSON_BACKEND = env("API_JSON_BACKEND", "orjson")
+
+# Per-request phase timings (apps.core.middleware); histograms are served at /metrics.
+SERVER_TIMING_HEADER = env("SERVER_TIMING_HEADER", "1") in {"1", "true", "True", "yes", "YES"}
+
+# Django's defaults, with PBKDF2 wrapped to report its time as the "hash" phase.
+PASSWORD_HASHERS = [
+    "apps.accounts.hashers.TimedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Pre-handler rate limits for the public auth endpoints (apps.accounts.throttling).
+# Per endpoint scope, limits are keyed by client "ip", normalized "email" from the body, and
+# "global" (all clients, for load shedding), as "<count>/<s|m|h|d>"; None disables a key.
+# Counters must live in a cache shared by every worker (see CACHES).
+AUTH_RATE_LIMITS_ENABLED = env("AUTH_RATE_LIMITS_ENABLED", "1") in {"1", "true", "True", "yes", "YES"}
+AUTH_RATE_LIMIT_CACHE_ALIAS = env("AUTH_RATE_LIMIT_CACHE_ALIAS", "default")
+AUTH_RATE_LIMITS = {
+    "register": {"ip": "30/m", "email": "5/m", "global": "600/m"},
+    "verify_email": {"ip": "60/m", "email": "10/m", "global": None},
+    "resend_otp": {"ip": "30/m", "email": "5/m", "global": None},
+    "login": {"ip": "60/m", "email": "10/m", "global": "1200/m"},
+    "forgot_password": {"ip": "30/m", "email": "5/m", "global": "600/m"},
 }
 
+# Threads for password hashing in the async auth endpoints (apps.accounts.async_views).
+AUTH_HASHING_POOL_WORKERS = int(env("AUTH_HASHING_POOL_WORKERS", str(os.cpu_count() or 1)))
+
+# Cache shared by every worker process: the auth user cache, cached responses, rate limits
+# and sticky replica marks must be seen by all workers. Use Redis
+# (django.core.cache.backends.redis.RedisCache + `pip install redis`) or Memcached in
+# production. The default LocMemCache lives in one process, so it is only accepted with
+# CACHE_ALLOW_PROCESS_LOCAL (on with DEBUG); otherwise optional caches are skipped, rate
+# limits count per worker and `manage.py check` warns (apps.core.caches).
+CACHES = {
+    "default": {
+        "BACKEND": env("DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": env("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+CACHE_ALLOW_PROCESS_LOCAL = env("DJANGO_CACHE_ALLOW_PROCESS_LOCAL", "1" if DEBUG else "0") in {
+    "1", "true", "True", "yes", "YES"
+}
+
+# Cache used by CachedJWTAuthentication for user + profile lookups.
+AUTH_USER_CACHE_ALIAS = env("AUTH_USER_CACHE_ALIAS", "default")
+AUTH_USER_CACHE_TTL_SECONDS = int(env("AUTH_USER_CACHE_TTL_SECONDS", "300"))
+
+# Rendered `GET /api/profile/me/` bodies (apps.profiles.response_cache); needs a shared cache.
+PROFILE_RESPONSE_CACHE_ALIAS = env("PROFILE_RESPONSE_CACHE_ALIAS", "default")
+PROFILE_RESPONSE_CACHE_TTL_SECONDS = int(env("PROFILE_RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# In-memory refresh-token blacklist index (apps.accounts.blacklist).
+TOKEN_BLACKLIST_INDEX_SYNC_SECONDS = float(env("TOKEN_BLACKLIST_INDEX_SYNC_SECONDS", "2"))
+TOKEN_BLACKLIST_INDEX_EVICT_SECONDS = float(env("TOKEN_BLACKLIST_INDEX_EVICT_SECONDS", "300"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -149,4 +279,23 @@ SIMPLE_JWT = {
 # App-specific
 EMAIL_OTP_LENGTH = int(env("EMAIL_OTP_LENGTH", "6"))
 EMAIL_OTP_TTL_SECONDS = int(env("EMAIL_OTP_TTL_SECONDS", "600"))  # 10 minutes
-
+EMAIL_OTP_HASH_KEY = env("EMAIL_OTP_HASH_KEY", "")  # HMAC key for OTP hashes; falls back to SECRET_KEY
+
+
+# Email outbox (drained by `python manage.py send_outbox`)
+EMAIL_OUTBOX_BATCH_SIZE = int(env("EMAIL_OUTBOX_BATCH_SIZE", "100"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(env("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(env("EMAIL_OUTBOX_RETRY_BASE_SECONDS", "30"))
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = int(env("EMAIL_OUTBOX_RETRY_MAX_SECONDS", "3600"))
+EMAIL_OUTBOX_LEASE_SECONDS = int(env("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+EMAIL_OUTBOX_POLL_SECONDS = float(env("EMAIL_OUTBOX_POLL_SECONDS", "2"))
+EMAIL_SMTP_POOL_SIZE = int(env("EMAIL_SMTP_POOL_SIZE", "2"))
+EMAIL_SMTP_POOL_MAX_MESSAGES = int(env("EMAIL_SMTP_POOL_MAX_MESSAGES", "100"))
+EMAIL_SMTP_POOL_MAX_IDLE_SECONDS = float(env("EMAIL_SMTP_POOL_MAX_IDLE_SECONDS", "30"))
+
+# Retention (`python manage.py purge_expired`); windows count from expiry/creation.
+RETENTION_CHUNK_SIZE = int(env("RETENTION_CHUNK_SIZE", "500"))
+RETENTION_OTP_DAYS = float(env("RETENTION_OTP_DAYS", "1"))
+RETENTION_OUTSTANDING_TOKEN_DAYS = float(env("RETENTION_OUTSTANDING_TOKEN_DAYS", "1"))
+RETENTION_UNVERIFIED_USER_DAYS = float(env("RETENTION_UNVERIFIED_USER_DAYS", "7"))
+RETENTION_OUTBOX_DAYS = float(env("RETENTION_OUTBOX_DAYS", "7"))
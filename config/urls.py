@@ -5,11 +5,14 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from apps.core.views import MetricsView
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/", include("apps.accounts.urls")),
     path("api/profile/", include("apps.profiles.urls")),
+    path("metrics", MetricsView.as_view(), name="metrics"),
     path("", include("apps.web.urls")),
 ]
 
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import re
+
+from asgiref.sync import sync_to_async
+from django.core import mail
+from django.test import TestCase, override_settings
+
+from apps.accounts.outbox import deliver_pending
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class AsyncAuthFlowTests(TestCase):
+    async def _post(self, path, data):
+        return await self.async_client.post(path, data, content_type="application/json")
+
+    async def test_register_verify_login_refresh(self):
+        email = "hana@example.com"
+        password = "HanaPass123!"
+
+        res = await self._post("/api/auth/async/register/", {"email": email, "password": password, "name": "Hana"})
+        self.assertEqual(res.status_code, 201, res.content)
+        res = await self._post("/api/auth/async/register/", {"email": email.upper(), "password": password})
+        self.assertEqual(res.status_code, 400, res.content)
+
+        res = await self._post("/api/auth/async/login/", {"email": email, "password": password})
+        self.assertEqual(res.status_code, 401, res.content)
+
+        await sync_to_async(deliver_pending)()
+        otp = re.search(r"\b(\d{6})\b", mail.outbox[-1].body).group(1)
+        wrong_otp = f"{(int(otp) + 1) % 10**6:06d}"
+        res = await self._post("/api/auth/async/verify-email/", {"email": email, "otp": wrong_otp})
+        self.assertEqual(res.status_code, 400, res.content)
+        res = await self._post("/api/auth/async/verify-email/", {"email": email, "otp": otp})
+        self.assertEqual(res.status_code, 200, res.content)
+
+        res = await self._post("/api/auth/async/login/", {"email": email, "password": "wrong-password"})
+        self.assertEqual(res.status_code, 401, res.content)
+        res = await self._post("/api/auth/async/login/", {"email": email, "password": password})
+        self.assertEqual(res.status_code, 200, res.content)
+        tokens = res.json()
+
+        res = await self._post("/api/auth/async/token/refresh/", {"refresh": tokens["refresh"]})
+        self.assertEqual(res.status_code, 200, res.content)
+        self.assertIn("access", res.json())
+
+        res = await self._post("/api/auth/logout/", {"refresh": tokens["refresh"]})
+        self.assertEqual(res.status_code, 200, res.content)
+        res = await self._post("/api/auth/async/token/refresh/", {"refresh": tokens["refresh"]})
+        self.assertEqual(res.status_code, 401, res.content)
+
+    async def test_get_not_allowed(self):
+        res = await self.async_client.get("/api/auth/async/login/")
+        self.assertEqual(res.status_code, 405)
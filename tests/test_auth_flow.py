@@ -4,17 +4,26 @@ import re
 from urllib.parse import parse_qs, urlparse
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core import mail
 from django.test import override_settings
 from rest_framework.test import APITestCase
 
+from apps.accounts.models import EmailOTP
+from apps.accounts.outbox import deliver_pending
+
 
 User = get_user_model()
 
 
 @override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
 class AuthFlowTests(APITestCase):
+    def _drain_outbox(self) -> None:
+        while deliver_pending().claimed:
+            pass
+
     def _extract_first_otp(self) -> str:
+        self._drain_outbox()
         self.assertGreaterEqual(len(mail.outbox), 1)
         body = mail.outbox[-1].body
         m = re.search(r"\b(\d{6})\b", body)
@@ -22,6 +31,7 @@ class AuthFlowTests(APITestCase):
         return m.group(1)
 
     def _extract_reset_params(self):
+        self._drain_outbox()
         self.assertGreaterEqual(len(mail.outbox), 1)
         body = mail.outbox[-1].body
         # Find the first URL-ish token in the email body
@@ -124,6 +134,7 @@ class AuthFlowTests(APITestCase):
         self.assertEqual(res.data["email"], email)
 
         # Should have received a new email
+        self._drain_outbox()
         self.assertEqual(len(mail.outbox), initial_email_count + 1)
 
         # Get new OTP
@@ -146,3 +157,39 @@ class AuthFlowTests(APITestCase):
         res = self.client.post("/api/auth/resend-otp/", {"email": "nonexistent@example.com"}, format="json")
         self.assertEqual(res.status_code, 400, res.data)
 
+    def test_otp_hashed_with_hmac_and_legacy_hashes_still_verify(self):
+        email = "frank@example.com"
+        res = self.client.post("/api/auth/register/", {"email": email, "password": "SecurePass123!"}, format="json")
+        self.assertEqual(res.status_code, 201, res.data)
+        otp = self._extract_first_otp()
+
+        otp_obj = EmailOTP.objects.get(user__email=email)
+        self.assertTrue(otp_obj.code_hash.startswith("otp_hmac_sha256$"))
+
+        # Rows written before the HMAC hasher used PBKDF2.
+        otp_obj.code_hash = make_password(otp)
+        otp_obj.save(update_fields=["code_hash"])
+        res = self.client.post("/api/auth/verify-email/", {"email": email, "otp": otp}, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+
+    def test_registration_is_one_transaction_with_one_insert_per_row(self):
+        email = "grace@example.com"
+        # SAVEPOINT, INSERT user, INSERT profile (with name), index the profile for search,
+        # INSERT OTP, INSERT outbox email, RELEASE.
+        with self.assertNumQueries(7):
+            res = self.client.post(
+                "/api/auth/register/", {"email": email, "password": "SecurePass123!", "name": " Grace "}, format="json"
+            )
+        self.assertEqual(res.status_code, 201, res.data)
+        user = User.objects.select_related("profile").get(email=email)
+        self.assertEqual(user.profile.name, "Grace")
+        self.assertEqual(user.profile.email, email)
+        self.assertEqual(EmailOTP.objects.filter(user=user).count(), 1)
+
+        # Duplicates are rejected by the unique constraint and leave nothing behind.
+        res = self.client.post("/api/auth/register/", {"email": email.upper(), "password": "SecurePass123!"}, format="json")
+        self.assertEqual(res.status_code, 400, res.data)
+        self.assertIn("email", res.data)
+        self.assertEqual(EmailOTP.objects.filter(user=user).count(), 1)
+        self._drain_outbox()
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopFutureHandlers
+from django.test import override_settings
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+
+from apps.profiles.avatars import pending_avatars, process_pending
+from apps.profiles.models import UserProfile
+from apps.profiles.uploads import AvatarUploadHandler
+
+
+User = get_user_model()
+
+
+def _png(color="red", size=(300, 200)) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", size, color=color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class AvatarVariantTests(APITestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, AVATAR_VARIANT_SIZES=[32, 64, 256])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(email="pix@example.com", password="PixPass123!", is_active=True, email_verified=True)
+        res = self.client.post("/api/auth/login/", {"email": "pix@example.com", "password": "PixPass123!"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def _upload(self, content: bytes):
+        res = self.client.patch(
+            "/api/profile/me/",
+            {"avatar": SimpleUploadedFile("me.png", content, content_type="image/png")},
+            format="multipart",
+        )
+        self.assertEqual(res.status_code, 200, res.data)
+        return res
+
+    def test_upload_is_processed_off_request_into_sized_variants(self):
+        res = self._upload(_png())
+        self.assertEqual(res.data["avatar_variants"], {})
+        self.assertEqual(pending_avatars().count(), 1)
+
+        result = process_pending()
+        self.assertEqual((result.claimed, result.rendered), (1, 1))
+        self.assertEqual(pending_avatars().count(), 0)
+
+        # The cached user/profile was evicted, so the next read sees the variants.
+        variants = self.client.get("/api/profile/me/").data["avatar_variants"]
+        self.assertEqual(set(variants), {"32", "64", "256"})
+        self.user.profile.refresh_from_db()
+        for size, by_fmt in self.user.profile.avatar_variants.items():
+            self.assertTrue(variants[size]["webp"].endswith(f"/{size}.webp"))
+            for fmt, name in by_fmt.items():
+                with default_storage.open(name) as f:
+                    image = Image.open(f)
+                    self.assertEqual(image.size, (int(size), int(size)))
+                    self.assertEqual(image.format, fmt.upper())
+
+    def test_unchanged_source_skips_rendering(self):
+        self._upload(_png("blue"))
+        process_pending()
+        first = UserProfile.objects.get(pk=self.user.profile.pk)
+
+        # Re-uploading the same bytes stores nothing new and leaves the variants in place.
+        self._upload(_png("blue"))
+        self.assertEqual(pending_avatars().count(), 0)
+        self.assertEqual(UserProfile.objects.get(pk=first.pk).avatar_variants, first.avatar_variants)
+
+        # Another profile with the same image shares the stored file and the variants.
+        other = User.objects.create_user(email="twin@example.com", password="TwinPass123!")
+        other.profile.avatar.save("twin.png", ContentFile(_png("blue")))
+        result = process_pending()
+        self.assertEqual((result.claimed, result.rendered, result.reused), (1, 0, 1))
+        other.profile.refresh_from_db()
+        self.assertEqual(other.profile.avatar.name, first.avatar.name)
+        self.assertEqual(other.profile.avatar_variants, first.avatar_variants)
+
+        self._upload(_png("green"))
+        self.assertEqual(process_pending().rendered, 1)
+
+    def test_broken_image_is_not_retried(self):
+        self.user.profile.avatar.save("broken.png", ContentFile(b"not an image"))
+        result = process_pending()
+        self.assertEqual((result.claimed, result.failed), (1, 1))
+        self.assertEqual(pending_avatars().count(), 0)
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.avatar_variants, {})
+
+
+@override_settings(AVATAR_MAX_UPLOAD_BYTES=1000)
+class AvatarUploadHandlerTests(APITestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+
+    def test_stops_reading_once_over_the_limit(self):
+        handler = AvatarUploadHandler()
+        with self.assertRaises(StopFutureHandlers):
+            handler.new_file("avatar", "big.png", "image/png", None)
+        handler.receive_data_chunk(b"x" * 600, 0)
+        with self.assertRaises(ValidationError):
+            handler.receive_data_chunk(b"x" * 600, 600)
+
+    def test_hashes_while_streaming_and_passes_other_fields_through(self):
+        handler = AvatarUploadHandler()
+        handler.new_file("document", "a.txt", "text/plain", None)
+        self.assertEqual(handler.receive_data_chunk(b"abc", 0), b"abc")
+        self.assertIsNone(handler.file_complete(3))
+
+        with self.assertRaises(StopFutureHandlers):
+            handler.new_file("avatar", "me.png", "image/png", None)
+        self.assertIsNone(handler.receive_data_chunk(b"abc", 0))
+        uploaded = handler.file_complete(3)
+        self.assertEqual(uploaded.sha256, hashlib.sha256(b"abc").hexdigest())
+        self.assertEqual(uploaded.read(), b"abc")
+
+    def test_oversized_upload_rejected_and_nothing_stored(self):
+        user = User.objects.create_user(email="big@example.com", password="BigPass123!", is_active=True)
+        self.client.force_authenticate(user=user)
+        res = self.client.patch(
+            "/api/profile/me/",
+            {"avatar": SimpleUploadedFile("big.png", _png(size=(400, 400)) + b"\0" * 2000, content_type="image/png")},
+            format="multipart",
+        )
+        self.assertEqual(res.status_code, 400, res.data)
+        self.assertEqual(res.data["avatar"], ["Avatar must be <= 1000 bytes."])
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, "avatars")))
+
+    def test_identical_uploads_share_one_file(self):
+        storage = UserProfile._meta.get_field("avatar").storage
+        first = storage.save("a.png", ContentFile(b"same bytes"))
+        second = storage.save("b.PNG", ContentFile(b"same bytes"))
+        digest = hashlib.sha256(b"same bytes").hexdigest()
+        self.assertEqual(first, f"avatars/{digest[:2]}/{digest}.png")
+        self.assertEqual(second, first)
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, "avatars", digest[:2]))), 1)
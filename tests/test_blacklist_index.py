@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.blacklist import blacklist_index
+
+
+User = get_user_model()
+
+
+class BlacklistIndexTests(APITestCase):
+    def setUp(self):
+        blacklist_index.reset()
+        self.user = User.objects.create_user(email="gina@example.com", password="GinaPass123!", is_active=True)
+        self.refresh = RefreshToken.for_user(self.user)
+
+    def _refresh(self, token):
+        return self.client.post("/api/auth/token/refresh/", {"refresh": str(token)}, format="json")
+
+    def test_warm_refresh_skips_blacklist_queries(self):
+        self.assertEqual(self._refresh(self.refresh).status_code, 200)
+        with mock.patch.object(blacklist_index, "sync_seconds", 3600), self.assertNumQueries(0):
+            res = self._refresh(self.refresh)
+        self.assertEqual(res.status_code, 200, res.data)
+
+    def test_picks_up_rows_blacklisted_elsewhere(self):
+        self.assertEqual(self._refresh(self.refresh).status_code, 200)
+        # bulk_create sends no signals, like a blacklist written by another process.
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=OutstandingToken.objects.get())])
+        with mock.patch.object(blacklist_index, "sync_seconds", 0):
+            res = self._refresh(self.refresh)
+        self.assertEqual(res.status_code, 401, res.data)
+
+    def test_positive_is_confirmed_against_database(self):
+        self.refresh.blacklist()
+        self.assertEqual(self._refresh(self.refresh).status_code, 401)
+
+        BlacklistedToken.objects.all().delete()
+        self.assertEqual(self._refresh(self.refresh).status_code, 200)
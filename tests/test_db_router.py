@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.routers import PrimaryReplicaRouter, ReplicaStickinessMiddleware, note_user
+
+
+router = PrimaryReplicaRouter()
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], DATABASE_REPLICA_STICKY_SECONDS=30)
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.factory = RequestFactory()
+
+    def _request(self, ip="10.0.0.1", user_id=None, write=False, **meta):
+        """Run a fake request through the middleware; returns the alias its first read used."""
+        seen = {}
+
+        def view(request):
+            if user_id:
+                note_user(user_id)
+            seen["read"] = router.db_for_read(None)
+            if write:
+                self.assertEqual(router.db_for_write(None), "default")
+                seen["after_write"] = router.db_for_read(None)
+            return None
+
+        ReplicaStickinessMiddleware(view)(self.factory.get("/", REMOTE_ADDR=ip, **meta))
+        return seen
+
+    def test_reads_go_to_replica_only_inside_requests(self):
+        self.assertEqual(router.db_for_read(None), "default")
+        self.assertEqual(self._request()["read"], "replica")
+
+    def test_write_pins_rest_of_request_and_same_client(self):
+        seen = self._request(ip="10.0.0.1", write=True)
+        self.assertEqual((seen["read"], seen["after_write"]), ("replica", "default"))
+        # e.g. verify-email right after register, from the same client.
+        self.assertEqual(self._request(ip="10.0.0.1")["read"], "default")
+        self.assertEqual(self._request(ip="10.0.0.2")["read"], "replica")
+
+    def test_stickiness_follows_the_user_across_ips(self):
+        self._request(ip="10.0.0.1", user_id="u1", write=True)
+        self.assertEqual(self._request(ip="10.0.0.9", user_id="u1")["read"], "default")
+        self.assertEqual(self._request(ip="10.0.0.9", user_id="u2")["read"], "replica")
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1})
+    def test_clients_behind_a_proxy_are_told_apart(self):
+        self._request(ip="10.9.9.9", write=True, HTTP_X_FORWARDED_FOR="203.0.113.1")
+        self.assertEqual(self._request(ip="10.9.9.9", HTTP_X_FORWARDED_FOR="203.0.113.1")["read"], "default")
+        self.assertEqual(self._request(ip="10.9.9.9", HTTP_X_FORWARDED_FOR="203.0.113.2")["read"], "replica")
+
+    @override_settings(DATABASE_REPLICA_STICKY_SECONDS=0)
+    def test_stickiness_expires(self):
+        self._request(write=True)
+        self.assertEqual(self._request()["read"], "replica")
+
+    def test_reads_inside_primary_transactions_stay_on_primary(self):
+        def view(request):
+            with mock.patch.object(connection, "in_atomic_block", True):
+                self.assertEqual(router.db_for_read(None), "default")
+
+        ReplicaStickinessMiddleware(view)(self.factory.get("/"))
+
+    def test_replicas_are_not_migrated(self):
+        self.assertTrue(router.allow_migrate("default", "accounts"))
+        self.assertFalse(router.allow_migrate("replica", "accounts"))
+
+    async def test_async_requests_are_pinned_the_same_way(self):
+        async def view(request):
+            seen.append(router.db_for_read(None))
+            if request.method == "POST":
+                router.db_for_write(None)
+
+        middleware = ReplicaStickinessMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        seen = []
+        await middleware(self.factory.post("/", REMOTE_ADDR="10.0.0.1"))
+        await middleware(self.factory.get("/", REMOTE_ADDR="10.0.0.1"))
+        await middleware(self.factory.get("/", REMOTE_ADDR="10.0.0.2"))
+        self.assertEqual(seen, ["replica", "default", "replica"])
+
+
+class AuthUserLookupTests(APITestCase):
+    def test_cache_fill_reads_the_primary(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(
+            email="fresh@example.com", password="FreshPass123!", is_active=True, email_verified=True
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        # No "replica" database exists here, so a lookup routed there would raise.
+        with mock.patch.object(PrimaryReplicaRouter, "db_for_read", return_value="replica"):
+            self.assertEqual(self.client.get("/api/profile/me/").status_code, 200)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.accounts.emails import send_verification_otp
+from apps.accounts.mail_pool import SMTPConnectionPool
+from apps.accounts.models import OutgoingEmail
+from apps.accounts.outbox import deliver_pending
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS=30,
+)
+class EmailOutboxTests(TestCase):
+    def test_send_only_enqueues(self):
+        send_verification_otp(email="dave@example.com", otp="123456")
+        self.assertEqual(len(mail.outbox), 0)
+        queued = OutgoingEmail.objects.get()
+        self.assertEqual(queued.status, OutgoingEmail.Status.PENDING)
+        self.assertIn("123456", queued.body)
+
+    def test_worker_delivers_batch(self):
+        for i in range(3):
+            send_verification_otp(email=f"user{i}@example.com", otp="123456")
+
+        result = deliver_pending(batch_size=10)
+        self.assertEqual((result.claimed, result.sent), (3, 3))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutgoingEmail.objects.exclude(status=OutgoingEmail.Status.SENT).exists())
+
+        # Nothing is delivered twice.
+        self.assertEqual(deliver_pending().claimed, 0)
+
+    def test_failure_backs_off_then_gives_up(self):
+        send_verification_otp(email="erin@example.com", otp="123456")
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", side_effect=OSError("down")):
+            result = deliver_pending()
+            self.assertEqual(result.retried, 1)
+            queued = OutgoingEmail.objects.get()
+            self.assertEqual(queued.attempts, 1)
+            self.assertGreater(queued.next_attempt_at, timezone.now() + timedelta(seconds=20))
+
+            # Not due yet.
+            self.assertEqual(deliver_pending().claimed, 0)
+
+            OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+            result = deliver_pending()
+            self.assertEqual(result.failed, 1)
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutgoingEmail.Status.FAILED)
+        self.assertEqual(queued.last_error, "down")
+
+
+class RecordingBackend(BaseEmailBackend):
+    """Counts opens; the connection drops once `fail_after` messages have been sent."""
+
+    opened = 0
+    fail_after: int | None = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.connection = None
+        self.sent = 0
+
+    def open(self):
+        RecordingBackend.opened += 1
+        self.connection = object()
+        return True
+
+    def close(self):
+        self.connection = None
+
+    def send_messages(self, messages):
+        if self.fail_after is not None and self.sent == self.fail_after:
+            RecordingBackend.fail_after = None
+            raise ConnectionResetError("server hung up")
+        self.sent += len(messages)
+        return len(messages)
+
+
+class SMTPConnectionPoolTests(TestCase):
+    def setUp(self):
+        RecordingBackend.opened = 0
+        RecordingBackend.fail_after = None
+        self.pool = SMTPConnectionPool(
+            max_size=1, max_messages=3, max_idle_seconds=60, backend="tests.test_email_outbox.RecordingBackend"
+        )
+        self.addCleanup(self.pool.close)
+
+    def _messages(self, n):
+        return [EmailMessage("s", "b", "from@example.com", ["to@example.com"]) for _ in range(n)]
+
+    def test_reuses_connection_across_batches(self):
+        self.assertEqual(self.pool.send_messages(self._messages(2)), [None, None])
+        self.assertEqual(self.pool.send_messages(self._messages(1)), [None])
+        self.assertEqual(RecordingBackend.opened, 1)
+
+        # The per-connection message cap forces a fresh connection.
+        self.pool.send_messages(self._messages(1))
+        self.assertEqual(RecordingBackend.opened, 2)
+
+    def test_reconnects_and_retries_dropped_connection(self):
+        RecordingBackend.fail_after = 1
+        self.assertEqual(self.pool.send_messages(self._messages(2)), [None, None])
+        self.assertEqual(RecordingBackend.opened, 2)
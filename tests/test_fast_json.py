@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import io
+import unittest
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.test import APITestCase
+
+from apps.core import fastjson
+from apps.core.fastjson import FastJSONParser, FastJSONRenderer
+from apps.profiles.models import UserProfile
+
+
+User = get_user_model()
+
+
+@unittest.skipIf(fastjson.orjson is None, "orjson is not installed")
+class FastJSONTests(SimpleTestCase):
+    def _render(self, backend, data, media_type=None):
+        with override_settings(API_JSON_BACKEND=backend):
+            return FastJSONRenderer().render(data, media_type)
+
+    def test_output_matches_stdlib_renderer(self):
+        profile = UserProfile(avatar="avatars/ab/abc.png")
+        data = {
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            "day": date(2024, 5, 1),
+            "score": Decimal("1.5"),
+            "name": "Zoë ✓",
+            "bio": "line\u2028paragraph\u2029",
+            "detail": gettext_lazy("Invalid credentials."),
+            "errors": [ErrorDetail("required", code="required")],
+            "avatar": profile.avatar,
+            "empty_avatar": UserProfile().avatar,
+            1: None,
+        }
+        fast = self._render("orjson", data)
+        self.assertEqual(fast, self._render("stdlib", data))
+        self.assertIn(b'"created_at":"2024-05-01T12:30:15.123456Z"', fast)
+        self.assertIn(b'"avatar":"/media/avatars/ab/abc.png"', fast)
+        self.assertIn(b'"bio":"line\\u2028paragraph\\u2029"', fast)
+
+    def test_non_finite_floats(self):
+        # The documented difference: DRF rejects them, orjson writes null.
+        with self.assertRaises(ValueError):
+            self._render("stdlib", {"x": float("nan")})
+        self.assertEqual(self._render("orjson", {"x": float("inf")}), b'{"x":null}')
+
+    def test_indented_and_empty_output(self):
+        self.assertEqual(self._render("orjson", None), b"")
+        indented = self._render("orjson", {"a": 1}, "application/json; indent=2")
+        self.assertEqual(indented, b'{\n  "a": 1\n}')
+
+    def test_parser_rejects_invalid_json(self):
+        with override_settings(API_JSON_BACKEND="orjson"):
+            parser = FastJSONParser()
+            self.assertEqual(parser.parse(io.BytesIO('{"name": "Zoë"}'.encode())), {"name": "Zoë"})
+            for body in (b"{", b'{"n": NaN}'):
+                with self.assertRaises(ParseError):
+                    parser.parse(io.BytesIO(body))
+
+
+class FastJSONAPITests(APITestCase):
+    def test_api_round_trip_and_bad_body(self):
+        user = User.objects.create_user(email="json@example.com", password="JsonPass123!", is_active=True)
+        self.client.force_authenticate(user=user)
+        res = self.client.patch("/api/profile/me/", {"name": "Zoë"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["name"], "Zoë")
+
+        res = self.client.post("/api/auth/login/", b"{not json", content_type="application/json")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("JSON parse error", res.json()["detail"])
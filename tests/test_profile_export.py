@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.profiles.models import UserProfile
+
+
+User = get_user_model()
+
+
+class ProfileExportTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(email="admin@example.com", password="AdminPass123!")
+        for i in range(3):
+            user = User.objects.create_user(email=f"export{i}@example.com", password="ExportPass123!")
+            user.profile.name = f"Export, \"{i}\""
+            user.profile.save(update_fields=["name"])
+        self.old = UserProfile.objects.get(email="export0@example.com")
+        UserProfile.objects.filter(pk=self.old.pk).update(updated_at=timezone.now() - timedelta(days=30))
+
+    def _export(self, **params):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.get("/api/profile/admin/export/", params)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.streaming)
+        return res, b"".join(res.streaming_content).decode()
+
+    def test_csv_export_streams_all_rows_oldest_update_first(self):
+        res, body = self._export()
+        self.assertEqual(res["Content-Type"], "text/csv; charset=utf-8")
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), UserProfile.objects.count())
+        self.assertEqual(rows[0]["email"], "export0@example.com")
+        by_email = {row["email"]: row for row in rows}
+        self.assertEqual(by_email["export1@example.com"]["name"], 'Export, "1"')
+        self.assertEqual(by_email["export1@example.com"]["is_active"], "False")
+        self.assertEqual(by_email["admin@example.com"]["is_staff"], "True")
+
+    def test_ndjson_export_with_updated_range(self):
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        res, body = self._export(output="ndjson", updated_after=since)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in body.splitlines()]
+        emails = {record["email"] for record in records}
+        self.assertNotIn("export0@example.com", emails)
+        self.assertIn("export2@example.com", emails)
+        self.assertIsInstance(records[0]["email_verified"], bool)
+
+        _, body = self._export(output="ndjson", updated_before=since)
+        self.assertEqual([json.loads(line)["email"] for line in body.splitlines()], ["export0@example.com"])
+
+    def test_rejects_bad_params_and_non_admins(self):
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.client.get("/api/profile/admin/export/", {"output": "xml"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/profile/admin/export/", {"updated_after": "soon"}).status_code, 400)
+        self.client.force_authenticate(user=User.objects.get(email="export1@example.com"))
+        self.assertEqual(self.client.get("/api/profile/admin/export/").status_code, 403)
+
+    def test_export_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profiles.ndjson")
+            call_command("export_profiles", "--format", "ndjson", "--output", path, "--chunk-size", "2")
+            with open(path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), UserProfile.objects.count())
+
+        out = io.StringIO()
+        call_command("export_profiles", "--updated-before", (timezone.now() - timedelta(days=1)).isoformat(), stdout=out)
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual([row["email"] for row in rows], ["export0@example.com"])
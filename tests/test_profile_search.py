@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from apps.accounts.bulk_import import import_users
+from apps.profiles.models import UserProfile
+from apps.profiles.search import build_match_query, search_profile_ids
+
+
+User = get_user_model()
+
+
+class ProfileSearchTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(email="admin@example.com", password="AdminPass123!")
+        self.alice = self._user("alice.walker@example.com", "Alice Walker")
+        self.bob = self._user("bob@example.com", "Bob Quinn")
+        self.quinn = self._user("quinn@example.com", "Quinn Adams")
+
+    def _user(self, email, name):
+        user = User.objects.create_user(email=email, password="SearchPass123!")
+        user.profile.name = name
+        user.profile.save(update_fields=["name"])
+        return user
+
+    def _search(self, term):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.get("/api/profile/admin/profiles/", {"search": term})
+        self.assertEqual(res.status_code, 200, res.data)
+        return [row["email"] for row in res.data["results"]]
+
+    def test_match_query_is_prefix_and_of_words(self):
+        self.assertEqual(build_match_query('Ali "WALK'), '"ali"* "walk"*')
+        self.assertIsNone(build_match_query(" @. "))
+
+    def test_api_prefix_search_ranked(self):
+        self.assertEqual(self._search("ali"), ["alice.walker@example.com"])
+        self.assertEqual(self._search("walker ali"), ["alice.walker@example.com"])
+        # "quinn" appears in both name and email for one profile, so it ranks first.
+        self.assertEqual(self._search("quinn"), ["quinn@example.com", "bob@example.com"])
+        self.assertEqual(self._search("nobody"), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        profile = self.alice.profile
+        profile.name = "Alicia Keys"
+        profile.save(update_fields=["name"])
+        self.assertEqual(search_profile_ids("keys"), [profile.pk])
+        self.assertEqual(search_profile_ids("walker"), [profile.pk])  # still in the email
+
+        self.alice.email = "ak@example.com"
+        self.alice.save()
+        self.assertEqual(search_profile_ids("walker"), [])
+
+        self.alice.delete()
+        self.assertEqual(search_profile_ids("keys"), [])
+
+    def test_bulk_import_and_rebuild_index_rows(self):
+        import_users([{"email": "imported@example.com", "password": "ImportPass123!", "name": "Ivan Import"}])
+        self.assertEqual(
+            search_profile_ids("ivan"), [UserProfile.objects.get(email="imported@example.com").pk]
+        )
+
+        out = io.StringIO()
+        call_command("rebuild_profile_search", stdout=out)
+        self.assertIn(f"Indexed {UserProfile.objects.count()} profiles.", out.getvalue())
+        self.assertEqual(len(search_profile_ids("example")), UserProfile.objects.count())
+
+    def test_admin_changelists_use_the_index(self):
+        self.client.force_login(self.admin)
+        res = self.client.get("/admin/profiles/userprofile/", {"q": "walk"})
+        self.assertContains(res, "alice.walker@example.com")
+        self.assertNotContains(res, "bob@example.com")
+
+        res = self.client.get("/admin/accounts/user/", {"q": "quinn"})
+        self.assertContains(res, "quinn@example.com")
+        self.assertContains(res, "bob@example.com")
+        self.assertNotContains(res, "alice.walker@example.com")
@@ -3,10 +3,20 @@ from __future__ import annotations
 from io import BytesIO
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from PIL import Image
 from rest_framework.test import APITestCase
 
+from apps.accounts.authentication import user_cache_key
+from apps.profiles.mirror import sync_profile_emails
+from apps.profiles.models import UserProfile
+from apps.profiles.response_cache import response_cache_key, response_cache_stats
+from apps.profiles.search import search_profile_ids
+
 
 User = get_user_model()
 
@@ -82,6 +92,120 @@ class ProfileTests(APITestCase):
         self.assertEqual(res.status_code, 204)
         self.assertFalse(User.objects.filter(id=user_id).exists())
 
+    def test_warm_profile_get_makes_no_queries(self):
+        self._login(self.user)
+        self.client.get("/api/profile/me/")
+        with self.assertNumQueries(0):
+            res = self.client.get("/api/profile/me/")
+        self.assertEqual(res.status_code, 200, res.data)
+
+        self.client.patch("/api/profile/me/", {"name": "Fresh"}, format="json")
+        res = self.client.get("/api/profile/me/")
+        self.assertEqual(res.data["name"], "Fresh")
+
+    def test_conditional_get_and_if_match(self):
+        self._login(self.user)
+        res = self.client.get("/api/profile/me/")
+        etag = res["ETag"]
+        self.assertTrue(res.has_header("Last-Modified"))
+        with self.assertNumQueries(0):
+            res = self.client.get("/api/profile/me/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res["ETag"], etag)
+
+        res = self.client.patch("/api/profile/me/", {"name": "First"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertNotEqual(res["ETag"], etag)
+        # A writer still holding the old version loses.
+        res = self.client.patch("/api/profile/me/", {"name": "Second"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(res.status_code, 412)
+        self.assertEqual(UserProfile.objects.get(user=self.user).name, "First")
+        self.assertEqual(self.client.get("/api/profile/me/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_rendered_profile_is_cached_per_version(self):
+        cache.clear()
+        self._login(self.user)
+        first = self.client.get("/api/profile/me/")
+        second = self.client.get("/api/profile/me/")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(response_cache_stats(), {"hits": 1, "misses": 1})
+
+        # Saving evicts the entry; a body cached for an older version is never served.
+        self.client.patch("/api/profile/me/", {"name": "Cached"}, format="json")
+        self.assertIsNone(cache.get(response_cache_key(self.user.pk)))
+        self.assertEqual(self.client.get("/api/profile/me/").data["name"], "Cached")
+        self.assertEqual(response_cache_stats(), {"hits": 1, "misses": 2})
+
+        # Other renderings bypass the cache.
+        res = self.client.get("/api/profile/me/", HTTP_ACCEPT="application/json; indent=2")
+        self.assertEqual(res.data["name"], "Cached")
+        self.assertEqual(response_cache_stats(), {"hits": 1, "misses": 2})
+
+        self._login(self.admin)
+        res = self.client.get("/api/profile/admin/cache-stats/")
+        self.assertEqual(res.data, {"profile_response_cache": {"hits": 1, "misses": 2}})
+
+    def test_update_does_not_revert_columns_changed_behind_the_cache(self):
+        self._login(self.user)
+        self.client.get("/api/profile/me/")
+        # Written behind the cached user (as by another worker process).
+        UserProfile.objects.filter(user=self.user).update(avatar="avatars/aa/a.png", avatar_hash="a" * 64)
+        res = self.client.patch("/api/profile/me/", {"name": "Kept"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertEqual((profile.name, profile.avatar.name, profile.avatar_hash), ("Kept", "avatars/aa/a.png", "a" * 64))
+
+    @override_settings(CACHE_ALLOW_PROCESS_LOCAL=False)
+    def test_process_local_auth_cache_is_not_used_unless_allowed(self):
+        self._login(self.user)
+        self.assertEqual(self.client.get("/api/profile/me/").status_code, 200)
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+    def test_email_mirror_update_changes_etag(self):
+        self._login(self.user)
+        etag = self.client.get("/api/profile/me/")["ETag"]
+        self.user.email = "renamed@example.com"
+        self.user.save(update_fields=["email"])
+        res = self.client.get("/api/profile/me/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["email"], "renamed@example.com")
+
+    def test_saves_that_cannot_change_email_do_no_profile_work(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password("Changed123!")
+        with self.assertNumQueries(1):
+            user.save(update_fields=["password"])
+        with self.assertNumQueries(1):
+            user.save()
+
+    def test_email_change_updates_profile_without_reading_it(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.email = "Moved@Example.com"
+        with CaptureQueriesContext(connection) as queries:
+            user.save(update_fields=["email"])
+        self.assertFalse([q for q in queries if q["sql"].lstrip().upper().startswith("SELECT")])
+        self.assertEqual(UserProfile.objects.get(user=user).email, "moved@example.com")
+        self.assertEqual(search_profile_ids("moved"), [UserProfile.objects.get(user=user).pk])
+
+    def test_sync_profile_emails_in_bulk(self):
+        users = list(User.objects.order_by("email"))
+        for user in users:
+            user.email = f"bulk-{user.email}"
+        User.objects.bulk_update(users, ["email"])
+        self.assertEqual(sync_profile_emails(users, chunk_size=1), 2)
+        self.assertEqual(sync_profile_emails(users), 0)
+        self.assertEqual(
+            sorted(UserProfile.objects.values_list("email", flat=True)),
+            ["bulk-admin@example.com", "bulk-test@example.com"],
+        )
+
+    def test_deactivation_takes_effect_with_warm_cache(self):
+        self._login(self.user)
+        self.assertEqual(self.client.get("/api/profile/me/").status_code, 200)
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertEqual(self.client.get("/api/profile/me/").status_code, 401)
+
     def test_unauthenticated_cannot_access_profile(self):
         res = self.client.get("/api/profile/me/")
         self.assertEqual(res.status_code, 401)
@@ -102,7 +226,38 @@ class ProfileTests(APITestCase):
         self._login(self.admin)
         res = self.client.get("/api/profile/admin/profiles/")
         self.assertEqual(res.status_code, 200, res.data)
-        self.assertGreaterEqual(len(res.data), 2)
+        self.assertGreaterEqual(len(res.data["results"]), 2)
+
+    def test_admin_list_pages_by_keyset_cursor(self):
+        for i in range(5):
+            User.objects.create_user(email=f"page{i}@example.com", password="PagePass123!")
+        # Rows sharing a created_at are still ordered (and paged) by id.
+        UserProfile.objects.filter(email__in=["page1@example.com", "page2@example.com", "page3@example.com"]).update(
+            created_at=UserProfile.objects.get(email="page1@example.com").created_at
+        )
+        expected = [str(pk) for pk in UserProfile.objects.order_by("-created_at", "-id").values_list("id", flat=True)]
+        self.client.force_authenticate(user=self.admin)
+
+        seen, url = [], "/api/profile/admin/profiles/?page_size=2"
+        while url:
+            with self.assertNumQueries(1):
+                res = self.client.get(url)
+            self.assertEqual(res.status_code, 200, res.data)
+            self.assertLessEqual(len(res.data["results"]), 2)
+            seen.extend(row["id"] for row in res.data["results"])
+            last, url = res, res.data["next"]
+        self.assertEqual(seen, expected)
+
+        backwards, url = [], last.data["previous"]
+        while url:
+            res = self.client.get(url)
+            backwards[:0] = [row["id"] for row in res.data["results"]]
+            url = res.data["previous"]
+        self.assertEqual(backwards, expected[: len(backwards)])
+        self.assertEqual(len(backwards) + len(last.data["results"]), len(expected))
+
+        res = self.client.get("/api/profile/admin/profiles/?cursor=not-a-cursor")
+        self.assertEqual(res.status_code, 404)
 
     def test_admin_can_update_any_profile(self):
         self._login(self.admin)
@@ -115,6 +270,21 @@ class ProfileTests(APITestCase):
         self.assertEqual(res.status_code, 200, res.data)
         self.assertEqual(res.data["name"], "Admin Updated")
 
+    def test_admin_retrieve_is_conditional(self):
+        self._login(self.admin)
+        url = f"/api/profile/admin/profiles/{self.user.profile.id}/"
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+        res = self.client.patch(url, {"name": "Stale"}, format="json", HTTP_IF_MATCH='"not-current"')
+        self.assertEqual(res.status_code, 412)
+        res = self.client.patch(url, {"name": "Fresh"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(self.client.get("/api/profile/admin/profiles/not-a-uuid/").status_code, 404)
+
     def test_regular_user_cannot_access_admin_endpoint(self):
         self._login(self.user)
         res = self.client.get("/api/profile/admin/profiles/")
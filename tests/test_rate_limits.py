@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.accounts.throttling import parse_rate
+from apps.core.checks import check_shared_caches
+
+
+User = get_user_model()
+
+TIGHT_LIMITS = {
+    "register": {"ip": "3/m", "email": None, "global": None},
+    "login": {"ip": None, "email": "2/m", "global": None},
+}
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    AUTH_RATE_LIMITS_ENABLED=True,
+    AUTH_RATE_LIMITS=TIGHT_LIMITS,
+)
+class RateLimitTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        # A fixed clock, so a test never straddles a window boundary (which shrinks the estimate).
+        clock = mock.patch("apps.accounts.throttling.time", mock.Mock(time=mock.Mock(return_value=1_700_000_010.0)))
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def _login(self, email, path="/api/auth/login/"):
+        return self.client.post(path, {"email": email, "password": "WrongPass123!"}, format="json")
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("5/min"), (5, 60))
+        self.assertEqual(parse_rate("100/hour"), (100, 3600))
+        self.assertIsNone(parse_rate(None))
+
+    def test_login_limited_per_normalized_email_before_any_work(self):
+        User.objects.create_user(email="ivy@example.com", password="IvyPass123!", is_active=True, email_verified=True)
+        for _ in range(2):
+            self.assertEqual(self._login("ivy@example.com").status_code, 401)
+
+        # Rejected before the serializer runs: no user lookup, no hashing.
+        with self.assertNumQueries(0):
+            res = self._login("  IVY@Example.com ")
+        self.assertEqual(res.status_code, 429, res.data)
+        self.assertIn("Retry-After", res)
+
+        # Other addresses are unaffected.
+        self.assertEqual(self._login("someone-else@example.com").status_code, 401)
+
+    def test_async_login_shares_the_limits(self):
+        self.assertEqual(self._login("jay@example.com").status_code, 401)
+        self.assertEqual(self._login("jay@example.com", "/api/auth/async/login/").status_code, 401)
+        res = self._login("jay@example.com", "/api/auth/async/login/")
+        self.assertEqual(res.status_code, 429, res.content)
+        self.assertIn("Retry-After", res)
+
+    def test_register_limited_per_ip_and_rejections_reported(self):
+        for i in range(3):
+            res = self.client.post(
+                "/api/auth/register/", {"email": f"user{i}@example.com", "password": "SignUpPass123!"}, format="json"
+            )
+            self.assertEqual(res.status_code, 201, res.data)
+        res = self.client.post(
+            "/api/auth/register/", {"email": "user3@example.com", "password": "SignUpPass123!"}, format="json"
+        )
+        self.assertEqual(res.status_code, 429, res.data)
+        self.assertFalse(User.objects.filter(email="user3@example.com").exists())
+
+        admin = User.objects.create_superuser(email="admin@example.com", password="AdminPass123!")
+        self.client.force_authenticate(user=User.objects.get(email="user0@example.com"))
+        self.assertEqual(self.client.get("/api/auth/rate-limits/").status_code, 403)
+        self.client.force_authenticate(user=admin)
+        res = self.client.get("/api/auth/rate-limits/")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(res.data["rejections"]["register"], {"ip": 1, "email": 0, "global": 0})
+
+    def test_forwarded_for_is_ignored_without_trusted_proxies(self):
+        for i in range(4):
+            res = self.client.post(
+                "/api/auth/register/",
+                {"email": f"spoof{i}@example.com", "password": "SignUpPass123!"},
+                format="json",
+                HTTP_X_FORWARDED_FOR=f"203.0.113.{i}",
+            )
+        self.assertEqual(res.status_code, 429, res.data)
+
+    @override_settings(AUTH_RATE_LIMITS_ENABLED=False)
+    def test_limits_can_be_disabled(self):
+        for _ in range(4):
+            self.assertEqual(self._login("kim@example.com").status_code, 401)
+
+    @override_settings(CACHE_ALLOW_PROCESS_LOCAL=False)
+    def test_process_local_counters_are_reported_by_the_system_checks(self):
+        messages = {message.id: message for message in check_shared_caches(None)}
+        # A warning, not an error: the default setup must still be able to run `migrate`.
+        self.assertFalse(messages["core.W003"].is_serious())
+        with override_settings(AUTH_RATE_LIMITS_ENABLED=False):
+            self.assertNotIn("core.W003", [message.id for message in check_shared_caches(None)])
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from apps.accounts.models import EmailOTP
+from apps.accounts.retention import run_retention
+
+
+User = get_user_model()
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        long_ago = now - timedelta(days=30)
+
+        self.stale = User.objects.create_user(email="stale@example.com", password="StalePass123!")
+        User.objects.filter(pk=self.stale.pk).update(date_joined=long_ago)
+        self.fresh = User.objects.create_user(email="fresh@example.com", password="FreshPass123!")
+
+        for _ in range(3):
+            EmailOTP.objects.create(user=self.fresh, purpose=EmailOTP.Purpose.VERIFY_EMAIL,
+                                    code_hash="x", expires_at=long_ago)
+        self.live_otp = EmailOTP.objects.create(user=self.fresh, purpose=EmailOTP.Purpose.VERIFY_EMAIL,
+                                                code_hash="x", expires_at=now + timedelta(minutes=5))
+
+        OutstandingToken.objects.create(jti="old", token="", expires_at=long_ago)
+        OutstandingToken.objects.create(jti="live", token="", expires_at=now + timedelta(days=1))
+
+    def test_dry_run_counts_without_deleting(self):
+        results = run_retention(targets=["otps", "tokens", "users"], dry_run=True, chunk_size=2)
+        self.assertEqual(results, {"otps": 3, "tokens": 1, "users": 1})
+        self.assertEqual(EmailOTP.objects.count(), 4)
+        self.assertTrue(User.objects.filter(pk=self.stale.pk).exists())
+
+    def test_purges_in_chunks(self):
+        out = StringIO()
+        call_command("purge_expired", "--chunk-size", "2", "--verbosity", "2", stdout=out)
+        self.assertIn("otps: deleted 2 so far", out.getvalue())
+        self.assertIn("otps: deleted 3", out.getvalue())
+
+        self.assertEqual(list(EmailOTP.objects.all()), [self.live_otp])
+        self.assertEqual(list(OutstandingToken.objects.values_list("jti", flat=True)), ["live"])
+        self.assertFalse(User.objects.filter(pk=self.stale.pk).exists())
+        self.assertTrue(User.objects.filter(pk=self.fresh.pk).exists())
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, override_settings
+from rest_framework.test import APITestCase
+
+from apps.core import metrics
+from apps.core.timing import current_timings, phase
+
+
+User = get_user_model()
+
+
+def _phases(response) -> dict[str, str]:
+    return dict(entry.split(";", 1) for entry in response["Server-Timing"].split(", "))
+
+
+@override_settings(AUTH_RATE_LIMITS_ENABLED=False)
+class ServerTimingTests(APITestCase):
+    def setUp(self):
+        metrics.reset()
+        self.user = User.objects.create_user(
+            email="timed@example.com", password="TimedPass123!", is_active=True, email_verified=True
+        )
+
+    def test_phases_reported_per_response(self):
+        res = self.client.post("/api/auth/login/", {"email": "timed@example.com", "password": "TimedPass123!"}, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertTrue({"validate", "hash", "db", "total"} <= set(_phases(res)))
+        access = res.data["access"]
+
+        res = self.client.post("/api/auth/forgot-password/", {"email": "timed@example.com"}, format="json")
+        self.assertTrue({"validate", "create", "email", "db"} <= set(_phases(res)))
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertIn("auth", _phases(self.client.get("/api/profile/me/")))
+
+    def test_phase_outside_a_request_is_a_no_op(self):
+        self.assertIsNone(current_timings())
+        with phase("anything"):
+            self.assertIsNone(current_timings())
+        self.assertNotIn('phase="anything"', metrics.render_prometheus())
+
+    @override_settings(DEBUG=True)
+    async def test_async_views_are_not_adapted_to_sync(self):
+        # With DEBUG on, Django logs every sync/async adaptation in the middleware chain.
+        with self.assertNoLogs("django.request", "DEBUG"):
+            client = AsyncClient()
+            res = await client.post(
+                "/api/auth/async/login/",
+                {"email": "timed@example.com", "password": "TimedPass123!"},
+                content_type="application/json",
+            )
+        self.assertEqual(res.status_code, 200, res.content)
+        self.assertTrue({"hash", "db", "total"} <= set(_phases(res)))
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_header_can_be_disabled(self):
+        self.assertFalse(self.client.get("/api/profile/me/").has_header("Server-Timing"))
+
+    def test_metrics_endpoint_is_staff_only(self):
+        self.client.post("/api/auth/forgot-password/", {"email": "timed@example.com"}, format="json")
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+        self.client.force_authenticate(user=User.objects.create_superuser(email="ops@example.com", password="OpsPass123!"))
+        res = self.client.get("/metrics")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = res.content.decode()
+        self.assertIn('http_request_duration_seconds_count{route="forgot_password",method="POST"} 1', body)
+        self.assertIn('http_request_phase_seconds_bucket{route="forgot_password",method="POST",phase="email",le="+Inf"} 1', body)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.accounts.backends import ShardedModelBackend
+from apps.accounts.blacklist import blacklist_index
+from apps.accounts.models import EmailOTP, UserShard
+from apps.accounts.sharding import move_user, rendezvous_shard
+from apps.profiles.models import UserProfile
+
+
+User = get_user_model()
+
+SHARD = "shard_test"
+OTP = "123456"
+PASSWORD = "ShardPass123!"
+
+
+class RendezvousTests(SimpleTestCase):
+    def test_placement_is_stable_and_spread(self):
+        ids = [uuid.uuid4() for _ in range(3000)]
+        placed = {user_id: rendezvous_shard(user_id, ["a", "b", "c"]) for user_id in ids}
+        self.assertEqual(placed, {user_id: rendezvous_shard(str(user_id), ["a", "b", "c"]) for user_id in ids})
+        for count in Counter(placed.values()).values():
+            self.assertGreater(count, 850)
+
+    def test_adding_a_shard_only_moves_users_onto_it(self):
+        ids = [uuid.uuid4() for _ in range(3000)]
+        before = {user_id: rendezvous_shard(user_id, ["a", "b", "c"]) for user_id in ids}
+        after = {user_id: rendezvous_shard(user_id, ["a", "b", "c", "d"]) for user_id in ids}
+        moved = [user_id for user_id in ids if before[user_id] != after[user_id]]
+        self.assertTrue(all(after[user_id] == "d" for user_id in moved))
+        self.assertLess(abs(len(moved) - 750), 150)
+
+
+@override_settings(USER_SHARDS=["default", SHARD], AUTH_RATE_LIMITS_ENABLED=False)
+class ShardedUserTests(APITestCase):
+    """
+    Runs against a second in-memory database registered for this class only ("__all__" is
+    resolved when the class is set up, after the alias exists).
+    """
+
+    databases = "__all__"
+
+    @classmethod
+    def setUpClass(cls):
+        connections.settings[SHARD] = {
+            **connections.settings["default"],
+            "NAME": f"file:memorydb_{SHARD}?mode=memory&cache=shared",
+        }
+        call_command("migrate", database=SHARD, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        del connections[SHARD]
+        del connections.settings[SHARD]
+
+    def setUp(self):
+        cache.clear()
+        blacklist_index.reset()
+        self.addCleanup(blacklist_index.reset)
+
+    def _register(self, email, shard):
+        with mock.patch("apps.accounts.serializers.shard_for_new_user", return_value=shard), mock.patch(
+            "apps.accounts.serializers.generate_numeric_otp", return_value=OTP
+        ):
+            return self.client.post("/api/auth/register/", {"email": email, "password": PASSWORD}, format="json")
+
+    def _signup(self, email, shard):
+        self.assertEqual(self._register(email, shard).status_code, 201)
+        res = self.client.post("/api/auth/verify-email/", {"email": email.upper(), "otp": OTP}, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        return User.objects.for_email(email).get()
+
+    def _login(self, email):
+        res = self.client.post("/api/auth/login/", {"email": email, "password": PASSWORD}, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        return res.data
+
+    def test_lifecycle_on_each_shard(self):
+        for shard in ("default", SHARD):
+            email = f"life-{shard}@example.com"
+            user = self._signup(email, shard)
+            self.assertEqual(user._state.db, shard)
+            self.assertEqual(UserShard.objects.get(email=email).shard, shard)
+            self.assertTrue(UserProfile.objects.using(shard).filter(user_id=user.pk).exists())
+
+            tokens = self._login(email)
+            self.assertTrue(OutstandingToken.objects.using(shard).filter(user_id=user.pk).exists())
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+            res = self.client.patch("/api/profile/me/", {"name": shard}, format="json")
+            self.assertEqual(res.status_code, 200, res.data)
+            self.assertEqual(UserProfile.objects.using(shard).get(user_id=user.pk).name, shard)
+            self.client.credentials()
+
+            res = self.client.post("/api/auth/logout/", {"refresh": tokens["refresh"]}, format="json")
+            self.assertEqual(res.status_code, 200, res.data)
+            self.assertTrue(BlacklistedToken.objects.using(shard).filter(token__user_id=user.pk).exists())
+            res = self.client.post("/api/auth/token/refresh/", {"refresh": tokens["refresh"]}, format="json")
+            self.assertEqual(res.status_code, 401)
+
+        self.assertEqual(User.objects.using("default").count(), 1)
+        self.assertEqual(User.objects.using(SHARD).count(), 1)
+
+    def test_emails_are_unique_across_shards(self):
+        self.assertEqual(self._register("dup@example.com", "default").status_code, 201)
+        res = self._register("dup@example.com", SHARD)
+        self.assertEqual(res.status_code, 400)
+        self.assertFalse(User.objects.using(SHARD).exists())
+
+    def test_admin_list_merges_shards_in_keyset_order(self):
+        for i in range(5):
+            self._signup(f"list{i}@example.com", SHARD if i % 2 else "default")
+        admin = User.objects.create_superuser(email="root@example.com", password=PASSWORD)
+        self.client.force_authenticate(admin)
+
+        seen, url = [], "/api/profile/admin/profiles/?page_size=2"
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200, res.data)
+            seen += res.data["results"]
+            url = res.data["next"]
+        expected = sorted(
+            [*UserProfile.objects.using("default"), *UserProfile.objects.using(SHARD)],
+            key=lambda profile: (profile.created_at, profile.pk),
+            reverse=True,
+        )
+        self.assertEqual([row["id"] for row in seen], [str(profile.pk) for profile in expected])
+
+        on_shard = UserProfile.objects.using(SHARD).first()
+        res = self.client.patch(f"/api/profile/admin/profiles/{on_shard.pk}/", {"name": "Edited"}, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(UserProfile.objects.using(SHARD).get(pk=on_shard.pk).name, "Edited")
+
+    def test_move_user_carries_rows_and_keeps_login_working(self):
+        user = self._signup("mover@example.com", "default")
+        tokens = self._login("mover@example.com")
+        self.client.post("/api/auth/logout/", {"refresh": tokens["refresh"]}, format="json")
+
+        result = move_user(user.pk, SHARD)
+        self.assertEqual((result.source, result.target, result.otps, result.tokens), ("default", SHARD, 1, 1))
+        self.assertFalse(User.objects.using("default").filter(pk=user.pk).exists())
+        self.assertEqual(UserShard.objects.get(user_id=user.pk).shard, SHARD)
+        self.assertEqual(EmailOTP.objects.using(SHARD).filter(user_id=user.pk).count(), 1)
+        token = OutstandingToken.objects.using(SHARD).get()
+        self.assertTrue(BlacklistedToken.objects.using(SHARD).filter(token=token).exists())
+
+        blacklist_index.reset()
+        res = self.client.post("/api/auth/token/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(res.status_code, 401)
+        tokens = self._login("mover@example.com")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(self.client.get("/api/profile/me/").data["email"], "mover@example.com")
+
+    def test_rebalance_backfills_directory_and_moves_to_hashed_shard(self):
+        users = [self._signup(f"re{i}@example.com", "default") for i in range(6)]
+        UserShard.objects.filter(user_id=users[0].pk).delete()
+        # Promoted to staff while on another shard.
+        staff = self._signup("promoted@example.com", SHARD)
+        User.objects.using(SHARD).filter(pk=staff.pk).update(is_staff=True)
+        users.append(staff)
+
+        call_command("rebalance_shards", verbosity=0, stdout=mock.MagicMock())
+        for user in users:
+            expected = "default" if user.pk == staff.pk else rendezvous_shard(user.pk, ["default", SHARD])
+            self.assertEqual(UserShard.objects.get(user_id=user.pk).shard, expected)
+            self.assertTrue(User.objects.using(expected).filter(pk=user.pk).exists())
+
+        call_command("rebalance_shards", drain=[SHARD], verbosity=0, stdout=mock.MagicMock())
+        self.assertFalse(User.objects.using(SHARD).exists())
+        self.assertEqual(set(UserShard.objects.values_list("shard", flat=True)), {"default"})
+
+    def test_session_users_load_from_their_shard(self):
+        user = self._signup("session@example.com", SHARD)
+        self.assertEqual(ShardedModelBackend().get_user(str(user.pk)), user)
+
+        # Staff stay on default, next to the admin log that references them.
+        with mock.patch("apps.accounts.sharding.rendezvous_shard", return_value=SHARD):
+            admin = User.objects.create_superuser(email="boss@example.com", password=PASSWORD)
+        self.assertEqual(admin._state.db, "default")
+
+        self.client.force_login(admin)
+        for shard, emails in (("default", ["boss@example.com"]), (SHARD, ["session@example.com"])):
+            res = self.client.get("/admin/accounts/user/", {"shard": shard})
+            self.assertEqual([u.email for u in res.context["cl"].result_list], emails)
+        res = self.client.get(f"/admin/accounts/user/{user.pk}/change/")
+        self.assertContains(res, "session@example.com")
+        profile = UserProfile.objects.using(SHARD).get(user_id=user.pk)
+        res = self.client.post(
+            f"/admin/profiles/userprofile/{profile.pk}/change/",
+            {"user": user.pk, "email": user.email, "name": "Via admin"},
+        )
+        self.assertEqual(res.status_code, 302, res.context and res.context["adminform"].form.errors)
+        self.assertEqual(UserProfile.objects.using(SHARD).get(pk=profile.pk).name, "Via admin")
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+
+PRAGMAS = {"journal_mode": "wal", "synchronous": "normal", "busy_timeout": 7000, "cache_size": -2048}
+
+
+class SQLitePragmaTests(SimpleTestCase):
+    def _pragmas_on_new_connection(self) -> dict:
+        with tempfile.TemporaryDirectory() as tmp:
+            wrapper = DatabaseWrapper({**connection.settings_dict, "NAME": os.path.join(tmp, "db.sqlite3")}, "pragmas")
+            try:
+                with wrapper.cursor() as cursor:
+                    return {name: cursor.execute(f"PRAGMA {name}").fetchone()[0] for name in PRAGMAS}
+            finally:
+                wrapper.close()
+
+    @override_settings(SQLITE_PRAGMAS=PRAGMAS)
+    def test_pragmas_applied_to_new_connections(self):
+        # synchronous=NORMAL reads back as 1.
+        self.assertEqual(
+            self._pragmas_on_new_connection(),
+            {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 7000, "cache_size": -2048},
+        )
+
+    @override_settings(SQLITE_PRAGMAS={})
+    def test_default_mode_leaves_sqlite_defaults(self):
+        self.assertEqual(self._pragmas_on_new_connection()["journal_mode"], "delete")